@@ -0,0 +1,268 @@
+"""Variante ASGI del servicio de registro.
+
+Sirve el mismo contrato que server.py para /form.html, /register y /check-email, pero
+sin ocupar un hilo por petición: el hash corre en el HashingExecutor y las escrituras
+pasan por el escritor con group commit, así que un proceso mantiene miles de conexiones
+abiertas mientras esperan.
+
+Ejecutar con cualquier servidor ASGI, por ejemplo:
+    uvicorn asgi_server:app
+    python asgi_server.py --port 8000      # usa uvicorn si está instalado
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+from urllib.parse import parse_qs
+from hashing import HashingExecutor, HashingBusy
+from idempotency import IdempotencyConflict, IdempotencyStore, clave_valida, huella
+from password_policy import politica_desde_config
+from blocklist import BlockList
+from sharding import ShardedStore
+from static_cache import StaticCache
+from server import DEFAULT_CONFIG, validar_registro
+from validators import validate_email_format, validate_email_case_insensitive
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+def _json(datos, status=200, headers=()):
+    cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+    return status, [(b"content-type", b"application/json"), *headers], cuerpo
+
+async def _leer_cuerpo(receive):
+    partes = []
+    while True:
+        mensaje = await receive()
+        partes.append(mensaje.get("body", b""))
+        if not mensaje.get("more_body"):
+            return b"".join(partes)
+
+class AsgiApp:
+    """Aplicación ASGI con la misma configuración (y valores por defecto) que create_app."""
+
+    def __init__(self, config=None):
+        self.config = dict(DEFAULT_CONFIG)
+        if config:
+            self.config.update(config)
+
+        # Cada shard tiene un único hilo escritor que agrupa los INSERT concurrentes en un commit
+        self.store = ShardedStore(self.config)
+        self.politica = politica_desde_config(self.config)
+        self.hasher = HashingExecutor(workers=self.config["HASH_WORKERS"],
+                                      queue_size=self.config["HASH_QUEUE_SIZE"],
+                                      kind=self.config["HASH_EXECUTOR"],
+                                      method=self.politica.method)
+        self.blocklist = None
+        if self.config["BREACHED_PASSWORDS_INDEX"]:
+            self.blocklist = BlockList(self.config["BREACHED_PASSWORDS_INDEX"])
+
+        self.idempotencia = IdempotencyStore(ttl=self.config["IDEMPOTENCY_TTL"],
+                                             max_keys=self.config["IDEMPOTENCY_MAX_KEYS"],
+                                             path=self.config["IDEMPOTENCY_DATABASE"],
+                                             pragmas=self.config["SQLITE_PRAGMAS"])
+
+        self.store.init_db(crear=self.config["INIT_DB"])
+        self.static_cache = StaticCache(STATIC_DIR, cache_control=self.config["STATIC_CACHE_CONTROL"],
+                                        check_changes=bool(self.config["STATIC_CHECK_CHANGES"]))
+
+        self._rutas = {
+            ("GET", "/form.html"): self.serve_form,
+            ("POST", "/register"): self.register_user,
+            ("GET", "/check-email"): self.check_email,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        manejador = self._rutas.get((scope["method"], scope["path"]))
+        if manejador is not None:
+            status, headers, cuerpo = await manejador(scope, receive)
+        elif any(ruta == scope["path"] for _, ruta in self._rutas):
+            status, headers, cuerpo = _json({"status": "error", "message": "❌ Method not allowed"}, 405)
+        else:
+            status, headers, cuerpo = _json({"status": "error", "message": "❌ Not found"}, 404)
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [*headers, (b"content-length", str(len(cuerpo)).encode())]})
+        await send({"type": "http.response.body", "body": cuerpo})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif mensaje["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def close(self):
+        self.store.close()
+        self.idempotencia.close()
+        self.hasher.shutdown(wait=False)
+
+    def _servidor_ocupado(self):
+        return _json({"status": "error", "message": "❌ Server is busy, please retry later"}, 503,
+                     [(b"retry-after", str(self.config["HASH_RETRY_AFTER"]).encode())])
+
+    async def serve_form(self, scope, receive):
+        headers = {clave.lower(): valor.decode("latin-1") for clave, valor in scope.get("headers", ())}
+        status, cabeceras, cuerpo = self.static_cache.respuesta(
+            "form.html", headers.get(b"accept-encoding"), headers.get(b"if-none-match"))
+        return status, [(clave.lower().encode(), valor.encode("latin-1")) for clave, valor in cabeceras], cuerpo
+
+    async def register_user(self, scope, receive):
+        cuerpo = await _leer_cuerpo(receive)
+        headers = dict(scope.get("headers", ()))
+        clave = headers.get(b"idempotency-key")
+        if clave is None:
+            return await self._registrar(cuerpo)
+        clave = clave.decode("latin-1")
+        if not clave_valida(clave):
+            return _json({"status": "error", "message": "❌ Invalid Idempotency-Key header"}, 400)
+
+        # Un reintento con la misma clave reutiliza la respuesta (o espera a la petición en curso).
+        # El store puede tocar SQLite: sus llamadas van al executor, no al bucle de eventos
+        loop = asyncio.get_running_loop()
+        try:
+            futuro, propia = await loop.run_in_executor(
+                None, self.idempotencia.reservar, clave, huella("POST", "/register", cuerpo))
+        except IdempotencyConflict:
+            return _json({"status": "error",
+                          "message": "❌ Idempotency-Key was already used with a different request"}, 422)
+        if propia:
+            try:
+                status, cabeceras, respuesta = await self._registrar(cuerpo)
+            except BaseException as e:
+                # Sin esperar: si la tarea se está cancelando, un await aquí no llegaría a correr
+                loop.run_in_executor(None, self.idempotencia.fallar, clave, e)
+                raise
+            propia = (status, [(k.decode("latin-1"), v.decode("latin-1")) for k, v in cabeceras], respuesta)
+            definitiva = await loop.run_in_executor(None, self.idempotencia.completar, clave, propia)
+            if definitiva is propia:
+                return status, cabeceras, respuesta
+            # Otro proceso guardó antes su respuesta para la clave: esa es la que vale
+            status, cabeceras, respuesta = definitiva
+            cabeceras = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in cabeceras]
+            return status, [*cabeceras, (b"idempotent-replayed", b"true")], respuesta
+        try:
+            # shield: si vence la espera no se cancela el futuro que comparten las demás peticiones
+            status, cabeceras, respuesta = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(futuro)), self.config["IDEMPOTENCY_WAIT_TIMEOUT"])
+        except asyncio.TimeoutError:
+            return _json({"status": "error",
+                          "message": "❌ A request with this Idempotency-Key is still in progress"}, 409)
+        cabeceras = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in cabeceras]
+        return status, [*cabeceras, (b"idempotent-replayed", b"true")], respuesta
+
+    async def _registrar(self, cuerpo):
+        try:
+            data = json.loads(cuerpo)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return _json({"status": "error", "message": "❌ Invalid request format"}, 400)
+
+        fullname = data.get("fullname", "").strip()
+        email = data.get("email", "").strip()
+        password = data.get("password", "").strip()
+
+        # 🔍 Validaciones usando validators.py
+        error = validar_registro(fullname, email, password, self.blocklist)
+        if error:
+            return _json({"status": "error", "message": error}, 400)
+
+        loop = asyncio.get_running_loop()
+        # Duplicado conocido: respondemos antes de gastar CPU en el hash
+        if await loop.run_in_executor(None, self.store.contains, email):
+            return _json({"status": "error", "message": "❌ Email already registered."})
+
+        try:
+            hashed_password, _ = await asyncio.wait_for(asyncio.wrap_future(self.hasher.submit(password)),
+                                                        self.config["HASH_TIMEOUT"])
+        except (HashingBusy, asyncio.TimeoutError):
+            return self._servidor_ocupado()
+
+        futuro = self.store.submit(fullname, email, hashed_password)
+        try:
+            try:
+                # shield: vencida la espera decidimos nosotros si se cancela (ver esperar_escritura)
+                registrado = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(futuro)),
+                                                    self.config["DB_WRITER_TIMEOUT"])
+            except asyncio.TimeoutError:
+                if futuro.cancel():
+                    return self._servidor_ocupado()
+                registrado = await asyncio.wrap_future(futuro)
+        except sqlite3.Error:
+            return self._servidor_ocupado()
+        self.store.add(email)
+        if registrado:
+            return _json({"status": "success", "message": "✅ Registration successful!"})
+        return _json({"status": "error", "message": "❌ Email already registered."})
+
+    async def check_email(self, scope, receive):
+        parametros = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        email = parametros.get("email", [""])[0].strip()
+        if not validate_email_format(email):
+            return _json({"status": "error", "message": "❌ Invalid email format"}, 400)
+        if not validate_email_case_insensitive(email):
+            return _json({"status": "error", "message": "❌ Email should be lowercase only"}, 400)
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, self.store.contains, email):
+            return _json({"status": "error", "available": False, "message": "❌ Email already registered."})
+        return _json({"status": "success", "available": True, "message": "✅ Email is available"})
+
+def create_asgi_app(config=None):
+    return AsgiApp(config)
+
+async def llamar(app, metodo, ruta, cuerpo=b"", query_string=b"", headers=()):
+    """Ejecuta una petición contra la app ASGI en memoria. Devuelve (status, headers, cuerpo)."""
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+             "method": metodo, "path": ruta, "query_string": query_string,
+             "headers": list(headers)}
+    entregado = False
+    respuesta = {"status": None, "headers": [], "body": []}
+
+    async def receive():
+        nonlocal entregado
+        if entregado:
+            return {"type": "http.disconnect"}
+        entregado = True
+        return {"type": "http.request", "body": cuerpo, "more_body": False}
+
+    async def send(mensaje):
+        if mensaje["type"] == "http.response.start":
+            respuesta["status"] = mensaje["status"]
+            respuesta["headers"] = mensaje.get("headers", [])
+        elif mensaje["type"] == "http.response.body":
+            respuesta["body"].append(mensaje.get("body", b""))
+
+    await app(scope, receive, send)
+    return respuesta["status"], respuesta["headers"], b"".join(respuesta["body"])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio de registro (ASGI)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--database", default=DEFAULT_CONFIG["DATABASE"])
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("❌ Serving the ASGI app requires uvicorn (pip install uvicorn)")
+    uvicorn.run(create_asgi_app({"DATABASE": args.database}), host=args.host, port=args.port)
+
+_app = None
+
+async def app(scope, receive, send):
+    """Punto de entrada para `uvicorn asgi_server:app`; crea la app al primer uso, no al importar."""
+    global _app
+    if _app is None:
+        _app = create_asgi_app()
+    await _app(scope, receive, send)
+
+if __name__ == "__main__":
+    main()
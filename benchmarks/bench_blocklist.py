@@ -0,0 +1,64 @@
+"""Latencia de consulta y memoria por worker del índice de contraseñas filtradas
+(blocklist.py, mmap + Bloom) frente a cargar la lista en un set de Python.
+
+Uso: python benchmarks/bench_blocklist.py [--passwords 1000000] [--lookups 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from blocklist import BlockList, build_index  # noqa: E402
+
+def medir_consultas(contiene, candidatos):
+    inicio = time.perf_counter()
+    for password in candidatos:
+        contiene(password)
+    return (time.perf_counter() - inicio) / len(candidatos) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passwords", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lista = os.path.join(tmp, "lista.txt")
+        with open(lista, "w", encoding="utf-8") as f:
+            for i in range(args.passwords):
+                f.write(f"filtrada{i:08d}\n")
+        indice = os.path.join(tmp, "blocklist.idx")
+
+        inicio = time.perf_counter()
+        build_index(lista, indice)
+        print(f"Construcción del índice: {time.perf_counter() - inicio:.1f} s, "
+              f"{os.path.getsize(indice) / 2**20:.1f} MiB en disco")
+
+        aciertos = [f"filtrada{random.randrange(args.passwords):08d}" for _ in range(args.lookups)]
+        fallos = [f"Nueva{i}!Clave" for i in range(args.lookups)]
+
+        tracemalloc.start()
+        blocklist = BlockList(indice)
+        memoria_mmap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"mmap   acierto {medir_consultas(blocklist.__contains__, aciertos):6.2f} µs   "
+              f"fallo {medir_consultas(blocklist.__contains__, fallos):6.2f} µs   "
+              f"memoria privada {memoria_mmap / 2**20:8.2f} MiB")
+        blocklist.close()
+
+        tracemalloc.start()
+        with open(lista, encoding="utf-8") as f:
+            conjunto = {linea.rstrip("\n").lower() for linea in f}
+        memoria_set = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        contiene = lambda p: p.lower() in conjunto  # noqa: E731
+        print(f"set    acierto {medir_consultas(contiene, aciertos):6.2f} µs   "
+              f"fallo {medir_consultas(contiene, fallos):6.2f} µs   "
+              f"memoria privada {memoria_set / 2**20:8.2f} MiB")
+
+if __name__ == "__main__":
+    main()
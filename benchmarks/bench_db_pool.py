@@ -0,0 +1,85 @@
+"""Compara peticiones por segundo al escribir en users: conexión nueva por petición
+(comportamiento anterior), pool de conexiones en modo WAL y escritor con group commit
+de storage.py.
+
+Uso: python benchmarks/bench_db_pool.py [--requests 2000] [--threads 8]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage import ConnectionPool, GroupCommitWriter, DEFAULT_PRAGMAS  # noqa: E402
+
+SCHEMA = """CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY,
+                fullname TEXT NOT NULL,
+                email TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL)"""
+HASH_FALSO = "pbkdf2:sha256:1000000$" + "s" * 16 + "$" + "h" * 64
+
+def preparar(path):
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.commit()
+    conn.close()
+
+def insertar_sin_pool(path, i):
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        conn.execute("INSERT INTO users (fullname, email, password) VALUES (?, ?, ?)",
+                     ("Usuario Prueba", f"user{i}@example.com", HASH_FALSO))
+        conn.commit()
+    finally:
+        conn.close()
+
+def insertar_con_pool(pool, i):
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO users (fullname, email, password) VALUES (?, ?, ?)",
+                     ("Usuario Prueba", f"user{i}@example.com", HASH_FALSO))
+        conn.commit()
+
+def medir(nombre, funcion, peticiones, hilos):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as executor:
+        list(executor.map(funcion, range(peticiones)))
+    duracion = time.perf_counter() - inicio
+    print(f"{nombre:<28} {peticiones / duracion:>10.0f} req/s  ({duracion:.2f} s)")
+    return peticiones / duracion
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        antes_path = os.path.join(tmp, "antes.db")
+        preparar(antes_path)
+        antes = medir("antes (connect por petición)",
+                      lambda i: insertar_sin_pool(antes_path, i), args.requests, args.threads)
+
+        despues_path = os.path.join(tmp, "despues.db")
+        preparar(despues_path)
+        pool = ConnectionPool(despues_path, pragmas=DEFAULT_PRAGMAS, max_connections=args.threads)
+        despues = medir("después (pool + WAL)",
+                        lambda i: insertar_con_pool(pool, i), args.requests, args.threads)
+        pool.close_all()
+
+        grupo_path = os.path.join(tmp, "grupo.db")
+        preparar(grupo_path)
+        writer = GroupCommitWriter(grupo_path, pragmas=DEFAULT_PRAGMAS)
+        grupo = medir("group commit", lambda i: writer.execute(
+            "INSERT INTO users (fullname, email, password) VALUES (?, ?, ?)",
+            ("Usuario Prueba", f"user{i}@example.com", HASH_FALSO)), args.requests, args.threads)
+        print(f"  commits: {writer.stats()['batches']}  filas por commit: {writer.stats()['avg_batch']}")
+        writer.close()
+
+    print(f"Mejora pool: x{despues / antes:.1f}  group commit: x{grupo / antes:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Throughput de /register con prefork.py según el número de procesos worker.
+
+Arranca el servidor prefork con 1, 2, 4... workers sobre una base nueva, lanza la misma
+carga de registros válidos con loadgen.py por HTTP y compara las peticiones por segundo.
+El hash de contraseñas domina cada petición, así que el throughput debería crecer casi
+linealmente hasta el número de núcleos y estancarse a partir de ahí.
+
+Uso: python benchmarks/bench_prefork.py [--workers 1,2,4] [--requests 200] [--clients 16]
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from loadgen import cliente_http, ejecutar_carga  # noqa: E402
+
+def medir(workers, peticiones, clientes, directorio):
+    database = os.path.join(directorio, f"users-{workers}.db")
+    proceso = subprocess.Popen([sys.executable, "prefork.py", "--workers", str(workers), "--port", "0",
+                                "--database", database], cwd=RAIZ, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, text=True)
+    try:
+        url = None
+        arrancados = 0
+        for linea in proceso.stdout:
+            if "Listening on" in linea:
+                url = linea.split()[3]
+            elif "started" in linea:
+                arrancados += 1
+                if arrancados == workers:
+                    break
+        if url is None:
+            raise SystemExit(f"❌ prefork.py did not start with {workers} workers")
+        return ejecutar_carga(cliente_http(url), clients=clientes, requests=peticiones)
+    finally:
+        proceso.send_signal(signal.SIGTERM)
+        proceso.wait(timeout=60)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4", help="lista de números de workers a probar")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} núcleos; {args.requests} registros válidos con {args.clients} clientes")
+    print(f"{'workers':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'mejora':>7}")
+    base = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in (int(n) for n in args.workers.split(",")):
+            datos = medir(workers, args.requests, args.clients, tmp)
+            rps = datos["throughput_rps"]
+            base = base or rps
+            lat = datos["latency_ms"]
+            print(f"{workers:>7} {rps:>9.1f} {lat['p50']:>9.1f} {lat['p99']:>9.1f} {rps / base:>6.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compara el reporte por validador fila a fila (comportamiento anterior) con report.py (memo + pool de procesos).
+
+Genera una hoja CSV con `--rows` filas de las que `--unique` son combinaciones distintas
+(el resto, repeticiones como en las hojas de prueba reales) y mide las filas por segundo.
+
+Uso: python benchmarks/bench_report.py [--rows 200000] [--unique 20000] [--workers 4]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import selenium_runner  # noqa: E402
+from report import COLUMNAS_ENTRADA, generar_reporte  # noqa: E402
+
+def generar_hoja(path, filas, unicas, seed=1):
+    generador = random.Random(seed)
+    vectores = [(f"Usuario {i}", f"usuario{i}@example.com", generador.choice(["Pass1A$X", "abc", "Password1!"]),
+                 "Pass1A$X", "") for i in range(unicas)]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(COLUMNAS_ENTRADA)
+        for _ in range(filas):
+            escritor.writerow(generador.choice(vectores))
+
+def secuencial(entrada, salida):
+    with selenium_runner.abrir_lectura(entrada) as lector, \
+            selenium_runner.abrir_escritura(salida, selenium_runner.encabezados_detalle()) as escritor:
+        for fila in lector:
+            escritor.append(selenium_runner.fila_detalle(fila))
+
+def medir(nombre, funcion, filas):
+    inicio = time.perf_counter()
+    funcion()
+    duracion = time.perf_counter() - inicio
+    print(f"{nombre:<32} {duracion:>8.2f} s  {filas / duracion:>10.0f} filas/s")
+    return duracion
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--unique", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        entrada = os.path.join(tmp, "datos.csv")
+        generar_hoja(entrada, args.rows, args.unique)
+        print(f"{args.rows} filas, {args.unique} combinaciones distintas, {os.cpu_count()} núcleos")
+        antes = medir("antes (fila a fila)", lambda: secuencial(entrada, os.path.join(tmp, "a.csv")), args.rows)
+        medir("report.py, 1 proceso", lambda: generar_reporte(entrada, os.path.join(tmp, "b.csv"), workers=1),
+              args.rows)
+        despues = medir(f"report.py, {args.workers} procesos",
+                        lambda: generar_reporte(entrada, os.path.join(tmp, "c.csv"), workers=args.workers),
+                        args.rows)
+    print(f"Mejora: x{antes / despues:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Compara /form.html con send_static_file (comportamiento anterior) frente a la caché en memoria de static_cache.py.
+
+Uso: python benchmarks/bench_static.py [--requests 5000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server import create_app  # noqa: E402
+
+def medir(nombre, client, ruta, peticiones, headers=None):
+    client.get(ruta, headers=headers)  # calentamiento
+    inicio = time.perf_counter()
+    for _ in range(peticiones):
+        response = client.get(ruta, headers=headers)
+    duracion = time.perf_counter() - inicio
+    print(f"{nombre:<36} {peticiones / duracion:>9.0f} req/s  {len(response.data):>7} bytes  "
+          f"status {response.status_code}")
+    return peticiones / duracion
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({"DATABASE": os.path.join(tmp, "users.db")})
+
+        @app.route("/form-sin-cache.html")
+        def form_sin_cache():
+            return app.send_static_file("form.html")
+
+        client = app.test_client()
+        antes = medir("antes (send_static_file)", client, "/form-sin-cache.html", args.requests)
+        despues = medir("caché en memoria", client, "/form.html", args.requests)
+        medir("caché en memoria + gzip", client, "/form.html", args.requests, {"Accept-Encoding": "gzip, br"})
+        etag = client.get("/form.html", headers={"Accept-Encoding": "gzip, br"}).headers["ETag"]
+        medir("caché en memoria, 304", client, "/form.html", args.requests,
+              {"Accept-Encoding": "gzip, br", "If-None-Match": etag})
+
+    print(f"Mejora: x{despues / antes:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Microbenchmarks: cadena de funciones de validators.py frente al motor de reglas compilado.
+
+Uso: python benchmarks/bench_validators.py [--number 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import validators as v  # noqa: E402
+
+CASOS = {
+    "válido": ("Juan Pérez", "correo@example.com", "Pass1A$X", "Pass1A$X"),
+    "inválido": ("Jo3", "Correo+x@com", "password", "otra"),
+    "largo": ("Juan Pérez García de la Torre", "nombre.apellido@empresa-ejemplo.com",
+              "UnaClaveLarga!123abcXYZ", "UnaClaveLarga!123abcXYZ"),
+}
+
+def cadena_registro(nombre, correo, clave):
+    # Cadena de /register tal como estaba en server.py
+    if not v.validate_not_empty(nombre, correo, clave):
+        return "❌ Missing required fields"
+    if not v.validate_trim(nombre, correo, clave):
+        return "❌ Fields should not start or end with spaces"
+    if not v.validate_fullname_length(nombre):
+        return "❌ Full Name must be at least 3 characters"
+    if not v.validate_long_name(nombre):
+        return "❌ Full Name is too long"
+    if not v.validate_no_numbers_in_name(nombre):
+        return "❌ Name should not contain numbers"
+    if not v.validate_email_format(correo):
+        return "❌ Invalid email format"
+    if not v.validate_email_case_insensitive(correo):
+        return "❌ Email should be lowercase only"
+    if not v.validate_password_strength(clave):
+        return "❌ Password must be 6+ characters and include a special symbol"
+    if not v.validate_password_common(clave):
+        return "❌ Password is too common"
+    if not v.validate_long_password(clave):
+        return "❌ Password is too long"
+    return None
+
+def detalle_funciones(nombre, correo, clave, confirmacion):
+    # evaluar_validadores tal como estaba, llamando a cada función
+    return {
+        "validate_fullname_length": v.validate_fullname_length(nombre),
+        "validate_email_format": v.validate_email_format(correo),
+        "validate_password_strength": v.validate_password_strength(clave),
+        "validate_password_match": v.validate_password_match(clave, confirmacion),
+        "validate_email_case_insensitive": v.validate_email_case_insensitive(correo),
+        "validate_long_name": v.validate_long_name(nombre),
+        "validate_long_password": v.validate_long_password(clave),
+        "validate_trim": v.validate_trim(nombre, correo, clave),
+        "validate_email_plus": v.validate_email_plus(correo),
+        "validate_password_common": v.validate_password_common(clave),
+        "validate_no_numbers_in_name": v.validate_no_numbers_in_name(nombre),
+        "validate_password_case_sensitive": v.validate_password_case_sensitive(clave),
+        "validate_not_empty": v.validate_not_empty(nombre, correo, clave),
+        "validate_confirm_not_empty": v.validate_confirm_not_empty(confirmacion),
+        "validate_email_proper": v.validate_email_proper(correo),
+    }
+
+def medir(funcion, number):
+    return min(timeit.repeat(funcion, number=number, repeat=5)) / number * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'caso':<10} {'prueba':<10} {'funciones µs':>13} {'motor µs':>10} {'mejora':>7}")
+    for caso, (nombre, correo, clave, confirmacion) in CASOS.items():
+        antes = medir(lambda: cadena_registro(nombre, correo, clave), args.number)
+        despues = medir(lambda: v.MOTOR_REGISTRO.primera_falla(
+            fullname=nombre, email=correo, password=clave), args.number)
+        print(f"{caso:<10} {'registro':<10} {antes:>13.2f} {despues:>10.2f} {antes / despues:>6.1f}x")
+
+        antes = medir(lambda: detalle_funciones(nombre, correo, clave, confirmacion), args.number)
+        despues = medir(lambda: v.MOTOR_DETALLE.evaluar(
+            fullname=nombre, email=correo, password=clave, confirm=confirmacion), args.number)
+        print(f"{caso:<10} {'detalle':<10} {antes:>13.2f} {despues:>10.2f} {antes / despues:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
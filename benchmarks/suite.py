@@ -0,0 +1,238 @@
+"""Suite de benchmarks con líneas base en JSON.
+
+Cubre cada función de validators.py y evaluar_validadores, generate_password_hash con
+distintas iteraciones, inserciones en users una a una frente a por lotes, y /register
+de extremo a extremo con el test_client.
+
+Uso:
+    python benchmarks/suite.py run [--filter validators] [--save benchmarks/baseline.json]
+    python benchmarks/suite.py compare benchmarks/baseline.json [--threshold 0.2]
+
+`compare` ejecuta la suite y termina con código 1 si algún benchmark es más lento
+que la línea base por encima del umbral (0.2 = 20 %). Las líneas base dependen de
+la máquina: genéralas en la misma máquina donde se compara.
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCHMARKS = {}
+
+def benchmark(nombre, number=1000, repeat=5):
+    """Registra una fábrica que prepara el caso y devuelve la función a medir."""
+    def decorador(fabrica):
+        BENCHMARKS[nombre] = (fabrica, number, repeat)
+        return fabrica
+    return decorador
+
+# --- validators.py -----------------------------------------------------------
+
+NOMBRE, CORREO, CLAVE = "Juan Pérez García", "nombre.apellido@example.com", "Pass1A$Xyz"
+
+def _registrar_validadores():
+    import validators as v
+    casos = {
+        "validate_not_empty": lambda: v.validate_not_empty(NOMBRE, CORREO, CLAVE),
+        "validate_confirm_not_empty": lambda: v.validate_confirm_not_empty(CLAVE),
+        "validate_fullname_length": lambda: v.validate_fullname_length(NOMBRE),
+        "validate_long_name": lambda: v.validate_long_name(NOMBRE),
+        "validate_no_numbers_in_name": lambda: v.validate_no_numbers_in_name(NOMBRE),
+        "validate_email_format": lambda: v.validate_email_format(CORREO),
+        "validate_email_proper": lambda: v.validate_email_proper(CORREO),
+        "validate_email_case_insensitive": lambda: v.validate_email_case_insensitive(CORREO),
+        "validate_email_plus": lambda: v.validate_email_plus(CORREO),
+        "validate_password_strength": lambda: v.validate_password_strength(CLAVE),
+        "validate_password_common": lambda: v.validate_password_common(CLAVE),
+        "validate_password_case_sensitive": lambda: v.validate_password_case_sensitive(CLAVE),
+        "validate_password_match": lambda: v.validate_password_match(CLAVE, CLAVE),
+        "validate_long_password": lambda: v.validate_long_password(CLAVE),
+        "validate_trim": lambda: v.validate_trim(NOMBRE, CORREO, CLAVE),
+        "evaluar_validadores": lambda: v.evaluar_validadores(NOMBRE, CORREO, CLAVE, CLAVE),
+        "motor_registro": lambda: v.MOTOR_REGISTRO.primera_falla(fullname=NOMBRE, email=CORREO, password=CLAVE),
+    }
+    for nombre, funcion in casos.items():
+        benchmark(f"validators.{nombre}", number=20000)(lambda funcion=funcion: funcion)
+
+_registrar_validadores()
+
+# --- Hash de contraseñas -----------------------------------------------------
+
+def _registrar_hashing():
+    from werkzeug.security import generate_password_hash
+    for iteraciones, number in ((1000, 200), (10000, 50), (100000, 5), (600000, 1)):
+        metodo = f"pbkdf2:sha256:{iteraciones}"
+        benchmark(f"hashing.{metodo}", number=number, repeat=3)(
+            lambda metodo=metodo: lambda: generate_password_hash(CLAVE, method=metodo))
+    benchmark("hashing.pbkdf2:sha256 (default)", number=1, repeat=3)(
+        lambda: lambda: generate_password_hash(CLAVE, method="pbkdf2:sha256"))
+
+_registrar_hashing()
+
+# --- Escrituras en users -----------------------------------------------------
+
+SCHEMA = """CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY,
+                fullname TEXT NOT NULL,
+                email TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL)"""
+HASH_FALSO = "pbkdf2:sha256:1000000$" + "s" * 16 + "$" + "h" * 64
+LOTE = 100
+
+class _Temporal:
+    """Directorio temporal que se borra al terminar la suite."""
+    directorios = []
+
+    @classmethod
+    def ruta(cls, nombre):
+        directorio = tempfile.mkdtemp(prefix="bench-")
+        cls.directorios.append(directorio)
+        return os.path.join(directorio, nombre)
+
+    @classmethod
+    def limpiar(cls):
+        for directorio in cls.directorios:
+            shutil.rmtree(directorio, ignore_errors=True)
+        cls.directorios = []
+
+def _conexion():
+    from storage import connect, DEFAULT_PRAGMAS
+    conn = connect(_Temporal.ruta("users.db"), DEFAULT_PRAGMAS)
+    conn.execute(SCHEMA)
+    conn.commit()
+    return conn
+
+@benchmark("db.insert_single_commit (per row)", number=500)
+def _insert_individual():
+    conn = _conexion()
+    contador = itertools.count()
+
+    def insertar():
+        conn.execute("INSERT INTO users (fullname, email, password) VALUES (?, ?, ?)",
+                     ("Usuario Prueba", f"u{next(contador)}@example.com", HASH_FALSO))
+        conn.commit()
+    return insertar
+
+@benchmark(f"db.insert_executemany_{LOTE} (per row)", number=50)
+def _insert_lote():
+    conn = _conexion()
+    contador = itertools.count()
+
+    def insertar():
+        conn.executemany("INSERT INTO users (fullname, email, password) VALUES (?, ?, ?)",
+                         [("Usuario Prueba", f"u{next(contador)}@example.com", HASH_FALSO)
+                          for _ in range(LOTE)])
+        conn.commit()
+    insertar.por_operacion = LOTE
+    return insertar
+
+# --- /register de extremo a extremo --------------------------------------------
+
+def _cliente():
+    from server import create_app
+    app = create_app({"DATABASE": _Temporal.ruta("users.db"), "HASH_EXECUTOR": "thread"})
+    return app.test_client()
+
+@benchmark("e2e.register_invalid", number=2000)
+def _e2e_invalido():
+    cliente = _cliente()
+    payload = {"fullname": "Juan Pérez", "email": "correo@", "password": "Pass1A$X"}
+    return lambda: cliente.post("/register", json=payload)
+
+@benchmark("e2e.register_duplicate", number=2000)
+def _e2e_duplicado():
+    cliente = _cliente()
+    payload = {"fullname": "Juan Pérez", "email": "correo@example.com", "password": "Pass1A$X"}
+    cliente.post("/register", json=payload)
+    return lambda: cliente.post("/register", json=payload)
+
+@benchmark("e2e.register_success", number=3, repeat=3)
+def _e2e_exito():
+    cliente = _cliente()
+    contador = itertools.count()
+    return lambda: cliente.post("/register", json={
+        "fullname": "Juan Pérez", "email": f"u{next(contador)}@example.com", "password": "Pass1A$X"})
+
+@benchmark("e2e.check_email", number=2000)
+def _e2e_check_email():
+    cliente = _cliente()
+    return lambda: cliente.get("/check-email?email=nuevo@example.com")
+
+# --- Ejecución y comparación -------------------------------------------------
+
+def ejecutar(filtro=None, salida=print):
+    resultados = {}
+    try:
+        for nombre, (fabrica, number, repeat) in BENCHMARKS.items():
+            if filtro and filtro not in nombre:
+                continue
+            funcion = fabrica()
+            funcion()  # calentamiento (pools, cachés, primera conexión)
+            por_operacion = getattr(funcion, "por_operacion", 1)
+            segundos = min(timeit.repeat(funcion, number=number, repeat=repeat)) / number / por_operacion
+            resultados[nombre] = {"seconds_per_op": segundos, "ops_per_sec": 1 / segundos if segundos else None}
+            salida(f"{nombre:<48} {segundos * 1e6:>14.2f} µs/op")
+    finally:
+        _Temporal.limpiar()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": resultados,
+    }
+
+def comparar(base, actual, threshold=0.2):
+    """Lista de (nombre, base, actual, cambio) para los benchmarks más lentos que base·(1+threshold)."""
+    regresiones = []
+    for nombre, resultado in actual["results"].items():
+        anterior = base["results"].get(nombre)
+        if not anterior:
+            continue
+        cambio = resultado["seconds_per_op"] / anterior["seconds_per_op"] - 1
+        if cambio > threshold:
+            regresiones.append((nombre, anterior["seconds_per_op"], resultado["seconds_per_op"], cambio))
+    return regresiones
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    run = sub.add_parser("run", help="ejecuta la suite")
+    run.add_argument("--filter", help="solo benchmarks cuyo nombre contenga este texto")
+    run.add_argument("--save", help="guarda los resultados como línea base JSON")
+    compare = sub.add_parser("compare", help="ejecuta la suite y la compara con una línea base")
+    compare.add_argument("baseline")
+    compare.add_argument("--filter")
+    compare.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    datos = ejecutar(args.filter)
+    if args.comando == "run":
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                json.dump(datos, f, indent=2)
+            print(f"✅ Línea base guardada en {args.save}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    regresiones = comparar(base, datos, args.threshold)
+    if not regresiones:
+        print(f"✅ Sin regresiones por encima del {args.threshold:.0%}")
+        return 0
+    print(f"❌ {len(regresiones)} benchmark(s) más lentos que la línea base:")
+    for nombre, anterior, actual, cambio in regresiones:
+        print(f"  {nombre:<48} {anterior * 1e6:>12.2f} → {actual * 1e6:>12.2f} µs/op  (+{cambio:.0%})")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""Lista de contraseñas filtradas en un índice compacto en disco, compartido por mmap.
+
+Formato del índice (little-endian):
+    cabecera   MAGIC, versión, k hashes del Bloom, bits del Bloom, número de registros
+    bloom      bits del filtro de Bloom (rellenados hasta múltiplo de 8 bytes)
+    registros  SHA-1 de cada contraseña en minúsculas, truncado a un entero de 64 bits
+               (uint64 little-endian), ordenados y únicos
+
+Uso:
+    python blocklist.py build lista.txt blocklist.idx [--error-rate 0.001]
+    python blocklist.py check blocklist.idx <contraseña>
+"""
+import argparse
+import bisect
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bloom import BloomFilter
+
+MAGIC = b"PWBLIDX\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+RECORD_SIZE = 8
+CHUNK_SIZE = 1_000_000  # claves ordenadas en memoria por tramo al construir
+
+def normalizar(password):
+    # Igual que validate_password_common: la comparación no distingue mayúsculas
+    return password.lower()
+
+def clave(password):
+    return int.from_bytes(hashlib.sha1(normalizar(password).encode("utf-8")).digest()[:RECORD_SIZE], "big")
+
+def _a_bytes(claves):
+    datos = array("Q", claves)
+    if sys.byteorder != "little":
+        datos.byteswap()
+    return datos.tobytes()
+
+def _leer_lista(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for linea in f:
+            password = linea.rstrip("\r\n")
+            if password:
+                yield password
+
+def _escribir_tramo(claves, directorio):
+    claves.sort()
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directorio)
+    with os.fdopen(fd, "wb") as f:
+        f.write(_a_bytes(claves))
+    return path
+
+def _leer_tramo(path, bloque=65536):
+    with open(path, "rb") as f:
+        while True:
+            datos = f.read(bloque * RECORD_SIZE)
+            if not datos:
+                return
+            claves = array("Q", datos)
+            if sys.byteorder != "little":
+                claves.byteswap()
+            yield from claves
+
+def build_index(lista_path, index_path, error_rate=0.001, chunk_size=CHUNK_SIZE):
+    """Construye (o reemplaza de forma atómica) el índice a partir de una lista de texto.
+
+    Ordena por tramos y los mezcla, así que la memoria no depende del tamaño de la lista.
+    Devuelve el número de registros únicos.
+    """
+    directorio = os.path.dirname(os.path.abspath(index_path))
+    total = sum(1 for _ in _leer_lista(lista_path))
+    bloom = BloomFilter(total, error_rate)
+
+    tramos = []
+    try:
+        claves = []
+        for password in _leer_lista(lista_path):
+            bloom.add(normalizar(password))
+            claves.append(clave(password))
+            if len(claves) >= chunk_size:
+                tramos.append(_escribir_tramo(claves, directorio))
+                claves = []
+        if claves or not tramos:
+            tramos.append(_escribir_tramo(claves, directorio))
+
+        fd, tmp_path = tempfile.mkstemp(suffix=".idx", dir=directorio)
+        registros = 0
+        with os.fdopen(fd, "wb") as f:
+            bloom_bytes = bloom.to_bytes()
+            relleno = -len(bloom_bytes) % 8
+            f.write(HEADER.pack(MAGIC, VERSION, bloom.num_hashes, bloom.num_bits, 0))
+            f.write(bloom_bytes + b"\0" * relleno)
+            anterior = None
+            salida = []
+            for registro in heapq.merge(*(_leer_tramo(p) for p in tramos)):
+                if registro != anterior:
+                    salida.append(registro)
+                    anterior = registro
+                    if len(salida) >= 65536:
+                        f.write(_a_bytes(salida))
+                        registros += len(salida)
+                        salida = []
+            f.write(_a_bytes(salida))
+            registros += len(salida)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, bloom.num_hashes, bloom.num_bits, registros))
+        # Reemplazo atómico: los procesos que ya tienen el índice mapeado siguen con el anterior
+        os.replace(tmp_path, index_path)
+        return registros
+    finally:
+        for path in tramos:
+            os.remove(path)
+
+class BlockList:
+    """Consulta de solo lectura sobre un índice mapeado en memoria (páginas compartidas entre procesos)."""
+
+    def __init__(self, index_path):
+        self.path = index_path
+        with open(index_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, num_hashes, num_bits, registros = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{index_path} is not a password blocklist index")
+        bloom_len = (num_bits + 7) // 8
+        inicio = HEADER.size
+        self._bloom = BloomFilter.from_buffer(memoryview(self._mm)[inicio:inicio + bloom_len],
+                                              num_bits, num_hashes, registros)
+        registros_inicio = inicio + bloom_len + (-bloom_len % 8)
+        self.registros = registros
+        if sys.byteorder == "little":
+            # Vista uint64 directa sobre el mmap: bisect busca en C sin copiar registros
+            self._claves = memoryview(self._mm)[registros_inicio:registros_inicio + registros * RECORD_SIZE].cast("Q")
+        else:
+            self._claves = array("Q", self._mm[registros_inicio:registros_inicio + registros * RECORD_SIZE])
+            self._claves.byteswap()
+
+    def __len__(self):
+        return self.registros
+
+    def __contains__(self, password):
+        normalizada = normalizar(password)
+        if normalizada not in self._bloom:
+            return False
+        buscada = int.from_bytes(hashlib.sha1(normalizada.encode("utf-8")).digest()[:RECORD_SIZE], "big")
+        claves = self._claves
+        i = bisect.bisect_left(claves, buscada)
+        return i < self.registros and claves[i] == buscada
+
+    def close(self):
+        self._bloom.bits.release()
+        if isinstance(self._claves, memoryview):
+            self._claves.release()
+        self._mm.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Índice de contraseñas filtradas")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    build = sub.add_parser("build", help="construye o actualiza el índice desde una lista de texto")
+    build.add_argument("lista")
+    build.add_argument("indice")
+    build.add_argument("--error-rate", type=float, default=0.001)
+    build.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    check = sub.add_parser("check", help="indica si una contraseña está en el índice")
+    check.add_argument("indice")
+    check.add_argument("password")
+    args = parser.parse_args(argv)
+
+    if args.comando == "build":
+        registros = build_index(args.lista, args.indice, args.error_rate, args.chunk_size)
+        print(f"✅ Índice {args.indice} generado con {registros} contraseñas.")
+        return 0
+    blocklist = BlockList(args.indice)
+    encontrada = args.password in blocklist
+    blocklist.close()
+    print("❌ Contraseña filtrada" if encontrada else "✅ No está en la lista")
+    return 1 if encontrada else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
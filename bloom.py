@@ -0,0 +1,54 @@
+import hashlib
+import math
+
+class BloomFilter:
+    """Filtro de Bloom: "no está" es seguro; "puede estar" hay que confirmarlo."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        # Tamaño óptimo: m = -n·ln(p) / ln(2)^2 bits y k = m/n·ln(2) funciones hash
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _posiciones(self, item):
+        # Doble hashing (Kirsch-Mitzenmacher): k posiciones a partir de un único digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        for pos in self._posiciones(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits = self.bits
+        num_bits = self.num_bits
+        # Salimos en el primer bit a cero: los "no está" son los más baratos
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % num_bits
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def to_bytes(self):
+        return bytes(self.bits)
+
+    @classmethod
+    def from_buffer(cls, buffer, num_bits, num_hashes, count=0):
+        """Filtro de solo lectura sobre un buffer existente (por ejemplo, un mmap)."""
+        bloom = cls.__new__(cls)
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.capacity = count
+        bloom.error_rate = None
+        bloom.bits = buffer
+        bloom.count = count
+        return bloom
@@ -0,0 +1,86 @@
+"""Caché de resultados de selenium_runner en un SQLite junto a la hoja, para reanudar ejecuciones.
+
+Cada fila se identifica por un hash de sus cuatro campos de entrada, del destino de la
+ejecución (modo y servidor o base) y del número de veces que esos mismos campos ya
+aparecieron antes en la hoja: dos filas idénticas (p. ej. un registro y su duplicado)
+tienen resultados distintos y no se confunden. Esos contadores viven en una tabla TEMP
+de la misma conexión (en disco), no en memoria, para que hojas enormes no la hagan crecer.
+Los resultados se confirman en disco cada
+`CHECKPOINT_ROWS` filas o `CHECKPOINT_SECONDS` segundos, así que una ejecución interrumpida
+conserva casi todo lo hecho y la siguiente solo ejecuta las filas nuevas o modificadas.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+CHECKPOINT_ROWS = 100
+CHECKPOINT_SECONDS = 5.0
+
+class CacheResultados:
+    def __init__(self, path, contexto=()):
+        self.path = path
+        self._contexto = json.dumps(list(contexto), default=str)
+        # La lectura de la hoja (get) y la escritura de resultados (put) van en hilos distintos
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA temp_store=FILE")
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS resultados (
+                                clave TEXT PRIMARY KEY,
+                                resultado TEXT NOT NULL,
+                                actualizado REAL NOT NULL)""")
+        # Apariciones de cada huella en esta ejecución; se descarta al cerrar la conexión
+        self._conn.execute("""CREATE TEMP TABLE apariciones (
+                                huella BLOB PRIMARY KEY,
+                                n INTEGER NOT NULL)""")
+        self._conn.commit()
+        self._sin_confirmar = 0
+        self._ultimo_checkpoint = time.monotonic()
+        self.aciertos = 0
+        self.guardados = 0
+
+    def clave(self, datos):
+        """Clave de la siguiente fila con estos campos (llamar una vez por fila, en orden)."""
+        huella = hashlib.sha256(json.dumps([self._contexto, *datos], default=str).encode("utf-8")).digest()
+        with self._lock:
+            fila = self._conn.execute("SELECT n FROM apariciones WHERE huella = ?", (huella,)).fetchone()
+            n = fila[0] if fila else 0
+            self._conn.execute("INSERT OR REPLACE INTO apariciones (huella, n) VALUES (?, ?)", (huella, n + 1))
+        return hashlib.sha256(huella + n.to_bytes(4, "big")).hexdigest()
+
+    def get(self, clave):
+        with self._lock:
+            fila = self._conn.execute("SELECT resultado FROM resultados WHERE clave = ?", (clave,)).fetchone()
+        if fila is None:
+            return None
+        self.aciertos += 1
+        return fila[0]
+
+    def put(self, clave, resultado):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO resultados (clave, resultado, actualizado) "
+                               "VALUES (?, ?, ?)", (clave, resultado, time.time()))
+        self.guardados += 1
+        self._sin_confirmar += 1
+        if (self._sin_confirmar >= CHECKPOINT_ROWS
+                or time.monotonic() - self._ultimo_checkpoint >= CHECKPOINT_SECONDS):
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._conn.commit()
+        self._sin_confirmar = 0
+        self._ultimo_checkpoint = time.monotonic()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
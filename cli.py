@@ -0,0 +1,131 @@
+"""Punto de entrada único del proyecto.
+
+    python cli.py serve [--asgi | --workers 4] [--port 5000] [--shards 4] [--skip-init-db]
+    python cli.py run-sheet --input usuarios.xlsx --modo http --workers 8   (opciones de selenium_runner.py)
+    python cli.py validate-report usuarios.xlsx [--output detalle.xlsx] [--summary]
+    python cli.py bench run --filter validators                             (opciones de benchmarks/suite.py)
+    python cli.py init-db [--shards 4]
+
+Importar este módulo no carga Flask, selenium, requests ni openpyxl: cada subcomando
+importa lo que necesita al ejecutarse (MODULOS), así que `validate-report` o `init-db`
+arrancan sin pagar el servidor ni el navegador.
+"""
+import argparse
+import importlib
+import os
+import sys
+
+# Módulos que importa cada subcomando (tests/test_cli.py mide lo que tarda cada grupo)
+MODULOS = {
+    "serve": ("server",),
+    "serve --workers": ("prefork", "server"),
+    "run-sheet": ("selenium_runner",),
+    "validate-report": ("selenium_runner",),
+    "bench": ("benchmarks.suite",),
+    "init-db": ("sharding",),
+}
+
+def cargar(subcomando):
+    """Importa los módulos del subcomando y los devuelve en el orden de MODULOS."""
+    return [importlib.import_module(nombre) for nombre in MODULOS[subcomando]]
+
+def _init_db(args):
+    """Crea el esquema de todos los shards una sola vez, antes de crear la app."""
+    (sharding,) = cargar("init-db")
+    return sharding.crear_esquemas(args.database, args.shards)
+
+def serve(args, resto):
+    if not args.skip_init_db:
+        _init_db(args)
+    # El esquema ya está creado (aquí o por un `init-db` previo): la app no lo repite
+    config = {"DATABASE": args.database, "DB_SHARDS": args.shards, "INIT_DB": False}
+    if args.asgi:
+        try:
+            import uvicorn
+        except ImportError:
+            raise SystemExit("❌ Serving the ASGI app requires uvicorn (pip install uvicorn)")
+        from asgi_server import create_asgi_app
+        uvicorn.run(create_asgi_app(config), host=args.host, port=args.port)
+        return 0
+    if args.workers:
+        prefork, _ = cargar("serve --workers")
+        return prefork.servir(config, args.host, args.port, args.workers)
+    (server,) = cargar("serve")
+    config["DEBUG"] = args.debug
+    server.create_app(config).run(host=args.host, port=args.port, debug=args.debug)
+    return 0
+
+def run_sheet(args, resto):
+    (selenium_runner,) = cargar("run-sheet")
+    selenium_runner.main(resto)
+    return 0
+
+def validate_report(args, resto):
+    (selenium_runner,) = cargar("validate-report")
+    if not os.path.exists(args.entrada):
+        print(f"❌ Input file not found: {args.entrada}")
+        return 1
+    salida = args.output or selenium_runner.rutas_salida(args.entrada)[1]
+    stats = selenium_runner.procesar_resultados_excel(args.entrada, salida, workers=args.workers,
+                                                      resumen=args.summary)
+    print(f"✅ Reporte de validadores guardado en {salida}: {stats['rows']} filas, "
+          f"{stats['evaluated']} combinaciones distintas evaluadas")
+    if args.summary:
+        print(f"Resumen por validador en {stats['summary']}")
+    return 0
+
+def bench(args, resto):
+    (suite,) = cargar("bench")
+    return suite.main(resto)
+
+def init_db(args, resto):
+    rutas = _init_db(args)
+    print(f"✅ Esquema listo en {len(rutas)} shard(s):")
+    for ruta in rutas:
+        print(f"  {ruta}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio de registro: servidor, hojas de datos y benchmarks")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    def base_de_datos(cmd):
+        cmd.add_argument("--database", default="users.db", help="valor de DATABASE (por defecto users.db)")
+        cmd.add_argument("--shards", type=int, default=1, help="valor de DB_SHARDS (por defecto 1)")
+
+    cmd = sub.add_parser("serve", help="arranca el servidor (Flask, o ASGI con --asgi)")
+    cmd.add_argument("--host", default="127.0.0.1")
+    cmd.add_argument("--port", type=int, default=5000)
+    cmd.add_argument("--asgi", action="store_true", help="sirve asgi_server con uvicorn")
+    cmd.add_argument("--workers", type=int, default=0,
+                     help="N procesos worker con prefork.py (0 = servidor de desarrollo de un proceso)")
+    cmd.add_argument("--debug", action="store_true", help="modo debug de Flask (recarga al cambiar el código)")
+    cmd.add_argument("--skip-init-db", action="store_true",
+                     help="no crea el esquema al arrancar (ya se hizo con init-db)")
+    base_de_datos(cmd)
+    cmd.set_defaults(ejecutar=serve)
+
+    # run-sheet y bench pasan sus argumentos tal cual al main del módulo (también -h)
+    cmd = sub.add_parser("run-sheet", add_help=False, help="ejecuta una hoja contra /register")
+    cmd.set_defaults(ejecutar=run_sheet)
+    cmd = sub.add_parser("bench", add_help=False, help="suite de benchmarks")
+    cmd.set_defaults(ejecutar=bench)
+
+    cmd = sub.add_parser("validate-report", help="detalle por validador de una hoja, sin servidor ni navegador")
+    cmd.add_argument("entrada", help="datos de entrada (.xlsx, .csv, .jsonl, .parquet)")
+    cmd.add_argument("--output", "-o", help="por defecto resultados_detalle_validadores.<ext> junto a la entrada")
+    cmd.add_argument("--workers", type=int, help="procesos que evalúan los validadores (por defecto, uno por núcleo)")
+    cmd.add_argument("--summary", action="store_true", help="añade el resumen de aciertos y fallos por validador")
+    cmd.set_defaults(ejecutar=validate_report)
+
+    cmd = sub.add_parser("init-db", help="crea el esquema de la base (una vez, antes de serve --skip-init-db)")
+    base_de_datos(cmd)
+    cmd.set_defaults(ejecutar=init_db)
+
+    args, resto = parser.parse_known_args(argv)
+    if resto and args.ejecutar not in (run_sheet, bench):
+        parser.error(f"unrecognized arguments: {' '.join(resto)}")
+    return args.ejecutar(args, resto)
+
+if __name__ == "__main__":
+    sys.exit(main())
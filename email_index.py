@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+from bloom import BloomFilter
+
+# SQLite limita el número de parámetros por consulta; consultamos en bloques
+SQLITE_IN_CHUNK = 500
+
+class EmailIndex:
+    """Índice en memoria de emails registrados para detectar duplicados antes del hash.
+
+    Un filtro de Bloom descarta al instante los emails nuevos; un LRU guarda los
+    registrados confirmados; el resto se resuelve con el índice UNIQUE de users.
+    La restricción UNIQUE sigue siendo la garantía final.
+
+    Con ``exclusive=False`` (varios procesos escriben en la misma base) el filtro no ve
+    los registros de los otros procesos, así que un "no está" del filtro ya no basta:
+    se consulta siempre la base salvo que el LRU confirme el email.
+    """
+
+    def __init__(self, pool, capacity=100000, error_rate=0.01, lru_size=10000, exclusive=True):
+        self.pool = pool
+        self.exclusive = exclusive
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.lru_size = lru_size
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    def warm(self):
+        """Carga en el filtro todos los emails de la tabla users."""
+        with self.pool.connection() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+            bloom = BloomFilter(max(self.capacity, total * 2), self.error_rate)
+            for (email,) in conn.execute("SELECT email FROM users"):
+                bloom.add(email)
+        with self._lock:
+            self._bloom = bloom
+            self.capacity = bloom.capacity
+
+    def _recordar(self, email):
+        self._lru[email] = True
+        self._lru.move_to_end(email)
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def add(self, email):
+        """Marca un email como registrado (tras un INSERT o un IntegrityError)."""
+        with self._lock:
+            self._bloom.add(email)
+            self._recordar(email)
+            lleno = self._bloom.count > self.capacity
+        if lleno:
+            # El filtro superó su capacidad y su tasa de falsos positivos crece: lo reconstruimos
+            self.warm()
+
+    def _quizas(self, email):
+        with self._lock:
+            if email in self._lru:
+                self._lru.move_to_end(email)
+                return True, True
+            return not self.exclusive or email in self._bloom, False
+
+    def contains(self, email):
+        """True si el email ya está registrado."""
+        quizas, seguro = self._quizas(email)
+        if seguro or not quizas:
+            return seguro
+        with self.pool.connection() as conn:
+            existe = conn.execute("SELECT 1 FROM users WHERE email = ?", (email,)).fetchone() is not None
+        if existe:
+            with self._lock:
+                self._recordar(email)
+        return existe
+
+    def existing(self, emails):
+        """Devuelve el subconjunto de emails que ya están registrados."""
+        encontrados = set()
+        dudosos = []
+        for email in emails:
+            quizas, seguro = self._quizas(email)
+            if seguro:
+                encontrados.add(email)
+            elif quizas:
+                dudosos.append(email)
+        if not dudosos:
+            return encontrados
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(dudosos), SQLITE_IN_CHUNK):
+                bloque = dudosos[i:i + SQLITE_IN_CHUNK]
+                marcadores = ",".join("?" * len(bloque))
+                cursor.execute(f"SELECT email FROM users WHERE email IN ({marcadores})", bloque)
+                encontrados.update(fila[0] for fila in cursor.fetchall())
+        return encontrados
@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from werkzeug.security import check_password_hash, generate_password_hash
+
+class HashingBusy(Exception):
+    """La cola de hashing está llena; el cliente debe reintentar más tarde."""
+
+def _hash_medido(password, method):
+    # Se ejecuta en el worker: devolvemos también cuánto tardó el hash en sí
+    inicio = time.perf_counter()
+    hashed = generate_password_hash(password, method=method)
+    return hashed, time.perf_counter() - inicio
+
+def _verificar_medido(hashed, password):
+    inicio = time.perf_counter()
+    correcta = check_password_hash(hashed, password)
+    return correcta, time.perf_counter() - inicio
+
+def _contexto_procesos():
+    # El pool se crea al primer uso, con el servidor ya lleno de hilos: un fork copiaría
+    # locks tomados por otros hilos. forkserver arranca los workers desde un proceso limpio
+    # (spawn donde no existe, p. ej. Windows)
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+class HashingExecutor:
+    """Pool de workers para el hash de contraseñas con una cola acotada.
+
+    Como mucho ``workers + queue_size`` hashes pueden estar en curso o en espera;
+    por encima de eso ``submit`` lanza HashingBusy en lugar de encolar.
+    """
+
+    def __init__(self, workers=None, queue_size=64, kind="process", method="pbkdf2:sha256"):
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown hashing executor kind: {kind!r}")
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.kind = kind
+        self.method = method
+        self._capacidad = threading.BoundedSemaphore(self.workers + queue_size)
+        self._executor = None
+        self._lock = threading.Lock()
+        # Métricas de saturación
+        self._en_curso = 0
+        self._enviados = 0
+        self._rechazados = 0
+        self._completados = 0
+        self._espera_total = 0.0
+        self._espera_max = 0.0
+        self._hash_total = 0.0
+
+    def _get_executor(self):
+        # Se crea al primer uso para no arrancar procesos en apps que nunca registran
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                             mp_context=_contexto_procesos())
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                            thread_name_prefix="hashing")
+                    weakref.finalize(self, self._executor.shutdown, wait=False)
+        return self._executor
+
+    def _enviar(self, funcion, args, bloquear):
+        if not self._capacidad.acquire(blocking=bloquear):
+            with self._lock:
+                self._rechazados += 1
+            raise HashingBusy("Password hashing queue is full")
+        enviado = time.perf_counter()
+        with self._lock:
+            self._en_curso += 1
+            self._enviados += 1
+        try:
+            future = self._get_executor().submit(funcion, *args)
+        except Exception:
+            self._terminar(None, enviado)
+            raise
+        future.add_done_callback(lambda f: self._terminar(f, enviado))
+        return future
+
+    def _terminar(self, future, enviado):
+        total = time.perf_counter() - enviado
+        duracion_hash = 0.0
+        if future is not None and not future.cancelled() and future.exception() is None:
+            duracion_hash = future.result()[1]
+        espera = max(0.0, total - duracion_hash)
+        with self._lock:
+            self._en_curso -= 1
+            if future is not None:
+                self._completados += 1
+                self._espera_total += espera
+                self._espera_max = max(self._espera_max, espera)
+                self._hash_total += duracion_hash
+        self._capacidad.release()
+
+    def hash(self, password, timeout=None):
+        """Encola el hash y espera el resultado. Lanza HashingBusy si la cola está llena."""
+        return self._enviar(_hash_medido, (password, self.method), bloquear=False).result(timeout=timeout)[0]
+
+    def submit(self, password):
+        """Encola el hash sin esperar (para código asíncrono). Lanza HashingBusy si la cola está llena.
+
+        El Future resuelve a (hash, segundos de cómputo).
+        """
+        return self._enviar(_hash_medido, (password, self.method), bloquear=False)
+
+    def check(self, hashed, password, timeout=None):
+        """Verifica una contraseña contra su hash en el mismo pool (también es CPU). Lanza HashingBusy."""
+        return self._enviar(_verificar_medido, (hashed, password), bloquear=False).result(timeout=timeout)[0]
+
+    def hash_many(self, passwords):
+        """Hashea varias contraseñas respetando el límite de la cola (espera en vez de rechazar)."""
+        futures = [self._enviar(_hash_medido, (password, self.method), bloquear=True)
+                   for password in passwords]
+        return [future.result()[0] for future in futures]
+
+    def stats(self):
+        """Métricas para dimensionar el pool: profundidad de cola y tiempos de espera."""
+        with self._lock:
+            completados = self._completados
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self._en_curso,
+                "queue_depth": max(0, self._en_curso - self.workers),
+                "submitted": self._enviados,
+                "rejected": self._rechazados,
+                "completed": completados,
+                "avg_wait_ms": round(self._espera_total / completados * 1000, 3) if completados else 0.0,
+                "max_wait_ms": round(self._espera_max * 1000, 3),
+                "avg_hash_ms": round(self._hash_total / completados * 1000, 3) if completados else 0.0,
+            }
+
+    def shutdown(self, wait=True):
+        """Detiene los workers; el siguiente hash crea un pool nuevo."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,238 @@
+"""Claves de idempotencia para /register: los reintentos de un cliente no repiten el trabajo.
+
+La primera petición con una `Idempotency-Key` hace el registro y su respuesta se guarda
+`ttl` segundos. Un reintento con la misma clave y el mismo cuerpo recibe esa respuesta sin
+volver a validar, hashear ni insertar. Si llega mientras la primera sigue en curso, espera
+a que termine y reutiliza su resultado (las peticiones concurrentes se agrupan). La misma
+clave con otro cuerpo es un error del cliente (IdempotencyConflict).
+
+Las respuestas viven en un LRU en memoria de como mucho `max_keys` claves y, si se indica
+`path`, también en una tabla SQLite: sobreviven a un reinicio y las comparten los workers
+de prefork.py. Con SQLite la clave se reserva antes de hacer el trabajo (una fila sin
+respuesta, INSERT OR IGNORE): entre procesos también hay un solo ganador, y los demás esperan
+a que su respuesta aparezca en la tabla. La primera respuesta guardada es la definitiva.
+Las respuestas 5xx (p. ej. 503 por saturación) no se guardan: el reintento vuelve a probar.
+
+Una respuesta es la tupla (status, headers, cuerpo) con headers como lista de pares de str
+y el cuerpo en bytes.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from storage import DEFAULT_PRAGMAS, connect
+
+MAX_KEY_LENGTH = 255
+PURGE_EVERY = 1000  # escrituras entre limpiezas de filas caducadas en SQLite
+# Segundos que dura la reserva de una clave en curso: si el proceso que la tomó muere, pasado
+# este tiempo otra petición puede volver a tomarla
+RESERVATION_TTL = 60
+POLL_INTERVAL = 0.05  # segundos entre lecturas de la reserva de otro proceso
+
+class IdempotencyConflict(Exception):
+    """La clave ya se usó con otra petición."""
+
+def huella(*partes):
+    """Resumen de la petición (método, ruta, cuerpo) para detectar claves reutilizadas."""
+    resumen = hashlib.sha256()
+    for parte in partes:
+        resumen.update(parte if isinstance(parte, bytes) else str(parte).encode("utf-8"))
+        resumen.update(b"\0")
+    return resumen.hexdigest()
+
+def clave_valida(clave):
+    return clave is not None and 0 < len(clave) <= MAX_KEY_LENGTH and clave.isprintable()
+
+def _a_texto(respuesta):
+    status, headers, cuerpo = respuesta
+    return json.dumps([status, headers, cuerpo.decode("utf-8")], ensure_ascii=False)
+
+def _de_texto(texto):
+    status, headers, cuerpo = json.loads(texto)
+    return status, [tuple(h) for h in headers], cuerpo.encode("utf-8")
+
+class IdempotencyStore:
+    def __init__(self, ttl=86400, max_keys=10000, path=None, pragmas=DEFAULT_PRAGMAS,
+                 reservation_ttl=RESERVATION_TTL):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.reservation_ttl = reservation_ttl
+        self._guardadas = OrderedDict()  # clave -> (caduca, huella, respuesta)
+        self._en_curso = {}              # clave -> (huella, Future)
+        self._lock = threading.Lock()
+        self.path = path
+        self.pragmas = pragmas
+        self._conn = None
+        self._escrituras = 0
+
+    def _db(self):
+        # Se abre al primer uso (y de nuevo tras close(), p. ej. en cada worker tras el fork)
+        if self._conn is None and self.path:
+            self._conn = connect(self.path, self.pragmas)
+            # respuesta NULL = reservada por una petición en curso (de este u otro proceso)
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS idempotency (
+                                    clave TEXT PRIMARY KEY,
+                                    huella TEXT NOT NULL,
+                                    respuesta TEXT,
+                                    caduca REAL NOT NULL)""")
+            self._conn.commit()
+        return self._conn
+
+    def _buscar(self, clave, ahora):
+        guardada = self._guardadas.get(clave)
+        if guardada is not None:
+            if guardada[0] > ahora:
+                self._guardadas.move_to_end(clave)
+                return guardada
+            del self._guardadas[clave]
+        return None
+
+    def _recordar(self, clave, guardada):
+        self._guardadas[clave] = guardada
+        self._guardadas.move_to_end(clave)
+        while len(self._guardadas) > self.max_keys:
+            self._guardadas.popitem(last=False)
+
+    def reservar(self, clave, huella_peticion):
+        """Devuelve (futuro, propia). Con propia=True el llamador hace el trabajo y llama a
+        completar() o fallar(); si no, `futuro` resuelve (o ya resolvió) a la respuesta de otro.
+        Lanza IdempotencyConflict si la clave se usó con otra petición.
+        """
+        with self._lock:
+            ahora = time.time()
+            guardada = self._buscar(clave, ahora)
+            if guardada is not None:
+                if guardada[1] != huella_peticion:
+                    raise IdempotencyConflict(clave)
+                return _resuelto(guardada[2]), False
+            en_curso = self._en_curso.get(clave)
+            if en_curso is not None:
+                if en_curso[0] != huella_peticion:
+                    raise IdempotencyConflict(clave)
+                return en_curso[1], False
+            futuro = Future()
+            if self._db() is not None and not self._reservar_en_db(clave, huella_peticion, ahora):
+                # Otra petición tiene (o tuvo) la clave: su respuesta guardada o la espera
+                caduca, huella_guardada, texto = self._conn.execute(
+                    "SELECT caduca, huella, respuesta FROM idempotency WHERE clave = ?", (clave,)).fetchone()
+                if huella_guardada != huella_peticion:
+                    raise IdempotencyConflict(clave)
+                if texto is not None:
+                    respuesta = _de_texto(texto)
+                    self._recordar(clave, (caduca, huella_guardada, respuesta))
+                    return _resuelto(respuesta), False
+                self._en_curso[clave] = (huella_peticion, futuro)
+                threading.Thread(target=self._sondear, args=(clave, futuro), daemon=True,
+                                 name="idempotency-poll").start()
+                return futuro, False
+            self._en_curso[clave] = (huella_peticion, futuro)
+            return futuro, True
+
+    def _reservar_en_db(self, clave, huella_peticion, ahora):
+        """True si esta petición tomó la clave en SQLite (no había fila vigente)."""
+        self._conn.execute("DELETE FROM idempotency WHERE clave = ? AND caduca <= ?", (clave, ahora))
+        cursor = self._conn.execute("INSERT OR IGNORE INTO idempotency (clave, huella, respuesta, caduca) "
+                                    "VALUES (?, ?, NULL, ?)",
+                                    (clave, huella_peticion, ahora + self.reservation_ttl))
+        self._conn.commit()
+        return cursor.rowcount == 1
+
+    def _sondear(self, clave, futuro):
+        """Espera la respuesta de la petición de otro proceso que reservó la clave."""
+        while True:
+            time.sleep(POLL_INTERVAL)
+            with self._lock:
+                if self._conn is None:
+                    resultado = ConnectionError("Idempotency store closed")
+                else:
+                    fila = self._conn.execute("SELECT caduca, huella, respuesta FROM idempotency "
+                                              "WHERE clave = ? AND caduca > ?", (clave, time.time())).fetchone()
+                    if fila is not None and fila[2] is None:
+                        continue
+                    if fila is None:
+                        # El dueño falló o murió sin respuesta: el cliente puede reintentar
+                        resultado = TimeoutError(f"Idempotency-Key {clave!r} was released without a response")
+                    else:
+                        resultado = _de_texto(fila[2])
+                        self._recordar(clave, (fila[0], fila[1], resultado))
+                self._en_curso.pop(clave, None)
+            if isinstance(resultado, Exception):
+                futuro.set_exception(resultado)
+            else:
+                futuro.set_result(resultado)
+            return
+
+    def completar(self, clave, respuesta):
+        """Entrega la respuesta a quienes esperan y la guarda si no es un error del servidor.
+
+        Devuelve la respuesta definitiva: si otra petición ya guardó una para la clave (p. ej.
+        nuestra reserva caducó), gana la primera y es la que se entrega.
+        """
+        with self._lock:
+            huella_peticion, futuro = self._en_curso.pop(clave)
+            if self._db() is not None:
+                respuesta = self._persistir(clave, huella_peticion, respuesta)
+            if respuesta[0] < 500:
+                self._recordar(clave, (time.time() + self.ttl, huella_peticion, respuesta))
+        futuro.set_result(respuesta)
+        return respuesta
+
+    def _persistir(self, clave, huella_peticion, respuesta):
+        if respuesta[0] >= 500:
+            # Libera la reserva: el reintento (de este u otro proceso) vuelve a probar
+            self._conn.execute("DELETE FROM idempotency WHERE clave = ? AND respuesta IS NULL", (clave,))
+            self._conn.commit()
+            return respuesta
+        cursor = self._conn.execute("UPDATE idempotency SET respuesta = ?, caduca = ? "
+                                    "WHERE clave = ? AND huella = ? AND respuesta IS NULL",
+                                    (_a_texto(respuesta), time.time() + self.ttl, clave, huella_peticion))
+        if cursor.rowcount == 0:
+            # Sin reserva propia: gana la respuesta ya guardada; si no hay ninguna, la nuestra
+            fila = self._conn.execute("SELECT respuesta FROM idempotency WHERE clave = ? AND huella = ? "
+                                      "AND respuesta IS NOT NULL", (clave, huella_peticion)).fetchone()
+            if fila is not None:
+                self._conn.commit()
+                return _de_texto(fila[0])
+            self._conn.execute("INSERT OR IGNORE INTO idempotency (clave, huella, respuesta, caduca) "
+                               "VALUES (?, ?, ?, ?)",
+                               (clave, huella_peticion, _a_texto(respuesta), time.time() + self.ttl))
+        self._escrituras += 1
+        if self._escrituras % PURGE_EVERY == 0:
+            self._conn.execute("DELETE FROM idempotency WHERE caduca <= ?", (time.time(),))
+        self._conn.commit()
+        return respuesta
+
+    def fallar(self, clave, error):
+        """La petición propietaria lanzó una excepción: no se guarda nada y los que esperan la reciben."""
+        with self._lock:
+            _, futuro = self._en_curso.pop(clave)
+            if self._db() is not None:
+                self._conn.execute("DELETE FROM idempotency WHERE clave = ? AND respuesta IS NULL", (clave,))
+                self._conn.commit()
+        futuro.set_exception(error)
+
+    def ejecutar(self, clave, huella_peticion, funcion, timeout=None):
+        """Versión síncrona: devuelve (respuesta, repetida) llamando a funcion() solo si hace falta."""
+        futuro, propia = self.reservar(clave, huella_peticion)
+        if not propia:
+            return futuro.result(timeout=timeout), True
+        try:
+            respuesta = funcion()
+        except BaseException as e:
+            self.fallar(clave, e)
+            raise
+        definitiva = self.completar(clave, respuesta)
+        return definitiva, definitiva is not respuesta
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+def _resuelto(respuesta):
+    futuro = Future()
+    futuro.set_result(respuesta)
+    return futuro
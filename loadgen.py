@@ -0,0 +1,244 @@
+"""Generador de carga para /register con informe de throughput y percentiles de latencia.
+
+Lanza N clientes virtuales (hilos) contra un servidor en marcha (--url) o contra una
+app creada en el mismo proceso con create_app (por defecto, con una base temporal).
+
+Uso:
+    python loadgen.py --clients 16 --requests 500
+    python loadgen.py --url http://127.0.0.1:5000 --duration 30 --invalid-ratio 0.2 --json informe.json
+    python loadgen.py --app asgi --clients 64     # misma carga contra asgi_server.py
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+# Cargas inválidas representativas, una por regla de validación de /register
+CARGAS_INVALIDAS = [
+    {"fullname": "", "email": "", "password": ""},
+    {"fullname": "Jo", "email": "jo@example.com", "password": "Pass1A$X"},
+    {"fullname": "Juan 3", "email": "juan3@example.com", "password": "Pass1A$X"},
+    {"fullname": "Juan Pérez", "email": "correo@", "password": "Pass1A$X"},
+    {"fullname": "Juan Pérez", "email": "Correo@Example.com", "password": "Pass1A$X"},
+    {"fullname": "Juan Pérez", "email": "correo@example.com", "password": "Pass123"},
+    {"fullname": "Juan Pérez", "email": "correo@example.com", "password": "Pass1A$X" * 4},
+]
+
+def cliente_http(url_base):
+    """Función post(payload) -> (status, mensaje) con una sesión keep-alive por hilo."""
+    import requests
+    locales = threading.local()
+    url = url_base.rstrip("/") + "/register"
+
+    def post(payload):
+        sesion = getattr(locales, "sesion", None)
+        if sesion is None:
+            sesion = locales.sesion = requests.Session()
+        respuesta = sesion.post(url, json=payload, timeout=60)
+        try:
+            mensaje = respuesta.json().get("message")
+        except ValueError:
+            mensaje = None
+        return respuesta.status_code, mensaje
+
+    return post
+
+def cliente_inproceso(app):
+    """Función post(payload) -> (status, mensaje) sobre el test_client de la app."""
+    locales = threading.local()
+
+    def post(payload):
+        cliente = getattr(locales, "cliente", None)
+        if cliente is None:
+            cliente = locales.cliente = app.test_client()
+        respuesta = cliente.post("/register", json=payload)
+        return respuesta.status_code, (respuesta.get_json(silent=True) or {}).get("message")
+
+    return post
+
+def cliente_asgi(app):
+    """Función post(payload) -> (status, mensaje) sobre una app ASGI en un bucle de eventos propio.
+
+    Los hilos cliente solo esperan el resultado: todas las peticiones comparten un único
+    bucle, como en un servidor ASGI real.
+    """
+    import asyncio
+    from asgi_server import llamar
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True, name="asgi-loop").start()
+    headers = [(b"content-type", b"application/json")]
+
+    def post(payload):
+        cuerpo = json.dumps(payload).encode("utf-8")
+        futuro = asyncio.run_coroutine_threadsafe(llamar(app, "POST", "/register", cuerpo, b"", headers), loop)
+        status, _, datos = futuro.result()
+        try:
+            mensaje = json.loads(datos).get("message")
+        except ValueError:
+            mensaje = None
+        return status, mensaje
+
+    return post
+
+class GeneradorCargas:
+    """Produce cargas válidas únicas y una proporción configurable de inválidas y duplicadas."""
+
+    def __init__(self, invalid_ratio=0.0, duplicate_ratio=0.0, seed=None):
+        self.invalid_ratio = invalid_ratio
+        self.duplicate_ratio = duplicate_ratio
+        self._random = random.Random(seed)
+        self._prefijo = uuid.uuid4().hex[:8]
+        self._contador = itertools.count()
+        self._enviados = []
+        self._lock = threading.Lock()
+
+    def siguiente(self):
+        """Devuelve (tipo, payload) con tipo en valid/invalid/duplicate."""
+        with self._lock:
+            sorteo = self._random.random()
+            if sorteo < self.invalid_ratio:
+                return "invalid", dict(self._random.choice(CARGAS_INVALIDAS))
+            if sorteo < self.invalid_ratio + self.duplicate_ratio and self._enviados:
+                return "duplicate", dict(self._random.choice(self._enviados))
+            n = next(self._contador)
+            payload = {"fullname": "Usuario Carga", "email": f"carga-{self._prefijo}-{n}@example.com",
+                       "password": "Carga1!Xy"}
+            self._enviados.append(payload)
+            return "valid", payload
+
+def percentil(ordenadas, p):
+    if not ordenadas:
+        return 0.0
+    indice = max(0, min(len(ordenadas) - 1, int(round(p / 100 * len(ordenadas))) - 1))
+    return ordenadas[indice]
+
+def ejecutar_carga(post, clients=8, requests=200, duration=None, invalid_ratio=0.0,
+                   duplicate_ratio=0.0, seed=None):
+    """Lanza `clients` hilos hasta completar `requests` peticiones (o `duration` segundos)."""
+    generador = GeneradorCargas(invalid_ratio, duplicate_ratio, seed)
+    turnos = itertools.count()
+    fin = time.perf_counter() + duration if duration else None
+    muestras = []  # (tipo, latencia, status, mensaje)
+    lock = threading.Lock()
+
+    def cliente():
+        locales = []
+        while True:
+            if fin is not None:
+                if time.perf_counter() >= fin:
+                    break
+            elif next(turnos) >= requests:
+                break
+            tipo, payload = generador.siguiente()
+            inicio = time.perf_counter()
+            try:
+                status, mensaje = post(payload)
+            except Exception as e:
+                status, mensaje = 0, f"{type(e).__name__}: {e}"
+            locales.append((tipo, time.perf_counter() - inicio, status, mensaje))
+        with lock:
+            muestras.extend(locales)
+
+    inicio = time.perf_counter()
+    hilos = [threading.Thread(target=cliente, daemon=True) for _ in range(clients)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return informe(muestras, time.perf_counter() - inicio, clients)
+
+def informe(muestras, duracion, clients):
+    latencias = sorted(m[1] for m in muestras)
+    errores = {}
+    por_tipo = {}
+    for tipo, _, status, mensaje in muestras:
+        por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+        clave = f"{status} {mensaje}"
+        errores[clave] = errores.get(clave, 0) + 1
+    total = len(muestras)
+    return {
+        "clients": clients,
+        "requests": total,
+        "duration_s": round(duracion, 3),
+        "throughput_rps": round(total / duracion, 2) if duracion else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencias) / total * 1000, 3) if total else 0.0,
+            "p50": round(percentil(latencias, 50) * 1000, 3),
+            "p95": round(percentil(latencias, 95) * 1000, 3),
+            "p99": round(percentil(latencias, 99) * 1000, 3),
+            "max": round(latencias[-1] * 1000, 3) if latencias else 0.0,
+        },
+        "sent": por_tipo,
+        "responses": dict(sorted(errores.items(), key=lambda par: -par[1])),
+    }
+
+def formatear_tabla(datos):
+    lat = datos["latency_ms"]
+    lineas = [
+        f"Clientes      {datos['clients']}",
+        f"Peticiones    {datos['requests']} en {datos['duration_s']} s",
+        f"Throughput    {datos['throughput_rps']} req/s",
+        f"Latencia ms   media {lat['mean']}  p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}  máx {lat['max']}",
+        "Enviadas      " + "  ".join(f"{tipo} {n}" for tipo, n in sorted(datos["sent"].items())),
+        "",
+        f"{'Respuestas':<70} {'Total':>7}",
+    ]
+    for respuesta, n in datos["responses"].items():
+        lineas.append(f"{respuesta[:70]:<70} {n:>7}")
+    return "\n".join(lineas)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de /register")
+    parser.add_argument("--url", help="servidor en marcha; si se omite, se usa create_app en este proceso")
+    parser.add_argument("--app", choices=("flask", "asgi"), default="flask",
+                        help="app en proceso: server.py (flask) o asgi_server.py (asgi)")
+    parser.add_argument("--database", help="base SQLite de la app en proceso (por defecto, una temporal)")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--duration", type=float, help="segundos de prueba (ignora --requests)")
+    parser.add_argument("--invalid-ratio", type=float, default=0.0)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", dest="json_path", help="guarda el informe en JSON ('-' para stdout)")
+    args = parser.parse_args(argv)
+
+    temporal = None
+    if args.url:
+        post = cliente_http(args.url)
+    else:
+        database = args.database
+        if not database:
+            temporal = tempfile.mkdtemp(prefix="loadgen-")
+            database = os.path.join(temporal, "users.db")
+        if args.app == "asgi":
+            from asgi_server import create_asgi_app
+            post = cliente_asgi(create_asgi_app({"DATABASE": database}))
+        else:
+            from server import create_app
+            post = cliente_inproceso(create_app({"DATABASE": database}))
+
+    try:
+        datos = ejecutar_carga(post, args.clients, args.requests, args.duration,
+                               args.invalid_ratio, args.duplicate_ratio, args.seed)
+    finally:
+        if temporal:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+    if args.json_path == "-":
+        json.dump(datos, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+    print(formatear_tabla(datos))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Métricas en memoria (contadores, histogramas y gauges) con salida en formato de texto de Prometheus."""
+import threading
+import weakref
+from bisect import bisect_left
+from time import perf_counter
+
+# Límites (en segundos) de los histogramas de latencia: de 50 µs a 10 s
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _etiquetas(nombres, valores, extra=""):
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+def _numero(valor):
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+class _Fragmento:
+    """Datos de un hilo. Vive en el threading.local: se recolecta cuando el hilo termina."""
+    __slots__ = ("datos", "__weakref__")
+
+    def __init__(self):
+        self.datos = {}
+
+class _PorHilo:
+    """Base de las métricas: cada hilo escribe en su propio fragmento, sin bloqueos en el
+    camino caliente; los fragmentos se suman al exportar.
+
+    El servidor con hilos de werkzeug crea un hilo por petición: al terminar cada hilo su
+    fragmento se suma a `_retirados`, así que hay tantos fragmentos como hilos vivos.
+    """
+
+    def __init__(self, name, help_text, labelnames):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._fragmentos = {}  # id(datos) -> datos de los hilos vivos
+        self._retirados = {}   # suma de los fragmentos de hilos ya terminados
+        self._lock = threading.Lock()
+
+    def _fragmento(self):
+        try:
+            return self._local.fragmento.datos
+        except AttributeError:
+            fragmento = self._local.fragmento = _Fragmento()
+            with self._lock:
+                self._fragmentos[id(fragmento.datos)] = fragmento.datos
+            weakref.finalize(fragmento, self._retirar, fragmento.datos).atexit = False
+            return fragmento.datos
+
+    def _retirar(self, datos):
+        with self._lock:
+            del self._fragmentos[id(datos)]
+            for labels, valor in datos.items():
+                acumulado = self._retirados.get(labels)
+                if acumulado is None:
+                    self._retirados[labels] = valor
+                elif isinstance(valor, list):
+                    for i, parcial in enumerate(valor):
+                        acumulado[i] += parcial
+                else:
+                    self._retirados[labels] = acumulado + valor
+
+    def _copias(self):
+        with self._lock:
+            fragmentos = list(self._fragmentos.values())
+            retirados = {labels: list(valor) if isinstance(valor, list) else valor
+                         for labels, valor in self._retirados.items()}
+        return [retirados] + [datos.copy() for datos in fragmentos]
+
+class Counter(_PorHilo):
+    def inc(self, *labels, amount=1):
+        datos = self._fragmento()
+        datos[labels] = datos.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return sum(datos.get(labels, 0) for datos in self._copias())
+
+    def render(self):
+        totales = {}
+        for datos in self._copias():
+            for labels, valor in datos.items():
+                totales[labels] = totales.get(labels, 0) + valor
+        lineas = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, valor in sorted(totales.items()):
+            lineas.append(f"{self.name}{_etiquetas(self.labelnames, labels)} {_numero(valor)}")
+        return lineas
+
+class Histogram(_PorHilo):
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, valor, *labels):
+        datos = self._fragmento()
+        serie = datos.get(labels)
+        if serie is None:
+            # [conteo por bucket..., conteo de +Inf, suma, total]
+            serie = datos[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        serie[bisect_left(self.buckets, valor)] += 1
+        serie[-2] += valor
+        serie[-1] += 1
+
+    def _series(self):
+        series = {}
+        for datos in self._copias():
+            for labels, serie in datos.items():
+                total = series.setdefault(labels, [0] * len(serie))
+                for i, valor in enumerate(serie):
+                    total[i] += valor
+        return series
+
+    def count(self, *labels):
+        serie = self._series().get(labels)
+        return serie[-1] if serie else 0
+
+    def render(self):
+        lineas = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, serie in sorted(self._series().items()):
+            acumulado = 0
+            for limite, conteo in zip(self.buckets + (float("inf"),), serie):
+                acumulado += conteo
+                le = 'le="' + _numero(limite) + '"'
+                lineas.append(f"{self.name}_bucket{_etiquetas(self.labelnames, labels, le)} {acumulado}")
+            lineas.append(f"{self.name}_sum{_etiquetas(self.labelnames, labels)} {_numero(serie[-2])}")
+            lineas.append(f"{self.name}_count{_etiquetas(self.labelnames, labels)} {serie[-1]}")
+        return lineas
+
+class Gauge:
+    """Valor que se lee al momento de exportar (por ejemplo, la profundidad de una cola)."""
+
+    def __init__(self, name, help_text, funcion, tipo="gauge"):
+        self.name = name
+        self.help = help_text
+        self.funcion = funcion
+        self.tipo = tipo
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.tipo}",
+                f"{self.name} {_numero(self.funcion())}"]
+
+class _Cronometro:
+    __slots__ = ("_datos", "_nueva", "_buckets", "_ultimo")
+
+    def __init__(self, histograma):
+        # Resolvemos una sola vez el fragmento del hilo; cada etapa solo suma en él
+        self._datos = histograma._fragmento()
+        self._nueva = [0] * (len(histograma.buckets) + 1) + [0.0, 0]
+        self._buckets = histograma.buckets
+        self._ultimo = perf_counter()
+
+    def etapa(self, nombre):
+        """Registra el tiempo transcurrido desde la etapa anterior bajo `nombre`."""
+        ahora = perf_counter()
+        valor = ahora - self._ultimo
+        self._ultimo = ahora
+        clave = (nombre,)
+        serie = self._datos.get(clave)
+        if serie is None:
+            serie = self._datos[clave] = list(self._nueva)
+        serie[bisect_left(self._buckets, valor)] += 1
+        serie[-2] += valor
+        serie[-1] += 1
+
+class _CronometroNulo:
+    __slots__ = ()
+
+    def etapa(self, nombre):
+        pass
+
+_CRONOMETRO_NULO = _CronometroNulo()
+
+class Registry:
+    """Conjunto de métricas de una app. Si está desactivado, registrar no cuesta nada."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._metricas = []
+
+    def _agregar(self, metrica):
+        self._metricas.append(metrica)
+        return metrica
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._agregar(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._agregar(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge(self, name, help_text, funcion, tipo="gauge"):
+        return self._agregar(Gauge(name, help_text, funcion, tipo))
+
+    def inc(self, counter, *labels):
+        if self.enabled:
+            counter.inc(*labels)
+
+    def cronometro(self, histograma):
+        """Cronómetro por etapas sobre un histograma con la etiqueta `stage`."""
+        return _Cronometro(histograma) if self.enabled else _CRONOMETRO_NULO
+
+    def render(self):
+        lineas = []
+        for metrica in self._metricas:
+            lineas.extend(metrica.render())
+        return "\n".join(lineas) + "\n"
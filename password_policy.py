@@ -0,0 +1,137 @@
+"""Política de hash de contraseñas calibrada para la máquina en la que corre.
+
+Al arrancar se mide lo que tarda esta máquina en PBKDF2-SHA256 o en scrypt y se eligen
+los parámetros que se acercan al presupuesto de tiempo por hash (HASH_TIME_BUDGET_MS) y,
+en scrypt, de memoria (HASH_MEMORY_BUDGET_MB), sin bajar nunca de los mínimos de la
+política. Los parámetros viajan en cada hash con el formato de werkzeug
+(`pbkdf2:sha256:550000$sal$hash`, `scrypt:32768:8:2$sal$hash`), así que
+check_password_hash verifica cualquier hash antiguo y `necesita_rehash` dice cuándo
+rehacerlo con los parámetros actuales (lo hace /login tras un inicio de sesión correcto).
+
+La calibración se hace una vez por proceso y combinación de parámetros; en un despliegue
+con varias máquinas distintas, fija HASH_METHOD para que todas usen los mismos.
+"""
+import hashlib
+import os
+import threading
+import time
+
+# werkzeug guarda "pbkdf2:sha256" sin iteraciones como su valor por defecto
+# (werkzeug.security.DEFAULT_PBKDF2_ITERATIONS; no se importa aquí para no cargar werkzeug)
+PBKDF2_ITERACIONES_WERKZEUG = 1000000
+# Los mínimos por defecto son los valores por defecto de werkzeug (los que se usaban antes de
+# calibrar): la calibración solo sube el coste en máquinas rápidas, nunca lo baja
+MIN_PBKDF2_ITERATIONS = PBKDF2_ITERACIONES_WERKZEUG
+MIN_SCRYPT_N = 2 ** 15
+SCRYPT_R = 8
+# Un hash cuyo coste queda por debajo del objetivo menos de este factor no se rehace: la
+# calibración varía un poco entre arranques y no queremos rehacer todos los hashes
+TOLERANCIA = 1.25
+
+_calibradas = {}
+_lock = threading.Lock()
+
+def _medir(funcion, repeticiones=3):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+def _redondear(n):
+    """Dos cifras significativas (548123 -> 550000)."""
+    escala = 10 ** max(0, len(str(n)) - 2)
+    return round(n / escala) * escala
+
+def calibrar_pbkdf2(presupuesto, minimo=MIN_PBKDF2_ITERATIONS, muestra=20000):
+    """Iteraciones de PBKDF2-SHA256 que tardan unos `presupuesto` segundos aquí."""
+    segundos = _medir(lambda: hashlib.pbkdf2_hmac("sha256", b"calibracion", os.urandom(16), muestra))
+    return max(minimo, _redondear(int(presupuesto / segundos * muestra)))
+
+def calibrar_scrypt(presupuesto, memoria, minimo_n=MIN_SCRYPT_N, r=SCRYPT_R):
+    """(n, r, p) de scrypt: n lo fija la memoria (128·r·n bytes) y p completa el tiempo."""
+    n = max(minimo_n, 1 << max(0, (memoria // (128 * r)).bit_length() - 1))
+    while True:
+        segundos = _medir(lambda: hashlib.scrypt(b"calibracion", salt=os.urandom(16), n=n, r=r, p=1,
+                                                 maxmem=132 * n * r), repeticiones=2)
+        # Si un solo bloque ya se pasa de tiempo, se usa menos memoria (sin bajar del mínimo)
+        if segundos <= presupuesto or n <= minimo_n:
+            break
+        n //= 2
+    return n, r, max(1, int(presupuesto / segundos))
+
+def parsear(metodo):
+    """("pbkdf2", (hash, iteraciones)) o ("scrypt", (n, r, p)) a partir de un método de werkzeug."""
+    algoritmo, *args = metodo.split(":")
+    if algoritmo == "pbkdf2":
+        nombre = args[0] if args else "sha256"
+        return algoritmo, (nombre, int(args[1]) if len(args) > 1 else PBKDF2_ITERACIONES_WERKZEUG)
+    if algoritmo == "scrypt":
+        n, r, p = (int(valor) for valor in args) if args else (2 ** 15, 8, 1)
+        return algoritmo, (n, r, p)
+    raise ValueError(f"Unsupported password hash method: {metodo!r}")
+
+class HashPolicy:
+    """Método de werkzeug vigente para los hashes nuevos y criterio para rehacer los antiguos."""
+
+    def __init__(self, method, calibrated_ms=None):
+        self.method = method
+        self.algoritmo, self.params = parsear(method)
+        self.calibrated_ms = calibrated_ms
+
+    @classmethod
+    def calibrar(cls, algoritmo="pbkdf2", tiempo_ms=250, memoria_mb=64,
+                 min_iteraciones=MIN_PBKDF2_ITERATIONS, min_n=MIN_SCRYPT_N):
+        clave = (algoritmo, tiempo_ms, memoria_mb, min_iteraciones, min_n)
+        with _lock:
+            if clave not in _calibradas:
+                presupuesto = tiempo_ms / 1000
+                if algoritmo == "pbkdf2":
+                    metodo = f"pbkdf2:sha256:{calibrar_pbkdf2(presupuesto, min_iteraciones)}"
+                elif algoritmo == "scrypt":
+                    n, r, p = calibrar_scrypt(presupuesto, memoria_mb * 1024 * 1024, min_n)
+                    metodo = f"scrypt:{n}:{r}:{p}"
+                else:
+                    raise ValueError(f"Unknown password hash algorithm: {algoritmo!r}")
+                # Coste real con los parámetros elegidos (puede superar el presupuesto por los mínimos)
+                from werkzeug.security import generate_password_hash
+                segundos = _medir(lambda: generate_password_hash("calibracion", method=metodo), 1)
+                _calibradas[clave] = (metodo, round(segundos * 1000, 1))
+            metodo, ms = _calibradas[clave]
+        return cls(metodo, calibrated_ms=ms)
+
+    def necesita_rehash(self, hashed):
+        """True si el hash guardado usa otro algoritmo o parámetros, o un coste claramente menor.
+
+        Un hash más costoso que el objetivo no se rehace: no se debilitan hashes guardados
+        (p. ej. en un nodo lento que calibró menos iteraciones), y un usuario que entra por
+        nodos con calibraciones distintas no se reescribe en cada login.
+        """
+        try:
+            algoritmo, params = parsear(hashed.split("$", 1)[0])
+        except ValueError:
+            return True
+        if algoritmo != self.algoritmo:
+            return True
+        if algoritmo == "pbkdf2":
+            if params[0] != self.params[0]:
+                return True
+            coste, objetivo = params[1], self.params[1]
+        else:
+            n, r, p = params
+            if r != self.params[1] or n < self.params[0]:
+                return True
+            coste, objetivo = n * p, self.params[0] * self.params[2]
+        return coste < objetivo / TOLERANCIA
+
+    def describe(self):
+        return {"method": self.method, "algorithm": self.algoritmo, "calibrated_ms": self.calibrated_ms}
+
+def politica_desde_config(config):
+    """HASH_METHOD fijo si está configurado; si no, la calibración con los presupuestos de la config."""
+    if config["HASH_METHOD"]:
+        return HashPolicy(config["HASH_METHOD"])
+    return HashPolicy.calibrar(config["HASH_ALGORITHM"], config["HASH_TIME_BUDGET_MS"],
+                               config["HASH_MEMORY_BUDGET_MB"], config["HASH_MIN_PBKDF2_ITERATIONS"],
+                               config["HASH_MIN_SCRYPT_N"])
@@ -0,0 +1,188 @@
+"""Servidor de producción con prefork: una app precargada y N procesos worker.
+
+El proceso maestro crea la app una sola vez (esquema, índice de emails, caché de static/),
+abre el socket de escucha y hace fork de N workers que lo comparten: el kernel reparte
+las conexiones entre ellos. Cada worker sirve con el servidor WSGI con hilos de werkzeug,
+así que el hash de contraseñas (CPU) de varias peticiones corre en varios núcleos.
+
+- Si un worker muere, el maestro arranca otro (con una pausa si mueren nada más nacer).
+- SIGTERM o SIGINT al maestro: deja de aceptar conexiones, los workers terminan las
+  peticiones en curso y escriben lo pendiente; pasado `graceful_timeout` se matan.
+- SQLite entre procesos: modo WAL con busy_timeout (DEFAULT_PRAGMAS), ninguna conexión
+  abierta atraviesa el fork (cada worker abre las suyas) y DB_MULTIPROCESS=True hace que
+  el índice de emails consulte la base en lugar de fiarse de su filtro de Bloom local.
+- Cada worker hashea en su propio hilo (HASH_EXECUTOR="thread", HASH_WORKERS=1 salvo que
+  se configure otra cosa): el paralelismo lo dan los procesos. /metrics es por worker.
+
+Uso (solo Linux/macOS, necesita os.fork):
+    python prefork.py --workers 4 --port 8000 [--database users.db] [--shards 4]
+    python cli.py serve --workers 4
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+# Valores de configuración propios del modo prefork (se pueden sobrescribir)
+PREFORK_CONFIG = {"DB_MULTIPROCESS": True, "HASH_EXECUTOR": "thread", "HASH_WORKERS": 1}
+GRACEFUL_TIMEOUT = 30.0  # segundos que tienen los workers para terminar al apagar
+KEEPALIVE_TIMEOUT = 5.0  # una conexión keep-alive inactiva se cierra a los N segundos
+REINICIO_RAPIDO = 1.0    # un worker que muere antes de esto se reinicia tras esa pausa
+BACKLOG = 1024
+
+def abrir_socket(host, port, backlog=BACKLOG):
+    """Socket de escucha que heredan todos los workers."""
+    familia = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(familia, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def preparar_fork(app):
+    """Cierra en el maestro lo que no debe cruzar el fork: conexiones SQLite, hilo escritor
+    y pool de hash. Todos se vuelven a crear solos en cada worker al primer uso."""
+    app.extensions["user_store"].close()
+    app.extensions["idempotency"].close()
+    app.extensions["hasher"].shutdown()
+
+def _worker(app, sock, host):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class Manejador(WSGIRequestHandler):
+        timeout = KEEPALIVE_TIMEOUT
+
+    servidor = make_server(host, sock.getsockname()[1], app, threaded=True,
+                           request_handler=Manejador, fd=sock.fileno())
+    # server_close() espera a los hilos de las peticiones en curso
+    servidor.daemon_threads = False
+    servidor.block_on_close = True
+
+    def apagar(signum, frame):
+        # shutdown() espera a serve_forever, que corre en este mismo hilo
+        threading.Thread(target=servidor.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, apagar)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C lo gestiona el maestro
+    try:
+        servidor.serve_forever()
+    finally:
+        servidor.server_close()
+        app.extensions["user_store"].close()
+        app.extensions["idempotency"].close()
+        app.extensions["hasher"].shutdown()
+    return 0
+
+class Maestro:
+    def __init__(self, app, sock, host, workers, graceful_timeout=GRACEFUL_TIMEOUT):
+        self.app = app
+        self.sock = sock
+        self.host = host
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.hijos = {}  # pid -> instante de arranque
+        self.parar = False
+
+    def arrancar_worker(self):
+        pid = os.fork()
+        if pid == 0:
+            codigo = 1
+            try:
+                codigo = _worker(self.app, self.sock, self.host)
+            except BaseException:
+                import traceback
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(codigo)
+        self.hijos[pid] = time.monotonic()
+        print(f"Worker {pid} started", flush=True)
+
+    def _senal(self, signum, frame):
+        self.parar = True
+
+    def _recoger(self):
+        """Devuelve [(pid, código, segundos vivo)] de los workers que terminaron, sin bloquear."""
+        terminados = []
+        while self.hijos:
+            try:
+                pid, estado = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if pid in self.hijos:
+                inicio = self.hijos.pop(pid)
+                terminados.append((pid, os.waitstatus_to_exitcode(estado), time.monotonic() - inicio))
+        return terminados
+
+    def ejecutar(self):
+        signal.signal(signal.SIGTERM, self._senal)
+        signal.signal(signal.SIGINT, self._senal)
+        for _ in range(self.workers):
+            self.arrancar_worker()
+        while not self.parar:
+            for pid, codigo, vida in self._recoger():
+                print(f"⚠️ Worker {pid} exited with code {codigo}; restarting", flush=True)
+                if vida < REINICIO_RAPIDO:
+                    time.sleep(REINICIO_RAPIDO)
+                if not self.parar:
+                    self.arrancar_worker()
+            time.sleep(0.05)
+        return self.apagar()
+
+    def apagar(self):
+        print(f"Shutting down {len(self.hijos)} workers...", flush=True)
+        self.sock.close()
+        for pid in list(self.hijos):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        limite = time.monotonic() + self.graceful_timeout
+        while self.hijos and time.monotonic() < limite:
+            self._recoger()
+            time.sleep(0.05)
+        for pid in list(self.hijos):
+            print(f"⚠️ Worker {pid} did not stop in {self.graceful_timeout:g}s; killing it", flush=True)
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
+            self.hijos.pop(pid)
+        print("✅ Server stopped", flush=True)
+        return 0
+
+def servir(config=None, host="127.0.0.1", port=8000, workers=None, graceful_timeout=GRACEFUL_TIMEOUT):
+    """Precarga create_app(config), hace fork de `workers` procesos y los vigila hasta SIGTERM."""
+    if not hasattr(os, "fork"):
+        raise SystemExit("❌ Prefork serving requires os.fork (Linux or macOS)")
+    from server import create_app
+    app = create_app({**PREFORK_CONFIG, **(config or {})})
+    preparar_fork(app)
+    sock = abrir_socket(host, port)
+    workers = workers or os.cpu_count() or 1
+    print(f"✅ Listening on http://{host}:{sock.getsockname()[1]} with {workers} workers "
+          f"(master pid {os.getpid()})", flush=True)
+    return Maestro(app, sock, host, workers, graceful_timeout).ejecutar()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio de registro con N procesos worker (prefork)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000, help="0 = un puerto libre (se muestra al arrancar)")
+    parser.add_argument("--workers", type=int, help="procesos worker (por defecto, uno por núcleo)")
+    parser.add_argument("--database", default="users.db")
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--graceful-timeout", type=float, default=GRACEFUL_TIMEOUT)
+    args = parser.parse_args(argv)
+    return servir({"DATABASE": args.database, "DB_SHARDS": args.shards}, args.host, args.port,
+                  args.workers, args.graceful_timeout)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Reporte por validador de hojas grandes: memo de filas repetidas y evaluación en paralelo.
+
+Las hojas de prueba repiten muchísimo los mismos vectores (nombre, email, contraseña,
+confirmación). El motor lee la hoja en streaming y por tramos de `chunk_size` filas:
+
+- Cada fila cuyos cuatro campos ya se evaluaron se resuelve con un memo LRU acotado
+  (`memo_size` combinaciones), o con el tramo en vuelo que ya la incluye.
+- Las combinaciones nuevas de cada tramo se evalúan en un pool de procesos; los
+  resultados vuelven como una máscara de bits por fila (barata de serializar).
+- Los tramos se escriben en su orden original y como mucho `workers * 2` están en vuelo,
+  así que la memoria no depende del tamaño de la hoja.
+
+Con `resumen` se añade una hoja "Resumen" (xlsx) o un archivo `<salida>_resumen.<ext>`
+con cuántas filas pasan y fallan cada validador.
+"""
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import validators
+from row_io import abrir_escritura, abrir_lectura
+
+REPORT_CHUNK = 5000      # filas por tramo
+REPORT_MEMO = 100000     # combinaciones de campos recordadas
+# Por debajo de esta cantidad de combinaciones nuevas en un tramo se evalúa aquí mismo:
+# enviarlas al pool cuesta más que evaluarlas
+MIN_PARALELO = 500
+COLUMNAS_ENTRADA = ["Full Name", "Email", "Password", "Confirm Password", "Expected Outcome"]
+VALIDADORES = list(validators.evaluar_validadores("Test", "test@example.com", "Pass1A$", "Pass1A$"))
+RESUMEN_ENCABEZADOS = ["Validador", "Pasan", "Fallan", "Total", "% Pasan"]
+
+def _texto(valor):
+    return "" if valor is None else str(valor)
+
+def evaluar_lote(claves):
+    """Máscara de bits (bit i = VALIDADORES[i] pasa) de cada clave (nombre, email, clave, confirmación)."""
+    evaluar = validators.MOTOR_DETALLE.evaluar
+    mascaras = []
+    for nombre, correo, clave, confirmacion in claves:
+        resultados = evaluar(fullname=nombre, email=correo, password=clave, confirm=confirmacion)
+        mascara = 0
+        for i, validador in enumerate(VALIDADORES):
+            if resultados[validador]:
+                mascara |= 1 << i
+        mascaras.append(mascara)
+    return mascaras
+
+def filas_resumen(por_mascara, total):
+    """[validador, pasan, fallan, total, % pasan] a partir de cuántas filas tuvo cada máscara."""
+    filas = []
+    for i, validador in enumerate(VALIDADORES):
+        pasan = sum(filas_mascara for mascara, filas_mascara in por_mascara.items() if mascara >> i & 1)
+        filas.append([validador, pasan, total - pasan, total, round(pasan / total * 100, 1) if total else 0.0])
+    return filas
+
+class _Memo:
+    """LRU acotado clave -> máscara."""
+
+    def __init__(self, capacidad):
+        self.capacidad = capacidad
+        self._datos = OrderedDict()
+        self.aciertos = 0
+
+    def get(self, clave):
+        mascara = self._datos.get(clave)
+        if mascara is not None:
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+        return mascara
+
+    def put(self, clave, mascara):
+        self._datos[clave] = mascara
+        self._datos.move_to_end(clave)
+        if len(self._datos) > self.capacidad:
+            self._datos.popitem(last=False)
+
+class _Tramo:
+    def __init__(self):
+        self.filas = []       # (fila original, máscara conocida o (tramo, índice))
+        self.nuevas = {}      # clave -> índice en el lote enviado a evaluar
+        self.futuro = None
+        self.mascaras = None
+
+def _resuelto(mascaras):
+    futuro = Future()
+    futuro.set_result(mascaras)
+    return futuro
+
+def generar_reporte(input_path, output_path, workers=None, chunk_size=REPORT_CHUNK, memo_size=REPORT_MEMO,
+                    resumen=False):
+    """Escribe el detalle por validador de `input_path` en `output_path`, en el mismo orden.
+
+    Devuelve estadísticas: filas, combinaciones evaluadas, aciertos del memo y, con
+    `resumen`, dónde quedó la tabla de resumen.
+    """
+    workers = workers or os.cpu_count() or 1
+    memo = _Memo(memo_size)
+    en_vuelo = {}  # clave -> (tramo, índice) de las combinaciones enviadas y aún no escritas
+    tramos = deque()
+    marcas = {}    # máscara -> lista de ✅/❌ (hay pocas combinaciones distintas)
+    por_mascara = {}  # máscara -> filas, para el resumen
+    stats = {"rows": 0, "evaluated": 0, "memo_hits": 0}
+    pool = None
+
+    def enviar(tramo):
+        nonlocal pool
+        claves = list(tramo.nuevas)
+        stats["evaluated"] += len(claves)
+        if workers > 1 and len(claves) >= MIN_PARALELO:
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            tramo.futuro = pool.submit(evaluar_lote, claves)
+        else:
+            tramo.futuro = _resuelto(evaluar_lote(claves))
+        tramos.append(tramo)
+
+    def escribir(tramo, escritor):
+        tramo.mascaras = tramo.futuro.result()
+        for clave, indice in tramo.nuevas.items():
+            memo.put(clave, tramo.mascaras[indice])
+            if en_vuelo.get(clave, (None,))[0] is tramo:
+                del en_vuelo[clave]
+        for fila, mascara in tramo.filas:
+            if isinstance(mascara, tuple):
+                # Evaluada en este tramo o en uno anterior (ya escrito, así que tiene sus máscaras)
+                origen, indice = mascara
+                mascara = origen.mascaras[indice]
+            fila_marcas = marcas.get(mascara)
+            if fila_marcas is None:
+                fila_marcas = marcas[mascara] = [validators.marcar(mascara >> i & 1)
+                                                 for i in range(len(VALIDADORES))]
+            if resumen:
+                por_mascara[mascara] = por_mascara.get(mascara, 0) + 1
+            escritor.append(list(fila[:4]) + [fila[4] if fila[4] is not None else ""] + fila_marcas)
+        # Libera la memoria; las máscaras siguen para los tramos posteriores que las usan
+        tramo.filas = tramo.nuevas = None
+
+    try:
+        with abrir_lectura(input_path) as lector, \
+                abrir_escritura(output_path, COLUMNAS_ENTRADA + VALIDADORES) as escritor:
+            tramo = _Tramo()
+            for fila in lector:
+                fila = tuple(fila) + (None,) * (5 - len(fila))
+                stats["rows"] += 1
+                clave = tuple(_texto(valor) for valor in fila[:4])
+                mascara = memo.get(clave)
+                if mascara is None:
+                    mascara = en_vuelo.get(clave)
+                    if mascara is None:
+                        mascara = (tramo, len(tramo.nuevas))
+                        tramo.nuevas[clave] = len(tramo.nuevas)
+                        en_vuelo[clave] = mascara
+                    else:
+                        memo.aciertos += 1
+                tramo.filas.append((fila, mascara))
+                if len(tramo.filas) >= chunk_size:
+                    enviar(tramo)
+                    tramo = _Tramo()
+                    while len(tramos) > workers * 2:
+                        escribir(tramos.popleft(), escritor)
+            if tramo.filas:
+                enviar(tramo)
+            while tramos:
+                escribir(tramos.popleft(), escritor)
+
+            if resumen:
+                stats["summary"] = escritor.agregar_hoja("Resumen", RESUMEN_ENCABEZADOS,
+                                                         filas_resumen(por_mascara, stats["rows"]))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    stats["memo_hits"] = memo.aciertos
+    return stats
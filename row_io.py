@@ -0,0 +1,229 @@
+"""Lectura y escritura de filas en streaming para varios formatos (xlsx, CSV, JSONL, Parquet).
+
+Todos los formatos comparten la misma interfaz:
+
+    with abrir_lectura("datos.parquet") as lector:
+        lector.encabezados        # nombres de columna
+        for fila in lector:       # tuplas de valores, sin la cabecera
+            ...
+
+    with abrir_escritura("resultados.csv", encabezados) as escritor:
+        escritor.append(fila)
+
+Las celdas vacías se leen como None en todos los formatos.
+"""
+import csv
+import json
+import os
+
+# Filas por lote al leer/escribir Parquet
+PARQUET_BATCH_SIZE = 10000
+
+def _vacio_a_none(valor):
+    return None if valor == "" else valor
+
+class _Lector:
+    encabezados = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+class _Escritor:
+    def __init__(self, path, encabezados):
+        self.path = path
+        self.encabezados = list(encabezados)
+
+    def agregar_hoja(self, titulo, encabezados, filas):
+        """Tabla adicional: en xlsx, otra hoja; en el resto, `<path>_<titulo>.<ext>` al lado.
+
+        Devuelve dónde quedó escrita.
+        """
+        base, extension = os.path.splitext(self.path)
+        destino = f"{base}_{titulo.lower()}{extension}"
+        with type(self)(destino, encabezados) as escritor:
+            for fila in filas:
+                escritor.append(fila)
+        return destino
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class LectorXlsx(_Lector):
+    def __init__(self, path):
+        from openpyxl import load_workbook
+        self._wb = load_workbook(path, read_only=True)
+        self._ws = self._wb.active
+        self.encabezados = list(next(self._ws.iter_rows(max_row=1, values_only=True), ()))
+
+    def __iter__(self):
+        # En modo read_only las celdas vacías del final no se devuelven: completamos la fila
+        ancho = len(self.encabezados)
+        for fila in self._ws.iter_rows(min_row=2, values_only=True):
+            yield fila + (None,) * (ancho - len(fila)) if len(fila) < ancho else fila
+
+    def close(self):
+        self._wb.close()
+
+class EscritorXlsx(_Escritor):
+    def __init__(self, path, encabezados):
+        from openpyxl import Workbook
+        super().__init__(path, encabezados)
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet()
+        self._ws.append(self.encabezados)
+
+    def append(self, fila):
+        self._ws.append(list(fila))
+
+    def agregar_hoja(self, titulo, encabezados, filas):
+        hoja = self._wb.create_sheet(title=titulo)
+        hoja.append(list(encabezados))
+        for fila in filas:
+            hoja.append(list(fila))
+        return f"{self.path} (hoja {titulo})"
+
+    def close(self):
+        self._wb.save(self.path)
+
+class LectorCsv(_Lector):
+    def __init__(self, path):
+        self._f = open(path, newline="", encoding="utf-8-sig")
+        self._reader = csv.reader(self._f)
+        self.encabezados = next(self._reader, [])
+
+    def __iter__(self):
+        for fila in self._reader:
+            yield tuple(_vacio_a_none(valor) for valor in fila)
+
+    def close(self):
+        self._f.close()
+
+class EscritorCsv(_Escritor):
+    def __init__(self, path, encabezados):
+        super().__init__(path, encabezados)
+        self._f = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._f)
+        self._writer.writerow(self.encabezados)
+
+    def append(self, fila):
+        self._writer.writerow(["" if valor is None else valor for valor in fila])
+
+    def close(self):
+        self._f.close()
+
+class LectorJsonl(_Lector):
+    """Un objeto JSON por línea; las columnas salen de las claves del primer objeto."""
+
+    def __init__(self, path):
+        self._f = open(path, encoding="utf-8")
+        self._primero = None
+        for linea in self._f:
+            if linea.strip():
+                self._primero = json.loads(linea)
+                break
+        self.encabezados = list(self._primero or ())
+
+    def _fila(self, objeto):
+        return tuple(_vacio_a_none(objeto.get(columna)) for columna in self.encabezados)
+
+    def __iter__(self):
+        if self._primero is not None:
+            yield self._fila(self._primero)
+        for linea in self._f:
+            if linea.strip():
+                yield self._fila(json.loads(linea))
+
+    def close(self):
+        self._f.close()
+
+class EscritorJsonl(_Escritor):
+    def __init__(self, path, encabezados):
+        super().__init__(path, encabezados)
+        self._f = open(path, "w", encoding="utf-8")
+
+    def append(self, fila):
+        objeto = dict(zip(self.encabezados, fila))
+        self._f.write(json.dumps(objeto, ensure_ascii=False, default=str) + "\n")
+
+    def close(self):
+        self._f.close()
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet support requires pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+class LectorParquet(_Lector):
+    def __init__(self, path):
+        pa = _pyarrow()
+        self._archivo = pa.parquet.ParquetFile(path)
+        self.encabezados = list(self._archivo.schema_arrow.names)
+
+    def __iter__(self):
+        for lote in self._archivo.iter_batches(batch_size=PARQUET_BATCH_SIZE):
+            columnas = [lote.column(i).to_pylist() for i in range(lote.num_columns)]
+            for fila in zip(*columnas):
+                yield tuple(_vacio_a_none(valor) for valor in fila)
+
+    def close(self):
+        self._archivo.close()
+
+class EscritorParquet(_Escritor):
+    """Escribe por lotes; todas las columnas se guardan como texto (nulo si la celda está vacía)."""
+
+    def __init__(self, path, encabezados):
+        super().__init__(path, encabezados)
+        self._pa = _pyarrow()
+        self._schema = self._pa.schema([(str(nombre), self._pa.string()) for nombre in self.encabezados])
+        self._writer = self._pa.parquet.ParquetWriter(path, self._schema)
+        self._pendientes = []
+
+    def append(self, fila):
+        self._pendientes.append([None if valor is None else str(valor) for valor in fila])
+        if len(self._pendientes) >= PARQUET_BATCH_SIZE:
+            self._vaciar()
+
+    def _vaciar(self):
+        if not self._pendientes:
+            return
+        columnas = list(zip(*self._pendientes))
+        tabla = self._pa.Table.from_arrays([self._pa.array(col, type=self._pa.string()) for col in columnas],
+                                           schema=self._schema)
+        self._writer.write_table(tabla)
+        self._pendientes = []
+
+    def close(self):
+        self._vaciar()
+        self._writer.close()
+
+FORMATOS = {
+    ".xlsx": (LectorXlsx, EscritorXlsx),
+    ".csv": (LectorCsv, EscritorCsv),
+    ".jsonl": (LectorJsonl, EscritorJsonl),
+    ".ndjson": (LectorJsonl, EscritorJsonl),
+    ".parquet": (LectorParquet, EscritorParquet),
+}
+
+def _formato(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Unsupported file format {extension!r} (use one of {', '.join(FORMATOS)})")
+    return FORMATOS[extension]
+
+def abrir_lectura(path):
+    return _formato(path)[0](path)
+
+def abrir_escritura(path, encabezados):
+    return _formato(path)[1](path, encabezados)
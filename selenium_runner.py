@@ -1,15 +1,16 @@
 import os
+import argparse
+import math
+import queue
 import threading
 import time
 import re
-from openpyxl import load_workbook, Workbook
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from tkinter import Tk, filedialog
+# selenium y requests se importan dentro de las funciones que los usan: el modo inproceso
+# y el reporte de validadores (cli.py validate-report) arrancan sin cargarlos
 import validators
+from row_io import abrir_lectura, abrir_escritura
+from checkpoint import CacheResultados
+from report import generar_reporte
 # ---- Funciones de validación personalizadas (ejemplo básico) -----
 def validar_nombre(name):
     return bool(name.strip())
@@ -43,11 +44,13 @@ def evaluar_validadores(name, email, password, confirm):
 
 # --- Función para seleccionar archivo Excel ---
 def seleccionar_archivo():
+    # tkinter solo se importa si hace falta el diálogo (no está disponible en CI sin pantalla)
+    from tkinter import Tk, filedialog
     root = Tk()
     root.withdraw()
     archivo = filedialog.askopenfilename(
         title="Selecciona archivo Excel con datos de usuarios",
-        filetypes=[("Archivos Excel", "*.xlsx *.xls")]
+        filetypes=[("Archivos de datos", "*.xlsx *.csv *.jsonl *.ndjson *.parquet")]
     )
     root.destroy()
     return archivo
@@ -58,116 +61,509 @@ def run_flask_app():
     # Se asume que ya está corriendo y accesible en http://127.0.0.1:5000/form.html
     pass
 
-# --- Función principal de ejecución de pruebas con Selenium ---
-def ejecutar_registros():
-    archivo = seleccionar_archivo()
-    if not archivo:
-        print("No se seleccionó archivo.")
-        return
-
-    # Si usas un servidor Flask para servir la página, puedes iniciarlo en otro hilo.
-    flask_thread = threading.Thread(target=run_flask_app, daemon=True)
-    flask_thread.start()
-    print("Servidor Flask arrancado en hilo separado...")
-    time.sleep(3)
-
-    wb = load_workbook(archivo)
-    ws = wb.active
-    encabezados = ["Full Name", "Email", "Password", "Confirm Password", "Expected Outcome", "Resultado del Test", "Coincidencia con Esperado"]
-    for idx, titulo in enumerate(encabezados, start=1):
-        if not ws.cell(row=1, column=idx).value:
-            ws.cell(row=1, column=idx).value = titulo
+URL_BASE = "http://127.0.0.1:5000"
+# Reintentos de una fila cuando el navegador que la procesaba se cae
+MAX_REINTENTOS_FILA = 2
+# Segundos de espera de los elementos del formulario y de la respuesta
+TIEMPO_ESPERA = 5
 
+# --- Creación del navegador ---
+def crear_driver(headless=False):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
     driver_path = os.path.abspath(os.path.join("chromedriver-win64", "chromedriver.exe"))
     service = Service(driver_path)
     options = webdriver.ChromeOptions()
     options.add_argument("--log-level=3")
-    driver = webdriver.Chrome(service=service, options=options)
-
-    url_form = "http://127.0.0.1:5000/form.html"
-    wait = WebDriverWait(driver, 5)
-
-    print(f"Iniciando procesamiento de {ws.max_row - 1} registros...")
-
-    for i, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-        if len(row) < 4:
-            print(f"Fila {i} incompleta. Saltando...")
-            continue
-
-        name, email, password, confirm = row[:4]
-        expected = row[4] if len(row) >= 5 else None
-
-        resultado = "No Ejecutado"
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1280,900")
+    return webdriver.Chrome(service=service, options=options)
+
+def navegador_vivo(driver):
+    from selenium.common.exceptions import WebDriverException
+    try:
+        driver.title
+        return True
+    except WebDriverException:
+        return False
 
+# --- Registro de una fila en el formulario ---
+def procesar_fila(driver, wait, url_form, name, email, password, confirm):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    driver.get(url_form)
+
+    fullname_input = wait.until(EC.visibility_of_element_located((By.XPATH, "//input[@id='fullname' or @name='fullname']")))
+    fullname_input.clear()
+    fullname_input.send_keys(name)
+
+    email_input = wait.until(EC.visibility_of_element_located((By.XPATH, "//input[@id='email' or @name='email']")))
+    email_input.clear()
+    email_input.send_keys(email)
+
+    password_input = wait.until(EC.visibility_of_element_located((By.XPATH, "//input[@id='password' or @name='password']")))
+    password_input.clear()
+    password_input.send_keys(password)
+
+    confirm_input = wait.until(EC.visibility_of_element_located((By.XPATH, "//input[@id='confirm_password' or @name='confirm_password']")))
+    confirm_input.clear()
+    confirm_input.send_keys(confirm)
+
+    submit_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[@id='submit' or @type='submit']")))
+    submit_button.click()
+
+    validation_message_elem = wait.until(EC.visibility_of_element_located((By.XPATH, "//*[@id='validation_message' or contains(@class, 'validation_message')]")))
+    return validation_message_elem.text.strip()
+
+# --- Ejecución en orden con N trabajadores y memoria acotada ---
+def ejecutar_en_orden(filas, iniciar, workers, ventana=None):
+    """Procesa filas (clave, datos) con `workers` hilos y las devuelve en su orden original.
+
+    iniciar() se llama en cada hilo al llegarle su primera fila y devuelve (procesar, cerrar)
+    (si todas las filas pasan sin procesarse no se abre ningún navegador). Como mucho
+    `ventana` filas están a la vez entre la lectura y la escritura, así que la memoria
+    no depende del tamaño de la hoja. Las filas con datos None pasan sin procesarse.
+    """
+    ventana = ventana or workers * 4
+    pendientes = queue.Queue()
+    cupo = threading.Semaphore(ventana)
+    orden = queue.Queue()
+    listos = {}
+    condicion = threading.Condition()
+    fin = object()
+    error_lectura = []
+
+    def entregar(numero, resultado):
+        with condicion:
+            listos[numero] = resultado
+            condicion.notify_all()
+
+    def productor():
         try:
-            driver.get(url_form)
-
-            fullname_input = wait.until(EC.visibility_of_element_located((By.XPATH, "//input[@id='fullname' or @name='fullname']")))
-            fullname_input.clear()
-            fullname_input.send_keys(name)
-
-            email_input = wait.until(EC.visibility_of_element_located((By.XPATH, "//input[@id='email' or @name='email']")))
-            email_input.clear()
-            email_input.send_keys(email)
-
-            password_input = wait.until(EC.visibility_of_element_located((By.XPATH, "//input[@id='password' or @name='password']")))
-            password_input.clear()
-            password_input.send_keys(password)
-
-            confirm_input = wait.until(EC.visibility_of_element_located((By.XPATH, "//input[@id='confirm_password' or @name='confirm_password']")))
-            confirm_input.clear()
-            confirm_input.send_keys(confirm)
-
-            submit_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[@id='submit' or @type='submit']")))
-            submit_button.click()
-
-            validation_message_elem = wait.until(EC.visibility_of_element_located((By.XPATH, "//*[@id='validation_message' or contains(@class, 'validation_message')]")))
-            validation_message = validation_message_elem.text.strip()
-
-            resultado = validation_message
-
+            for numero, (clave, datos) in enumerate(filas):
+                cupo.acquire()
+                orden.put((numero, clave))
+                if datos is None:
+                    entregar(numero, None)
+                else:
+                    pendientes.put((numero, datos))
         except Exception as e:
-            resultado = f"Error Selenium: {str(e)}"
-
-        ws.cell(row=i, column=6).value = resultado
-
-        if expected:
-            match = "✅" if expected.strip().lower() in resultado.lower() else "❌"
-            ws.cell(row=i, column=7).value = match
-
-    driver.quit()
-    salida = os.path.join(os.path.dirname(archivo), "resultados.xlsx")
-    wb.save(salida)
-    print(f"✅ Finalizado. Resultados guardados en {salida}.")
+            error_lectura.append(e)
+        finally:
+            orden.put(fin)
+            for _ in range(workers):
+                pendientes.put(fin)
+
+    def trabajador():
+        procesar = cerrar = None
+        try:
+            while True:
+                item = pendientes.get()
+                if item is fin:
+                    return
+                if procesar is None:
+                    try:
+                        procesar, cerrar = iniciar()
+                    except Exception as e:
+                        # Sin navegador/cliente no podemos procesar, pero no dejamos filas colgadas
+                        procesar, cerrar = (lambda datos, e=e: f"Error: {str(e)}"), None
+                numero, datos = item
+                try:
+                    resultado = procesar(datos)
+                except Exception as e:
+                    resultado = f"Error: {str(e)}"
+                entregar(numero, resultado)
+        finally:
+            if cerrar is not None:
+                cerrar()
+
+    hilos = [threading.Thread(target=productor, daemon=True)]
+    hilos += [threading.Thread(target=trabajador, daemon=True) for _ in range(workers)]
+    for hilo in hilos:
+        hilo.start()
+
+    while True:
+        item = orden.get()
+        if item is fin:
+            break
+        numero, clave = item
+        with condicion:
+            while numero not in listos:
+                condicion.wait()
+            resultado = listos.pop(numero)
+        cupo.release()
+        yield clave, resultado
+
+    for hilo in hilos:
+        hilo.join()
+    if error_lectura:
+        raise error_lectura[0]
+
+def iniciar_selenium(url_form, headless, crear=crear_driver, rapido=False):
+    """Fábrica de trabajadores Selenium: un navegador por hilo, reiniciado si se cae.
+
+    Con `rapido`, cada fila se rellena sobre la página ya cargada (procesar_fila_rapido).
+    """
+    def iniciar():
+        from selenium.common.exceptions import WebDriverException, TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+        estado = {"driver": crear(headless)}
+        estado["wait"] = WebDriverWait(estado["driver"], TIEMPO_ESPERA)
+
+        def procesar(datos):
+            for _ in range(MAX_REINTENTOS_FILA + 1):
+                driver = estado["driver"]
+                try:
+                    if rapido:
+                        return procesar_fila_rapido(driver, estado["wait"], url_form, *datos)
+                    return procesar_fila(driver, estado["wait"], url_form, *datos)
+                except Exception as e:
+                    resultado = f"Error Selenium: {str(e)}"
+                    if isinstance(e, TimeoutException) or navegador_vivo(driver):
+                        return resultado
+                # El navegador se cayó: lo reiniciamos y repetimos la misma fila
+                print(f"Navegador caído en la fila {datos[0]!r}, reiniciando...")
+                try:
+                    driver.quit()
+                except WebDriverException:
+                    pass
+                estado["driver"] = crear(headless)
+                estado["wait"] = WebDriverWait(estado["driver"], TIEMPO_ESPERA)
+            return resultado
+
+        return procesar, lambda: estado["driver"].quit()
+    return iniciar
+
+# --- Modo rápido: el formulario se carga una vez y cada fila es un solo execute_script ---
+# Vacía el formulario, rellena los cuatro campos y lo envía; devuelve el mensaje si la
+# validación del cliente lo escribió al instante, "" si hay que esperar a /register, o
+# null si la página no tiene el formulario (navegador nuevo o página perdida).
+SCRIPT_RELLENAR = """
+const form = document.getElementById("registration_form");
+if (!form) return null;
+const mensaje = document.getElementById("validation_message");
+form.reset();
+mensaje.textContent = "";
+document.getElementById("fullname").value = arguments[0];
+document.getElementById("email").value = arguments[1];
+document.getElementById("password").value = arguments[2];
+document.getElementById("confirm_password").value = arguments[3];
+form.requestSubmit(document.getElementById("submit_button"));
+return mensaje.textContent;
+"""
+SCRIPT_MENSAJE = "return document.getElementById('validation_message').textContent;"
+INTERVALO_SONDEO = 0.02  # segundos entre lecturas de validation_message
+
+def procesar_fila_rapido(driver, wait, url_form, name, email, password, confirm):
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.support.ui import WebDriverWait
+    campos = [_texto(valor) for valor in (name, email, password, confirm)]
+    mensaje = driver.execute_script(SCRIPT_RELLENAR, *campos)
+    if mensaje is None:
+        driver.get(url_form)
+        mensaje = driver.execute_script(SCRIPT_RELLENAR, *campos)
+        if mensaje is None:
+            raise WebDriverException("registration_form not found in the page")
+    if not mensaje:
+        # Una lectura por ID en cada sondeo, sin XPath ni comprobaciones de visibilidad
+        mensaje = WebDriverWait(driver, TIEMPO_ESPERA, poll_frequency=INTERVALO_SONDEO).until(
+            lambda d: d.execute_script(SCRIPT_MENSAJE))
+    return mensaje.strip()
+
+# --- Ejecución en paralelo: N navegadores headless toman filas de una cola ---
+def ejecutar_en_paralelo(filas, url_form, workers, crear=crear_driver):
+    return dict(ejecutar_en_orden(filas, iniciar_selenium(url_form, True, crear), workers))
+
+# --- Modo HTTP directo: sin navegador, POST a /register ---
+EMAIL_FORMULARIO = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+
+def _texto(valor):
+    return "" if valor is None else str(valor)
+
+def validacion_cliente(name, email, password, confirm):
+    """Replica las validaciones JavaScript de form.html; devuelve el mensaje que mostraría o None."""
+    errores = []
+    if len(name) < 3:
+        errores.append("❌ Full Name must be at least 3 characters.")
+    if not EMAIL_FORMULARIO.match(email):
+        errores.append("❌ Invalid email format.")
+    if len(password) < 6 or not re.search(r"[!@#$%^&*]", password):
+        errores.append("❌ Password must be at least 6 characters and include a special symbol.")
+    if password != confirm:
+        errores.append("❌ Passwords do not match.")
+    return " | ".join(errores) if errores else None
+
+def mensaje_respuesta(status, datos):
+    """Resultado de la fila a partir de la respuesta de /register.
+
+    Los 5xx (p. ej. 503 por saturación) son transitorios: se devuelven como "Error HTTP ..."
+    para que no se guarden en el checkpoint y la próxima ejecución reintente la fila.
+    """
+    mensaje = datos.get("message") if isinstance(datos, dict) else None
+    if status >= 500 or mensaje is None:
+        return f"Error HTTP {status}: {mensaje}" if mensaje else f"Error HTTP {status}"
+    return mensaje
+
+def crear_envio_http(url_base, concurrencia):
+    """Devuelve una función que envía un registro a /register con sesiones keep-alive."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    locales = threading.local()
+    url = url_base.rstrip("/") + "/register"
+
+    def enviar(payload):
+        sesion = getattr(locales, "sesion", None)
+        if sesion is None:
+            sesion = requests.Session()
+            sesion.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=concurrencia))
+            sesion.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=concurrencia))
+            locales.sesion = sesion
+        respuesta = sesion.post(url, json=payload, timeout=30)
+        try:
+            datos = respuesta.json()
+        except ValueError:
+            datos = None
+        return mensaje_respuesta(respuesta.status_code, datos)
+
+    return enviar
+
+def crear_envio_inproceso(config=None):
+    """Devuelve una función que envía un registro a la app de create_app sin red (test_client)."""
+    from server import create_app
+    app = create_app(config)
+    locales = threading.local()
+
+    def enviar(payload):
+        cliente = getattr(locales, "cliente", None)
+        if cliente is None:
+            cliente = locales.cliente = app.test_client()
+        respuesta = cliente.post("/register", json=payload)
+        return mensaje_respuesta(respuesta.status_code, respuesta.get_json(silent=True))
+
+    return enviar
+
+def registrar_fila_http(enviar, name, email, password, confirm):
+    # Igual que form.html: se recortan los campos y se valida en el cliente antes de enviar
+    name, email, password, confirm = (_texto(v).strip() for v in (name, email, password, confirm))
+    error = validacion_cliente(name, email, password, confirm)
+    if error:
+        return error
+    try:
+        return enviar({"fullname": name, "email": email, "password": password})
+    except Exception as e:
+        return f"Error HTTP: {str(e)}"
+
+def iniciar_http(enviar):
+    def iniciar():
+        return (lambda datos: registrar_fila_http(enviar, *datos)), (lambda: None)
+    return iniciar
+
+ENCABEZADOS = ["Full Name", "Email", "Password", "Confirm Password", "Expected Outcome",
+               "Resultado del Test", "Coincidencia con Esperado", "Tiempo (ms)"]
+
+def _cabecera(fila, encabezados):
+    fila = list(fila or ())
+    fila += [None] * (len(encabezados) - len(fila))
+    return [valor if valor else titulo for valor, titulo in zip(fila, encabezados)] + fila[len(encabezados):]
+
+def _datos_fila(row):
+    """Los cuatro campos del formulario, o None si la fila está incompleta o vacía."""
+    if len(row) < 4 or all(valor is None for valor in row[:4]):
+        return None
+    return tuple(row[:4])
+
+def fila_resultado(row, resultado, tiempo_ms=None):
+    """Fila original con las columnas "Resultado del Test", "Coincidencia con Esperado" y "Tiempo (ms)"."""
+    fila = list(row) + [None] * (len(ENCABEZADOS) - len(row))
+    if resultado is None:
+        return fila
+    fila[5] = resultado
+    fila[7] = tiempo_ms
+    expected = row[4] if len(row) >= 5 else None
+    if expected:
+        fila[6] = "✅" if str(expected).strip().lower() in resultado.lower() else "❌"
+    return fila
+
+def fila_detalle(row):
+    """Fila del reporte por validador: las cinco columnas de entrada y un ✅/❌ por validador."""
+    row = tuple(row) + (None,) * (5 - len(row))
+    nombre, correo, clave, confirmacion = row[:4]
+    resultado_validadores = validators.evaluar_validadores(_texto(nombre), _texto(correo),
+                                                           _texto(clave), _texto(confirmacion))
+    return [nombre, correo, clave, confirmacion, row[4] if row[4] is not None else ""] + \
+        list(resultado_validadores.values())
+
+def encabezados_detalle():
+    return ENCABEZADOS[:5] + list(validators.evaluar_validadores("Test", "test@example.com", "Pass1A$", "Pass1A$").keys())
+
+def rutas_salida(entrada, salida=None, salida_detalle=None):
+    """Rutas de resultados y detalle; por defecto junto a la entrada y en su mismo formato."""
+    if not salida:
+        salida = os.path.join(os.path.dirname(entrada), "resultados" + os.path.splitext(entrada)[1])
+    if not salida_detalle:
+        base, extension = os.path.splitext(salida)
+        salida_detalle = base + "_detalle_validadores" + extension
+    return salida, salida_detalle
+
+def medir_filas(iniciar):
+    """Envuelve iniciar() para que procesar devuelva (resultado, milisegundos de la fila)."""
+    def iniciar_medido():
+        procesar, cerrar = iniciar()
+
+        def procesar_medido(datos):
+            inicio = time.perf_counter()
+            try:
+                resultado = procesar(datos)
+            except Exception as e:
+                resultado = f"Error: {str(e)}"
+            return resultado, round((time.perf_counter() - inicio) * 1000, 1)
+        return procesar_medido, cerrar
+    return iniciar_medido
+
+class HistogramaTiempos:
+    """Tiempos por fila en cubetas logarítmicas (error relativo de ~2 %): la memoria es fija
+    (unos cientos de cubetas como mucho) sea cual sea el tamaño de la hoja."""
+    FACTOR = 1.02
+    MINIMO_MS = 0.1  # resolución con la que medir_filas redondea
+
+    def __init__(self):
+        self.cubetas = {}  # índice -> filas
+        self.total = 0
+        self.suma = 0.0
+
+    def agregar(self, ms):
+        indice = 0 if ms < self.MINIMO_MS else 1 + int(math.log(ms / self.MINIMO_MS, self.FACTOR))
+        self.cubetas[indice] = self.cubetas.get(indice, 0) + 1
+        self.total += 1
+        self.suma += ms
+
+    def percentil(self, q):
+        """Valor aproximado (centro geométrico de la cubeta) del percentil q (0-1)."""
+        posicion = min(self.total - 1, int(self.total * q))
+        acumuladas = 0
+        for indice in sorted(self.cubetas):
+            acumuladas += self.cubetas[indice]
+            if acumuladas > posicion:
+                return 0.0 if indice == 0 else self.MINIMO_MS * self.FACTOR ** (indice - 0.5)
+        return 0.0
+
+def resumen_tiempos(tiempos):
+    if not tiempos.total:
+        return "sin filas procesadas"
+    return (f"media {tiempos.suma / tiempos.total:.1f} ms, p50 {tiempos.percentil(0.5):.1f} ms, "
+            f"p95 {tiempos.percentil(0.95):.1f} ms por fila")
+
+def ruta_checkpoint(entrada):
+    return os.path.splitext(entrada)[0] + ".checkpoint.sqlite"
 
-    # Genera archivo detallado con resultados individuales
-    detalle_path = os.path.join(os.path.dirname(archivo), "resultados_detalle_validadores.xlsx")
-    procesar_resultados_excel(salida, detalle_path)
-    print(f"✅ Archivo de detalle generado en {detalle_path}.")
+# --- Función principal de ejecución de pruebas con Selenium ---
+def ejecutar_registros(archivo=None, workers=1, headless=False, modo="selenium", url_base=URL_BASE,
+                       database=None, salida=None, salida_detalle=None, checkpoint=None, force=False,
+                       rapido=False):
+    archivo = archivo or seleccionar_archivo()
+    if not archivo:
+        print("No se seleccionó archivo.")
+        return
+    salida, salida_detalle = rutas_salida(archivo, salida, salida_detalle)
+    # Los resultados se guardan por fila en un SQLite junto a la hoja: al repetir la ejecución
+    # solo se procesan las filas nuevas o modificadas (salvo con force=True)
+    cache = CacheResultados(checkpoint or ruta_checkpoint(archivo),
+                            contexto=(modo, database if modo == "inproceso" else url_base))
+
+    if modo == "selenium":
+        # Si usas un servidor Flask para servir la página, puedes iniciarlo en otro hilo.
+        flask_thread = threading.Thread(target=run_flask_app, daemon=True)
+        flask_thread.start()
+        print("Servidor Flask arrancado en hilo separado...")
+        time.sleep(3)
+
+    if modo == "http":
+        print(f"Iniciando procesamiento vía HTTP ({workers} en paralelo)...")
+        iniciar = iniciar_http(crear_envio_http(url_base, workers))
+    elif modo == "inproceso":
+        print(f"Iniciando procesamiento en proceso ({workers} en paralelo)...")
+        config = {"DATABASE": database} if database else None
+        iniciar = iniciar_http(crear_envio_inproceso(config))
+    else:
+        print(f"Iniciando procesamiento con {workers} navegador(es){' en modo rápido' if rapido else ''}...")
+        iniciar = iniciar_selenium(url_base.rstrip("/") + "/form.html", headless or workers > 1, rapido=rapido)
+    iniciar = medir_filas(iniciar)
+
+    # Lectura y escritura en streaming: la entrada nunca se carga entera en memoria y las
+    # dos salidas (resultados y detalle por validador) se escriben en la misma pasada.
+    with cache, abrir_lectura(archivo) as lector, \
+            abrir_escritura(salida, _cabecera(lector.encabezados, ENCABEZADOS)) as escritor, \
+            abrir_escritura(salida_detalle, encabezados_detalle()) as escritor_detalle:
+
+        def filas():
+            for i, row in enumerate(lector, start=2):
+                datos = _datos_fila(row)
+                if datos is None:
+                    print(f"Fila {i} incompleta. Saltando...")
+                    yield (row, None, None), None
+                    continue
+                clave = cache.clave(datos)
+                previo = None if force else cache.get(clave)
+                # Las filas ya resueltas pasan sin procesarse (datos None) con su resultado guardado
+                yield (row, clave, previo), (None if previo is not None else datos)
+
+        procesadas = 0
+        tiempos = HistogramaTiempos()
+        for (row, clave, previo), resultado in ejecutar_en_orden(filas(), iniciar, workers):
+            tiempo_ms = None
+            if isinstance(resultado, tuple):
+                resultado, tiempo_ms = resultado
+                tiempos.agregar(tiempo_ms)
+            if previo is not None:
+                resultado = previo
+            elif clave is not None and resultado is not None and not resultado.startswith("Error"):
+                # Los errores (navegador, red) no se guardan: se reintentan en la próxima ejecución
+                cache.put(clave, resultado)
+            escritor.append(fila_resultado(row, resultado, tiempo_ms))
+            escritor_detalle.append(fila_detalle(row))
+            procesadas += 1
+
+    print(f"✅ Finalizado. {procesadas} filas ({cache.aciertos} reutilizadas del checkpoint "
+          f"{cache.path}). Resultados guardados en {salida}.")
+    print(f"✅ Archivo de detalle generado en {salida_detalle}.")
+    print(f"⏱️ Tiempo por fila: {resumen_tiempos(tiempos)}.")
 
 # --- Función para crear el Excel con resultados de validadores individuales ---
-def procesar_resultados_excel(input_path, output_path):
-    wb = load_workbook(input_path)
-    ws = wb.active
-
-    wb_out = Workbook()
-    ws_out = wb_out.active
-
-    encabezados = ["Full Name", "Email", "Password", "Confirm Password", "Expected Outcome"]
-    validador_headers = list(validators.evaluar_validadores("Test", "test@example.com", "Pass1A$", "Pass1A$").keys())
-    ws_out.append(encabezados + validador_headers)
-
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        nombre, correo, clave, confirmacion = row[:4]
-        resultado_validadores = validators.evaluar_validadores(nombre or "", correo or "", clave or "", confirmacion or "")
-        fila = [
-            nombre, correo, clave, confirmacion,
-            row[4] if len(row) >= 5 else ""
-        ] + list(resultado_validadores.values())
-        ws_out.append(fila)
-
-    wb_out.save(output_path)
+def procesar_resultados_excel(input_path, output_path, workers=None, resumen=False):
+    """Reporte por validador de toda la hoja (ver report.py: memo de filas repetidas y pool de procesos)."""
+    return generar_reporte(input_path, output_path, workers=workers, resumen=resumen)
 
 # --- Código principal ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta los registros de una hoja de datos contra /register")
+    parser.add_argument("archivo", nargs="?", help="igual que --input")
+    parser.add_argument("--input", "-i", dest="entrada",
+                        help="datos de entrada (.xlsx, .csv, .jsonl, .parquet); si se omite, se abre un diálogo")
+    parser.add_argument("--output", "-o", dest="salida",
+                        help="resultados (por defecto resultados.<ext> junto a la entrada)")
+    parser.add_argument("--detail-output", dest="salida_detalle",
+                        help="detalle por validador (por defecto <output>_detalle_validadores.<ext>)")
+    parser.add_argument("--modo", choices=["selenium", "http", "inproceso"], default="selenium",
+                        help="selenium: navegador; http: POST directo a /register; "
+                             "inproceso: app de create_app sin red")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="navegadores headless o peticiones HTTP en paralelo (por defecto 1)")
+    parser.add_argument("--headless", action="store_true", help="ejecuta Chrome sin ventana")
+    parser.add_argument("--rapido", action="store_true",
+                        help="selenium: carga el formulario una vez y rellena cada fila con un solo script")
+    parser.add_argument("--url", default=URL_BASE, help=f"URL base del servidor (por defecto {URL_BASE})")
+    parser.add_argument("--database", help="base SQLite para el modo inproceso (por defecto users.db)")
+    parser.add_argument("--checkpoint",
+                        help="caché de resultados por fila (por defecto <entrada>.checkpoint.sqlite)")
+    parser.add_argument("--force", action="store_true",
+                        help="ignora los resultados guardados y vuelve a ejecutar todas las filas")
+    args = parser.parse_args(argv)
+    ejecutar_registros(args.entrada or args.archivo, workers=max(1, args.workers), headless=args.headless,
+                       modo=args.modo, url_base=args.url, database=args.database,
+                       salida=args.salida, salida_detalle=args.salida_detalle,
+                       checkpoint=args.checkpoint, force=args.force, rapido=args.rapido)
+
 if __name__ == "__main__":
-    ejecutar_registros()
+    main()
@@ -1,93 +1,509 @@
 #SERVER.PY
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, abort, jsonify, request, send_from_directory
 import sqlite3
 import os
-from werkzeug.security import generate_password_hash
-from werkzeug.exceptions import BadRequest
+import json
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+from storage import DEFAULT_PRAGMAS, INSERT_USER
+from sharding import ShardedStore
+from hashing import HashingExecutor, HashingBusy
+from password_policy import MIN_PBKDF2_ITERATIONS, MIN_SCRYPT_N, politica_desde_config
+from idempotency import IdempotencyConflict, IdempotencyStore, clave_valida, huella
+from blocklist import BlockList
+from metrics import Registry
+from static_cache import StaticCache
 from validators import (
-    validate_not_empty,
-    validate_fullname_length,
+    MOTOR_REGISTRO,
     validate_email_format,
-    validate_password_strength,
-    validate_password_common,
     validate_email_case_insensitive,
-    validate_long_name,
-    validate_long_password,
-    validate_trim,
-    validate_no_numbers_in_name,
 )
 
-def create_app():
+# Tamaño máximo de un lote en /register/batch, en registros y en bytes del cuerpo
+MAX_BATCH_RECORDS = 10000
+MAX_BATCH_BYTES = 16 * 1024 * 1024
+# Paginación de /users
+USERS_PAGE_SIZE = 100
+USERS_PAGE_MAX = 1000
+USERS_EXPORT_CHUNK = 1000  # filas por consulta al exportar en NDJSON
+
+def validar_registro(fullname, email, password, blocklist=None):
+    """Ejecuta la cadena de validadores y devuelve el primer mensaje de error, o None."""
+    falla = MOTOR_REGISTRO.primera_falla(fullname=fullname, email=email, password=password)
+    if falla:
+        return falla.mensaje
+    # Lista grande de contraseñas filtradas (opcional), además de las comunes de validators.py
+    if blocklist is not None and password in blocklist:
+        return "❌ Password is too common"
+    return None
+
+def _demasiado_grande(motivo):
+    return RequestEntityTooLarge(f"❌ Batch is too large ({motivo})")
+
+def leer_lote(req):
+    """Devuelve los registros de un lote: un arreglo JSON o un flujo NDJSON (un objeto por línea).
+
+    Nunca lee más de MAX_BATCH_BYTES ni más de MAX_BATCH_RECORDS registros: un cuerpo mayor
+    lanza RequestEntityTooLarge sin haberlo cargado entero en memoria.
+    """
+    if req.content_length is not None and req.content_length > MAX_BATCH_BYTES:
+        raise _demasiado_grande(f"max {MAX_BATCH_BYTES // (1024 * 1024)} MB")
+    if req.mimetype in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        registros = []
+        restante = MAX_BATCH_BYTES
+        while True:
+            linea = req.stream.readline(restante + 1)
+            if not linea:
+                return registros
+            restante -= len(linea)
+            if restante < 0:
+                raise _demasiado_grande(f"max {MAX_BATCH_BYTES // (1024 * 1024)} MB")
+            linea = linea.strip()
+            if not linea:
+                continue
+            if len(registros) == MAX_BATCH_RECORDS:
+                raise _demasiado_grande(f"max {MAX_BATCH_RECORDS} records")
+            try:
+                registros.append(json.loads(linea))
+            except ValueError:
+                # La línea inválida se reporta como error de ese registro, sin abortar el lote
+                registros.append(None)
+    # Sin Content-Length (chunked) el tope se comprueba leyendo como mucho un byte de más
+    cuerpo = req.stream.read(MAX_BATCH_BYTES + 1)
+    if len(cuerpo) > MAX_BATCH_BYTES:
+        raise _demasiado_grande(f"max {MAX_BATCH_BYTES // (1024 * 1024)} MB")
+    try:
+        data = json.loads(cuerpo)
+    except ValueError:
+        raise BadRequest("Invalid JSON") from None
+    if not isinstance(data, list):
+        raise BadRequest("Expected a JSON array")
+    if len(data) > MAX_BATCH_RECORDS:
+        raise _demasiado_grande(f"max {MAX_BATCH_RECORDS} records")
+    return data
+
+def esperar_escritura(futuro, timeout):
+    """Resultado de una escritura encolada en el GroupCommitWriter.
+
+    Si vence `timeout` y la fila aún no entró en un commit, se cancela y lanza TimeoutError
+    (no se escribirá). Si ya está en un commit en curso, cancelarla no es posible: se espera
+    su resultado, que el escritor entrega siempre (o su excepción si el commit falla).
+    """
+    try:
+        return futuro.result(timeout=timeout)
+    except TimeoutError:
+        if futuro.cancel():
+            raise
+        return futuro.result()
+
+def leer_cursor(texto, shards):
+    """Convierte el parámetro `after` ("id" o "id:shard") en la tupla (id, shard) de ShardedStore."""
+    if not texto:
+        return (0, -1)
+    id_, _, shard = texto.partition(":")
+    despues = (int(id_), int(shard) if shard else shards - 1)
+    if despues[0] < 0 or not 0 <= despues[1] < shards:
+        raise ValueError(f"Invalid cursor: {texto!r}")
+    return despues
+
+def usuario_json(fila, shards):
+    """Usuario para /users, sin el hash de la contraseña; con varios shards, el id solo es único junto al shard."""
+    id_, shard, fullname, email = fila
+    usuario = {"id": id_, "fullname": fullname, "email": email}
+    if shards > 1:
+        usuario["shard"] = shard
+    return usuario
+
+def cursor_de(fila, shards, prefijo=None):
+    """Cursor `after` de la página siguiente: el último email si se filtra por prefijo, si no "id[:shard]"."""
+    if prefijo:
+        return fila[3]
+    return str(fila[0]) if shards == 1 else f"{fila[0]}:{fila[1]}"
+
+# Configuración por defecto (compartida con asgi_server.py)
+DEFAULT_CONFIG = dict(
+    DATABASE="users.db",
+    SQLITE_PRAGMAS=DEFAULT_PRAGMAS,
+    DB_SHARDS=1,                # archivos SQLite; con 1 se usa DATABASE tal cual
+    INIT_DB=True,               # False: el esquema ya existe (p. ej. `python cli.py init-db`)
+    DB_MULTIPROCESS=False,      # True: otros procesos escriben en la misma base (prefork.py)
+    DB_POOL_SIZE=16,            # conexiones por shard
+    DB_WRITER_MAX_BATCH=256,    # filas por commit del escritor de /register
+    DB_WRITER_MAX_DELAY=0.002,  # segundos que espera a juntar más filas antes del commit
+    DB_WRITER_TIMEOUT=10,       # segundos que /register espera el commit antes de responder 503
+    HASH_EXECUTOR="process",  # "process" o "thread"
+    HASH_WORKERS=None,        # None = os.cpu_count()
+    HASH_QUEUE_SIZE=64,
+    HASH_TIMEOUT=30,
+    HASH_RETRY_AFTER=1,
+    HASH_METHOD=None,         # método fijo de werkzeug ("pbkdf2:sha256:600000"); None = calibrar al arrancar
+    HASH_ALGORITHM="pbkdf2",  # "pbkdf2" o "scrypt" al calibrar
+    HASH_TIME_BUDGET_MS=250,  # tiempo objetivo de un hash en esta máquina
+    HASH_MEMORY_BUDGET_MB=64,  # memoria de un hash scrypt
+    HASH_MIN_PBKDF2_ITERATIONS=MIN_PBKDF2_ITERATIONS,  # mínimos aunque se pase del tiempo (los de werkzeug)
+    HASH_MIN_SCRYPT_N=MIN_SCRYPT_N,
+    EMAIL_INDEX_CAPACITY=100000,  # en total, repartida entre los shards
+    EMAIL_INDEX_LRU_SIZE=10000,
+    BREACHED_PASSWORDS_INDEX=None,  # índice generado con `python blocklist.py build`
+    IDEMPOTENCY_TTL=86400,        # segundos que se recuerda la respuesta de una Idempotency-Key
+    IDEMPOTENCY_MAX_KEYS=10000,   # claves en memoria (LRU)
+    IDEMPOTENCY_DATABASE=None,    # SQLite opcional: sobrevive a reinicios y se comparte entre procesos
+    IDEMPOTENCY_WAIT_TIMEOUT=30,  # segundos que un reintento espera a la petición en curso
+    METRICS_ENABLED=True,
+    STATIC_CACHE_CONTROL="public, max-age=3600",
+    STATIC_CHECK_CHANGES=None,  # recargar static/ si cambia; None = solo en modo debug
+)
+
+def create_app(config=None):
     app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
+
+    # Pools, escritores e índices de emails de cada shard (uno solo con DB_SHARDS=1)
+    store = ShardedStore(app.config)
+    app.extensions["user_store"] = store
+
+    # Parámetros del hash calibrados para esta máquina (una vez por proceso)
+    politica = politica_desde_config(app.config)
+    app.extensions["hash_policy"] = politica
+    hasher = HashingExecutor(workers=app.config["HASH_WORKERS"],
+                             queue_size=app.config["HASH_QUEUE_SIZE"],
+                             kind=app.config["HASH_EXECUTOR"],
+                             method=politica.method)
+    app.extensions["hasher"] = hasher
+
+    blocklist = None
+    if app.config["BREACHED_PASSWORDS_INDEX"]:
+        blocklist = BlockList(app.config["BREACHED_PASSWORDS_INDEX"])
+    app.extensions["blocklist"] = blocklist
+
+    idempotencia = IdempotencyStore(ttl=app.config["IDEMPOTENCY_TTL"],
+                                    max_keys=app.config["IDEMPOTENCY_MAX_KEYS"],
+                                    path=app.config["IDEMPOTENCY_DATABASE"],
+                                    pragmas=app.config["SQLITE_PRAGMAS"])
+    app.extensions["idempotency"] = idempotencia
+
+    metricas = Registry(enabled=app.config["METRICS_ENABLED"])
+    app.extensions["metrics"] = metricas
+    etapas_registro = metricas.histogram(
+        "register_stage_duration_seconds", "Time spent in each stage of /register", ("stage",))
+    registros_total = metricas.counter(
+        "register_requests_total", "Requests to /register by outcome", ("outcome",))
+    fallas_validacion = metricas.counter(
+        "register_validation_failures_total", "Validation failures in /register by message", ("reason",))
+    duplicados = metricas.counter(
+        "register_duplicate_email_total", "Duplicate emails detected in /register", ("source",))
+    logins_total = metricas.counter("login_requests_total", "Requests to /login by outcome", ("outcome",))
+    rehashes = metricas.counter("password_rehash_total", "Stored hashes upgraded to the current policy")
+    idempotentes = metricas.counter(
+        "register_idempotency_total", "Requests to /register with an Idempotency-Key by outcome", ("outcome",))
+    metricas.gauge("db_writer_queue_depth", "Rows waiting for the group-commit writer",
+                   lambda: store.writer_stats()["queue_depth"])
+    metricas.gauge("db_writer_commits_total", "Transactions committed by the group-commit writer",
+                   lambda: store.writer_stats()["batches"], tipo="counter")
+    metricas.gauge("db_writer_rows_total", "Rows written by the group-commit writer",
+                   lambda: store.writer_stats()["rows"], tipo="counter")
+    metricas.gauge("hashing_in_flight", "Password hashes queued or running",
+                   lambda: hasher.stats()["in_flight"])
+    metricas.gauge("hashing_queue_depth", "Password hashes waiting for a worker",
+                   lambda: hasher.stats()["queue_depth"])
+    metricas.gauge("hashing_rejected_total", "Hash requests rejected because the queue was full",
+                   lambda: hasher.stats()["rejected"], tipo="counter")
+    metricas.gauge("hashing_wait_seconds_avg", "Average time a hash waited for a worker",
+                   lambda: hasher.stats()["avg_wait_ms"] / 1000)
+    metricas.gauge("hashing_wait_seconds_max", "Longest time a hash waited for a worker",
+                   lambda: hasher.stats()["max_wait_ms"] / 1000)
+
+    def servidor_ocupado():
+        return (jsonify({"status": "error", "message": "❌ Server is busy, please retry later"}), 503,
+                {"Retry-After": str(app.config["HASH_RETRY_AFTER"])})
 
-    def init_db():
-        conn = sqlite3.connect("users.db")
-        cursor = conn.cursor()
-        cursor.execute("""CREATE TABLE IF NOT EXISTS users (
-                            id INTEGER PRIMARY KEY,
-                            fullname TEXT NOT NULL,
-                            email TEXT UNIQUE NOT NULL,
-                            password TEXT NOT NULL)""")
-        conn.commit()
-        conn.close()
+    store.init_db(crear=app.config["INIT_DB"])
 
-    init_db()
+    # static/ se sirve desde memoria, con versiones comprimidas precalculadas
+    comprobar = app.config["STATIC_CHECK_CHANGES"]
+    static_cache = StaticCache(app.static_folder, cache_control=app.config["STATIC_CACHE_CONTROL"],
+                               check_changes=app.debug if comprobar is None else comprobar)
+    app.extensions["static_cache"] = static_cache
+
+    def servir_estatico(filename):
+        resultado = static_cache.respuesta(filename, request.headers.get("Accept-Encoding"),
+                                           request.headers.get("If-None-Match"))
+        if resultado is None:
+            abort(404)
+        status, headers, cuerpo = resultado
+        return Response(cuerpo, status=status, headers=headers)
+
+    app.view_functions["static"] = servir_estatico
 
     @app.route('/form.html')
     def serve_form():
-         return app.send_static_file('form.html')
+        return servir_estatico('form.html')
     
-    @app.route('/register', methods=['POST'])
-    def register_user():
+    def registrar():
+        cronometro = metricas.cronometro(etapas_registro)
         try:
             data = request.get_json(force=True)
         except BadRequest:
+            metricas.inc(registros_total, "bad_request")
             return jsonify({"status": "error", "message": "❌ Invalid request format"}), 400
 
         fullname = data.get("fullname", "").strip()
         email = data.get("email", "").strip()
         password = data.get("password", "").strip()
+        cronometro.etapa("parse")
 
         # 🔍 Validaciones usando validators.py
-        if not validate_not_empty(fullname, email, password):
-            return jsonify({"status": "error", "message": "❌ Missing required fields"}), 400
-        if not validate_trim(fullname, email, password):
-            return jsonify({"status": "error", "message": "❌ Fields should not start or end with spaces"}), 400
-        if not validate_fullname_length(fullname):
-            return jsonify({"status": "error", "message": "❌ Full Name must be at least 3 characters"}), 400
-        if not validate_long_name(fullname):
-            return jsonify({"status": "error", "message": "❌ Full Name is too long"}), 400
-        if not validate_no_numbers_in_name(fullname):
-            return jsonify({"status": "error", "message": "❌ Name should not contain numbers"}), 400
-        if not validate_email_format(email):
-            return jsonify({"status": "error", "message": "❌ Invalid email format"}), 400
-        if not validate_email_case_insensitive(email):
-            return jsonify({"status": "error", "message": "❌ Email should be lowercase only"}), 400
-        if not validate_password_strength(password):
-            return jsonify({"status": "error", "message": "❌ Password must be 6+ characters and include a special symbol"}), 400
-        if not validate_password_common(password):
-            return jsonify({"status": "error", "message": "❌ Password is too common"}), 400
-        if not validate_long_password(password):
-            return jsonify({"status": "error", "message": "❌ Password is too long"}), 400
+        error = validar_registro(fullname, email, password, blocklist)
+        cronometro.etapa("validation")
+        if error:
+            metricas.inc(registros_total, "validation_error")
+            metricas.inc(fallas_validacion, error)
+            return jsonify({"status": "error", "message": error}), 400
 
-        hashed_password = generate_password_hash(password, method="pbkdf2:sha256")
+        # Duplicado conocido: respondemos antes de gastar CPU en el hash
+        duplicado = store.contains(email)
+        cronometro.etapa("duplicate_check")
+        if duplicado:
+            metricas.inc(registros_total, "duplicate")
+            metricas.inc(duplicados, "index")
+            return jsonify({"status": "error", "message": "❌ Email already registered."})
 
-        conn = sqlite3.connect("users.db")
-        cursor = conn.cursor()
+        try:
+            hashed_password = hasher.hash(password, timeout=app.config["HASH_TIMEOUT"])
+        except (HashingBusy, TimeoutError):
+            metricas.inc(registros_total, "busy")
+            return servidor_ocupado()
+        cronometro.etapa("hash")
 
+        # El escritor del shard agrupa este INSERT con los de otras peticiones en un solo commit
         try:
-            cursor.execute("INSERT INTO users (fullname, email, password) VALUES (?, ?, ?)",
-                           (fullname, email, hashed_password))
-            conn.commit()
+            registrado = esperar_escritura(store.submit(fullname, email, hashed_password),
+                                           app.config["DB_WRITER_TIMEOUT"])
+        except (TimeoutError, sqlite3.Error):
+            # La fila no se escribió ni se escribirá: el cliente puede reintentar tras el 503
+            metricas.inc(registros_total, "db_unavailable")
+            return servidor_ocupado()
+        if registrado:
             response = {"status": "success", "message": "✅ Registration successful!"}
-        except sqlite3.IntegrityError:
+            metricas.inc(registros_total, "success")
+        else:
             response = {"status": "error", "message": "❌ Email already registered."}
+            metricas.inc(registros_total, "duplicate")
+            metricas.inc(duplicados, "constraint")
+        store.add(email)
+        cronometro.etapa("db")
 
-        conn.close()
         return jsonify(response)
 
+    @app.route('/register', methods=['POST'])
+    def register_user():
+        clave = request.headers.get("Idempotency-Key")
+        if clave is None:
+            return registrar()
+        if not clave_valida(clave):
+            return jsonify({"status": "error", "message": "❌ Invalid Idempotency-Key header"}), 400
+
+        def responder():
+            respuesta = app.make_response(registrar())
+            headers = [(nombre, valor) for nombre, valor in respuesta.headers.items() if nombre != "Content-Length"]
+            return respuesta.status_code, headers, respuesta.get_data()
+
+        # Un reintento con la misma clave reutiliza la respuesta (o espera a la petición en curso)
+        try:
+            (status, headers, cuerpo), repetida = idempotencia.ejecutar(
+                clave, huella("POST", "/register", request.get_data()), responder,
+                timeout=app.config["IDEMPOTENCY_WAIT_TIMEOUT"])
+        except IdempotencyConflict:
+            metricas.inc(idempotentes, "conflict")
+            return jsonify({"status": "error",
+                            "message": "❌ Idempotency-Key was already used with a different request"}), 422
+        except TimeoutError:
+            metricas.inc(idempotentes, "in_progress")
+            return jsonify({"status": "error",
+                            "message": "❌ A request with this Idempotency-Key is still in progress"}), 409
+        metricas.inc(idempotentes, "replayed" if repetida else "new")
+        if repetida:
+            headers = [*headers, ("Idempotent-Replayed", "true")]
+        return Response(cuerpo, status=status, headers=headers)
+
+    @app.route('/register/batch', methods=['POST'])
+    def register_batch():
+        try:
+            registros = leer_lote(request)
+        except RequestEntityTooLarge as e:
+            return jsonify({"status": "error", "message": e.description}), 413
+        except BadRequest:
+            return jsonify({"status": "error", "message": "❌ Invalid request format"}), 400
+
+        resultados = []
+        pendientes = []  # (índice en resultados, fullname, email, password)
+        vistos = set()
+        for indice, data in enumerate(registros):
+            if not isinstance(data, dict):
+                resultados.append({"index": indice, "email": None, "status": "error",
+                                   "message": "❌ Invalid request format"})
+                continue
+
+            fullname = str(data.get("fullname") or "").strip()
+            email = str(data.get("email") or "").strip()
+            password = str(data.get("password") or "").strip()
+            resultado = {"index": indice, "email": email, "status": "error"}
+            resultados.append(resultado)
+
+            error = validar_registro(fullname, email, password, blocklist)
+            if error:
+                resultado["message"] = error
+            elif email in vistos:
+                # Duplicado dentro del mismo lote
+                resultado["message"] = "❌ Email already registered."
+            else:
+                vistos.add(email)
+                pendientes.append((indice, fullname, email, password))
+
+        # Descartamos duplicados antes de gastar CPU en el hash
+        existentes = store.existing(p[2] for p in pendientes)
+        nuevos = []
+        for pendiente in pendientes:
+            if pendiente[2] in existentes:
+                resultados[pendiente[0]]["message"] = "❌ Email already registered."
+            else:
+                nuevos.append(pendiente)
+        hashes = hasher.hash_many(p[3] for p in nuevos)
+        filas = [(indice, fullname, email, hashed_password)
+                 for (indice, fullname, email, _), hashed_password in zip(nuevos, hashes)]
+
+        insertados = set()
+        for shard, filas_shard in store.agrupar(filas, lambda fila: fila[2]).items():
+            with shard.pool.connection() as conn:
+                cursor = conn.cursor()
+                # Una sola transacción (un solo commit/fsync) por shard para todo el lote
+                try:
+                    cursor.executemany(INSERT_USER, [fila[1:] for fila in filas_shard])
+                    insertados.update(fila[0] for fila in filas_shard)
+                except sqlite3.IntegrityError:
+                    # Otra petición registró alguno de los emails entre la consulta y el INSERT:
+                    # repetimos fila por fila dentro de la misma transacción para aislar los duplicados.
+                    conn.rollback()
+                    for indice, fullname, email, hashed_password in filas_shard:
+                        try:
+                            cursor.execute(INSERT_USER, (fullname, email, hashed_password))
+                            insertados.add(indice)
+                        except sqlite3.IntegrityError:
+                            resultados[indice]["message"] = "❌ Email already registered."
+                            shard.email_index.add(email)
+                conn.commit()
+
+        for indice in insertados:
+            store.add(resultados[indice]["email"])
+            resultados[indice]["status"] = "success"
+            resultados[indice]["message"] = "✅ Registration successful!"
+
+        registrados = len(insertados)
+        return jsonify({
+            "status": "success" if registrados == len(resultados) else ("error" if not registrados else "partial"),
+            "total": len(resultados),
+            "registered": registrados,
+            "failed": len(resultados) - registrados,
+            "results": resultados,
+        })
+
+    def rehacer_hash(email, id_, anterior, password):
+        """Rehace en segundo plano un hash con parámetros antiguos; el login no lo espera."""
+        try:
+            futuro = hasher.submit(password)
+        except HashingBusy:
+            return  # se intentará en el próximo login
+
+        def guardar(f):
+            if not f.cancelled() and f.exception() is None:
+                store.actualizar_password(email, id_, anterior, f.result()[0])
+                metricas.inc(rehashes)
+        futuro.add_done_callback(guardar)
+
+    @app.route('/login', methods=['POST'])
+    def login():
+        try:
+            data = request.get_json(force=True)
+        except BadRequest:
+            metricas.inc(logins_total, "bad_request")
+            return jsonify({"status": "error", "message": "❌ Invalid request format"}), 400
+
+        email = data.get("email", "").strip()
+        password = data.get("password", "").strip()
+        credenciales = store.credenciales(email)
+        if credenciales is None:
+            metricas.inc(logins_total, "unknown_email")
+            return jsonify({"status": "error", "message": "❌ Email not registered"}), 400
+
+        id_, guardado = credenciales
+        try:
+            correcta = hasher.check(guardado, password, timeout=app.config["HASH_TIMEOUT"])
+        except (HashingBusy, TimeoutError):
+            metricas.inc(logins_total, "busy")
+            return servidor_ocupado()
+        if not correcta:
+            metricas.inc(logins_total, "invalid_credentials")
+            return jsonify({"status": "error", "message": "❌ Invalid credentials"}), 400
+
+        if politica.necesita_rehash(guardado):
+            rehacer_hash(email, id_, guardado, password)
+        metricas.inc(logins_total, "success")
+        return jsonify({"status": "success", "message": "✅ Login successful!"})
+
+    @app.route('/users')
+    def list_users():
+        shards = len(store.shards)
+        prefijo = request.args.get("email_prefix", "").strip().lower() or None
+        try:
+            limite = int(request.args.get("limit", USERS_PAGE_SIZE))
+            if prefijo:
+                # Con prefijo se pagina por email: el cursor es el último email devuelto
+                despues = request.args.get("after") or None
+            else:
+                despues = leer_cursor(request.args.get("after"), shards)
+        except ValueError:
+            limite = 0
+        if not 1 <= limite <= USERS_PAGE_MAX:
+            return jsonify({"status": "error", "message": "❌ Invalid pagination parameters"}), 400
+
+        if request.args.get("format") == "ndjson":
+            # Exportación completa en streaming, por páginas: nunca carga la tabla en memoria
+            def exportar():
+                for fila in store.iterar(despues, prefijo, USERS_EXPORT_CHUNK):
+                    yield json.dumps(usuario_json(fila, shards), ensure_ascii=False) + "\n"
+            return Response(exportar(), mimetype="application/x-ndjson")
+
+        filas = store.listar(despues, prefijo, limite)
+        return jsonify({
+            "status": "success",
+            "users": [usuario_json(fila, shards) for fila in filas],
+            "next_cursor": cursor_de(filas[-1], shards, prefijo) if len(filas) == limite else None,
+        })
+
+    @app.route('/check-email')
+    def check_email():
+        email = request.args.get("email", "").strip()
+        if not validate_email_format(email):
+            return jsonify({"status": "error", "message": "❌ Invalid email format"}), 400
+        if not validate_email_case_insensitive(email):
+            return jsonify({"status": "error", "message": "❌ Email should be lowercase only"}), 400
+        if store.contains(email):
+            return jsonify({"status": "error", "available": False, "message": "❌ Email already registered."})
+        return jsonify({"status": "success", "available": True, "message": "✅ Email is available"})
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        if not metricas.enabled:
+            return jsonify({"status": "error", "message": "❌ Metrics are disabled"}), 404
+        return Response(metricas.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+    @app.route('/metrics/hashing')
+    def hashing_stats():
+        return jsonify({**hasher.stats(), "policy": politica.describe()})
+
     return app
 
 if __name__ == '__main__':
-    app = create_app()
+    app = create_app({"DEBUG": True})
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,263 @@
+"""Usuarios repartidos en N archivos SQLite según un hash del email normalizado.
+
+Con N=1 el único shard es DATABASE tal cual: mismo archivo y mismo comportamiento que
+sin sharding. Con N>1 el shard i vive en `<base>.<i>-of-<N><ext>` (users.0-of-4.db, ...).
+El enrutado es determinista, así que la restricción UNIQUE de cada shard basta para que
+el email sea único en todo el almacén.
+
+Resharding offline (con el servidor detenido):
+    python sharding.py reshard --database users.db --from 1 --to 4
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+from storage import (DEFAULT_PRAGMAS, ConnectionPool, GroupCommitWriter, INSERT_USER, UPDATE_PASSWORD, connect,
+                     crear_esquema, init_db)
+from email_index import EmailIndex
+
+RESHARD_CHUNK = 10000  # filas leídas por tramo al reshardear
+# Nunca se selecciona la columna password. Sin filtro se recorre la clave primaria desde el
+# cursor (id); con prefijo, el índice UNIQUE de email en orden desde el cursor (el último
+# email), así que cada página lee como mucho `limite` filas por shard, sin ordenar el rango.
+SELECT_USERS = "SELECT id, fullname, email FROM users WHERE id > ? ORDER BY id LIMIT ?"
+SELECT_USERS_PREFIX = "SELECT id, fullname, email FROM users WHERE email >= ? AND email < ? ORDER BY email LIMIT ?"
+SELECT_USERS_PREFIX_AFTER = ("SELECT id, fullname, email FROM users WHERE email > ? AND email < ? "
+                             "ORDER BY email LIMIT ?")
+SELECT_CREDENTIALS = "SELECT id, password FROM users WHERE email = ?"
+
+def normalizar(email):
+    return email.strip().lower()
+
+def shard_para(email, shards):
+    """Índice del shard de un email (estable entre procesos y versiones de Python)."""
+    if shards == 1:
+        return 0
+    digest = hashlib.blake2b(normalizar(email).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+def rutas_shards(database, shards):
+    if shards < 1:
+        raise ValueError(f"Number of shards must be at least 1, got {shards}")
+    if shards == 1:
+        return [database]
+    base, ext = os.path.splitext(database)
+    return [f"{base}.{i}-of-{shards}{ext}" for i in range(shards)]
+
+def crear_esquemas(database, shards, pragmas=DEFAULT_PRAGMAS):
+    """Crea el esquema en los `shards` archivos de `database` sin abrir pools ni escritores."""
+    rutas = rutas_shards(database, shards)
+    for ruta in rutas:
+        conn = connect(ruta, pragmas)
+        try:
+            crear_esquema(conn)
+        finally:
+            conn.close()
+    return rutas
+
+class Shard:
+    """Pool de conexiones, escritor con group commit e índice de emails de un archivo."""
+
+    def __init__(self, path, config, shards):
+        self.path = path
+        self.pool = ConnectionPool(path, pragmas=config["SQLITE_PRAGMAS"],
+                                   max_connections=config["DB_POOL_SIZE"])
+        self.writer = GroupCommitWriter(path, pragmas=config["SQLITE_PRAGMAS"],
+                                        max_batch=config["DB_WRITER_MAX_BATCH"],
+                                        max_delay=config["DB_WRITER_MAX_DELAY"])
+        self.email_index = EmailIndex(self.pool,
+                                      capacity=max(1, config["EMAIL_INDEX_CAPACITY"] // shards),
+                                      lru_size=max(1, config["EMAIL_INDEX_LRU_SIZE"] // shards),
+                                      exclusive=not config["DB_MULTIPROCESS"])
+
+class ShardedStore:
+    """Almacén de usuarios detrás de /register: enruta cada email a su shard."""
+
+    def __init__(self, config):
+        n = config["DB_SHARDS"]
+        self.shards = [Shard(path, config, n) for path in rutas_shards(config["DATABASE"], n)]
+
+    def init_db(self, crear=True):
+        """Crea el esquema en cada shard (salvo con crear=False) y carga su índice de emails."""
+        for shard in self.shards:
+            if crear:
+                init_db(shard.pool)
+            shard.email_index.warm()
+
+    def shard(self, email):
+        return self.shards[shard_para(email, len(self.shards))]
+
+    def contains(self, email):
+        return self.shard(email).email_index.contains(email)
+
+    def add(self, email):
+        self.shard(email).email_index.add(email)
+
+    def existing(self, emails):
+        encontrados = set()
+        for shard, grupo in self.agrupar(emails, lambda email: email).items():
+            encontrados |= shard.email_index.existing(grupo)
+        return encontrados
+
+    def agrupar(self, elementos, email):
+        """Reparte `elementos` por shard; `email(elemento)` devuelve su email."""
+        grupos = {}
+        for elemento in elementos:
+            grupos.setdefault(self.shard(email(elemento)), []).append(elemento)
+        return grupos
+
+    def submit(self, fullname, email, password_hash):
+        """Encola el INSERT en el escritor del shard; el Future resuelve a False si el email ya existe."""
+        return self.shard(email).writer.submit(INSERT_USER, (fullname, email, password_hash))
+
+    def credenciales(self, email):
+        """(id, hash de la contraseña) del usuario, o None si el email no está registrado."""
+        with self.shard(email).pool.connection() as conn:
+            return conn.execute(SELECT_CREDENTIALS, (email,)).fetchone()
+
+    def actualizar_password(self, email, id_, anterior, nuevo):
+        """Encola el cambio de hash en el escritor del shard si el guardado sigue siendo `anterior`."""
+        return self.shard(email).writer.submit(UPDATE_PASSWORD, (nuevo, id_, anterior))
+
+    def listar(self, despues=(0, -1), prefijo=None, limite=100):
+        """Página de usuarios en orden (id, shard) posterior al cursor `despues` = (id, shard).
+
+        Con `prefijo` el orden es por email y `despues` es el último email devuelto (o None).
+        Paginación por clave: cada shard lee como mucho `limite` filas desde su índice,
+        sin OFFSET. Devuelve tuplas (id, shard, fullname, email).
+        """
+        if prefijo:
+            return self._listar_por_email(prefijo, despues if isinstance(despues, str) else None, limite)
+        ultimo_id, ultimo_shard = despues
+        filas = []
+        for i, shard in enumerate(self.shards):
+            # Los shards posteriores al del cursor todavía no han devuelto su fila con ese id
+            minimo = ultimo_id - 1 if i > ultimo_shard else ultimo_id
+            with shard.pool.connection() as conn:
+                filas.extend((id_, i, fullname, email)
+                             for id_, fullname, email in conn.execute(SELECT_USERS, (minimo, limite)))
+        filas.sort()
+        return filas[:limite]
+
+    def _listar_por_email(self, prefijo, despues, limite):
+        # Rango en lugar de LIKE, que no usa el índice. El email es único en todo el almacén
+        # (el enrutado es determinista), así que sirve de cursor por sí solo
+        if despues is not None and despues >= prefijo:
+            sql, desde = SELECT_USERS_PREFIX_AFTER, despues
+        else:
+            sql, desde = SELECT_USERS_PREFIX, prefijo
+        filas = []
+        for i, shard in enumerate(self.shards):
+            with shard.pool.connection() as conn:
+                filas.extend((id_, i, fullname, email) for id_, fullname, email
+                             in conn.execute(sql, (desde, prefijo + "\U0010ffff", limite)))
+        filas.sort(key=lambda fila: fila[3])
+        return filas[:limite]
+
+    def iterar(self, despues=(0, -1), prefijo=None, tamano=1000):
+        """Recorre todos los usuarios por páginas de `tamano`; nunca carga la tabla entera
+        ni mantiene abierta una transacción de lectura larga."""
+        while True:
+            pagina = self.listar(despues, prefijo, tamano)
+            yield from pagina
+            if len(pagina) < tamano:
+                return
+            despues = pagina[-1][3] if prefijo else pagina[-1][:2]
+
+    def writer_stats(self):
+        totales = {"queue_depth": 0, "batches": 0, "rows": 0}
+        for shard in self.shards:
+            stats = shard.writer.stats()
+            for clave in totales:
+                totales[clave] += stats[clave]
+        return totales
+
+    def close(self):
+        for shard in self.shards:
+            shard.writer.close()
+            shard.pool.close_all()
+
+def reshard(database, origen, destino, chunk_size=RESHARD_CHUNK):
+    """Copia los usuarios de los `origen` shards de `database` a `destino` shards nuevos.
+
+    Los archivos nuevos se escriben aparte y se renombran al final; los de origen no se
+    tocan (bórralos tras comprobar el resultado y cambiar DB_SHARDS). Los ids se reasignan.
+    """
+    if origen == destino:
+        raise ValueError("Source and target number of shards are the same")
+    fuentes = rutas_shards(database, origen)
+    destinos = rutas_shards(database, destino)
+    faltan = [ruta for ruta in fuentes if not os.path.exists(ruta)]
+    if faltan:
+        raise FileNotFoundError(f"Missing source shard(s): {', '.join(faltan)}")
+    existen = [ruta for ruta in destinos if os.path.exists(ruta)]
+    if existen:
+        raise FileExistsError(f"Target shard(s) already exist: {', '.join(existen)}")
+
+    temporales = [ruta + ".tmp" for ruta in destinos]
+    conexiones = []
+    for temporal in temporales:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        conn = sqlite3.connect(temporal)
+        crear_esquema(conn)
+        conexiones.append(conn)
+
+    copiados = omitidos = 0
+    try:
+        for fuente in fuentes:
+            src = sqlite3.connect(fuente)
+            try:
+                cursor = src.execute("SELECT fullname, email, password FROM users ORDER BY id")
+                while True:
+                    filas = cursor.fetchmany(chunk_size)
+                    if not filas:
+                        break
+                    grupos = {}
+                    for fila in filas:
+                        grupos.setdefault(shard_para(fila[1], destino), []).append(fila)
+                    for i, grupo in grupos.items():
+                        antes = conexiones[i].total_changes
+                        conexiones[i].executemany(INSERT_USER.replace("INSERT", "INSERT OR IGNORE", 1), grupo)
+                        insertadas = conexiones[i].total_changes - antes
+                        copiados += insertadas
+                        omitidos += len(grupo) - insertadas
+            finally:
+                src.close()
+        for conn in conexiones:
+            conn.commit()
+    except BaseException:
+        for conn, temporal in zip(conexiones, temporales):
+            conn.close()
+            os.remove(temporal)
+        raise
+    for conn, temporal, ruta in zip(conexiones, temporales, destinos):
+        conn.close()
+        os.replace(temporal, ruta)
+    return {"copied": copiados, "skipped": omitidos, "shards": destinos}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shards SQLite de usuarios")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    cmd = sub.add_parser("reshard", help="reparte una base existente en otro número de shards (offline)")
+    cmd.add_argument("--database", default="users.db", help="valor de DATABASE en la configuración")
+    cmd.add_argument("--from", dest="origen", type=int, default=1, help="número de shards actual")
+    cmd.add_argument("--to", dest="destino", type=int, required=True, help="número de shards nuevo")
+    cmd.add_argument("--chunk-size", type=int, default=RESHARD_CHUNK)
+    args = parser.parse_args(argv)
+
+    try:
+        resultado = reshard(args.database, args.origen, args.destino, args.chunk_size)
+    except (ValueError, FileNotFoundError, FileExistsError) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ {resultado['copied']} usuarios copiados a {len(resultado['shards'])} shards "
+          f"({resultado['skipped']} duplicados omitidos):")
+    for ruta in resultado["shards"]:
+        print(f"  {ruta}")
+    print(f"Arranca la app con DB_SHARDS={args.destino} y borra los archivos anteriores tras comprobarlo.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
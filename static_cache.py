@@ -0,0 +1,130 @@
+"""Archivos de static/ servidos desde memoria, con versiones gzip y brotli precalculadas.
+
+Cada archivo se lee una vez al arrancar; se guarda su versión sin comprimir y, si
+ocupan menos, una gzip y otra brotli (si el paquete `brotli` está instalado). Las
+respuestas negocian Accept-Encoding, llevan un ETag fuerte por representación, responden
+304 a If-None-Match y usan el Cache-Control configurado. Con `check_changes` (modo
+debug) se comprueba la fecha y el tamaño del archivo en cada petición y se recarga si cambió.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se sirve gzip
+    brotli = None
+
+# Preferencia del servidor cuando el cliente acepta varias codificaciones con el mismo q
+CODIFICACIONES = ("br", "gzip")
+
+class _Archivo:
+    __slots__ = ("mimetype", "variantes", "firma")
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            datos = f.read()
+        estado = os.stat(path)
+        self.firma = (estado.st_mtime_ns, estado.st_size)
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if mimetype.startswith("text/") or mimetype in ("application/javascript", "application/json"):
+            mimetype += "; charset=utf-8"
+        self.mimetype = mimetype
+        etiqueta = hashlib.sha256(datos).hexdigest()[:32]
+        # codificación -> (cuerpo, ETag); la identidad siempre está
+        self.variantes = {"identity": (datos, f'"{etiqueta}"')}
+        comprimidos = {"gzip": gzip.compress(datos, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            comprimidos["br"] = brotli.compress(datos, quality=11)
+        for codificacion, cuerpo in comprimidos.items():
+            if len(cuerpo) < len(datos):
+                self.variantes[codificacion] = (cuerpo, f'"{etiqueta}-{codificacion}"')
+
+def elegir_codificacion(accept_encoding, disponibles):
+    """Codificación preferida según Accept-Encoding (con valores q) entre las disponibles."""
+    aceptadas = {}
+    for parte in (accept_encoding or "").split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        nombre = nombre.strip().lower()
+        if not nombre:
+            continue
+        q = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                q = float(parametros[2:])
+            except ValueError:
+                q = 0.0
+        aceptadas[nombre] = q
+    mejor, mejor_q = "identity", 0.0
+    for codificacion in CODIFICACIONES:
+        q = aceptadas.get(codificacion, aceptadas.get("*", 0.0))
+        if codificacion in disponibles and q > mejor_q:
+            mejor, mejor_q = codificacion, q
+    return mejor
+
+def _coincide(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Comparación débil, como pide RFC 9110 para If-None-Match
+    return any(candidato.strip().removeprefix("W/") == etag for candidato in if_none_match.split(","))
+
+class StaticCache:
+    def __init__(self, directory, cache_control="public, max-age=3600", check_changes=False):
+        self.directory = os.path.abspath(directory)
+        self.cache_control = cache_control
+        self.check_changes = check_changes
+        self._archivos = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Lee (o vuelve a leer) todos los archivos del directorio."""
+        archivos = {}
+        for raiz, _, nombres in os.walk(self.directory):
+            for nombre in nombres:
+                path = os.path.join(raiz, nombre)
+                relativo = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                archivos[relativo] = _Archivo(path)
+        with self._lock:
+            self._archivos = archivos
+
+    def _archivo(self, nombre):
+        archivo = self._archivos.get(nombre)
+        if not self.check_changes:
+            return archivo
+        path = os.path.join(self.directory, *nombre.split("/"))
+        if not os.path.abspath(path).startswith(self.directory + os.sep):
+            return None
+        try:
+            estado = os.stat(path)
+        except OSError:
+            archivo = None
+        else:
+            if archivo is None or archivo.firma != (estado.st_mtime_ns, estado.st_size):
+                archivo = _Archivo(path)
+        with self._lock:
+            if archivo is None:
+                self._archivos.pop(nombre, None)
+            else:
+                self._archivos[nombre] = archivo
+        return archivo
+
+    def respuesta(self, nombre, accept_encoding=None, if_none_match=None):
+        """Devuelve (status, headers, cuerpo) para `nombre`, o None si no existe."""
+        archivo = self._archivo(nombre)
+        if archivo is None:
+            return None
+        codificacion = elegir_codificacion(accept_encoding, archivo.variantes)
+        cuerpo, etag = archivo.variantes[codificacion]
+        headers = [("ETag", etag), ("Cache-Control", self.cache_control), ("Vary", "Accept-Encoding")]
+        if _coincide(if_none_match, etag):
+            return 304, headers, b""
+        headers.append(("Content-Type", archivo.mimetype))
+        if codificacion != "identity":
+            headers.append(("Content-Encoding", codificacion))
+        return 200, headers, cuerpo
@@ -0,0 +1,254 @@
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+# Pragmas por defecto: WAL permite lectores concurrentes con un escritor y
+# synchronous=NORMAL evita un fsync por commit (seguro en modo WAL).
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,   # milisegundos esperando el bloqueo de escritura
+    "cache_size": -16000,   # negativo = KiB (16 MB por conexión)
+}
+
+INSERT_USER = "INSERT INTO users (fullname, email, password) VALUES (?, ?, ?)"
+# Solo si el hash no cambió desde que se leyó (otro login pudo rehacerlo antes)
+UPDATE_PASSWORD = "UPDATE users SET password = ? WHERE id = ? AND password = ?"
+
+def crear_esquema(conn):
+    """Crea la tabla users si no existe.
+
+    Si ya existe no se escribe nada: la comprobación es una lectura y no toma el bloqueo
+    de escritura, así que arrancar varios procesos sobre la misma base no los serializa.
+    """
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users'").fetchone():
+        return
+    conn.execute("""CREATE TABLE IF NOT EXISTS users (
+                        id INTEGER PRIMARY KEY,
+                        fullname TEXT NOT NULL,
+                        email TEXT UNIQUE NOT NULL,
+                        password TEXT NOT NULL)""")
+    conn.commit()
+
+def init_db(pool):
+    with pool.connection() as conn:
+        crear_esquema(conn)
+
+def connect(path, pragmas=None):
+    """Abre una conexión SQLite y aplica los pragmas indicados."""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    for nombre, valor in (pragmas or {}).items():
+        conn.execute(f"PRAGMA {nombre}={valor}")
+    return conn
+
+class ConnectionPool:
+    """Pool acotado de conexiones SQLite reutilizables entre peticiones."""
+
+    def __init__(self, path, pragmas=None, max_connections=16, timeout=10.0):
+        self.path = path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._libres = queue.LifoQueue()
+        self._creadas = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._creadas < self.max_connections:
+                self._creadas += 1
+                crear = True
+            else:
+                crear = False
+        if crear:
+            try:
+                return connect(self.path, self.pragmas)
+            except Exception:
+                with self._lock:
+                    self._creadas -= 1
+                raise
+        try:
+            return self._libres.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("No free SQLite connection in the pool") from None
+
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._libres.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Presta una conexión del pool y la devuelve al terminar el bloque."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close_all(self):
+        """Cierra las conexiones libres del pool."""
+        while True:
+            try:
+                conn = self._libres.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._creadas -= 1
+
+_FIN = object()
+
+class GroupCommitWriter:
+    """Escritor único que agrupa los INSERT de muchas peticiones en una sola transacción.
+
+    Los hilos de petición encolan (sql, params) y reciben un Future que resuelve a True
+    si la fila se escribió o False si violó una restricción (p. ej. email duplicado).
+    El hilo escritor hace commit cuando junta ``max_batch`` filas o cuando pasan
+    ``max_delay`` segundos desde la primera; los Futures se resuelven después del
+    commit, así que la durabilidad vista por el cliente es la misma que con un commit
+    por petición.
+    """
+
+    def __init__(self, path, pragmas=None, max_batch=256, max_delay=0.002):
+        self.path = path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # Cola del hilo escritor vivo (None si no hay ninguno). La comparten este objeto y el
+        # hilo, que no guarda referencia a self para que finalize funcione
+        self._estado = {"cola": None}
+        self._hilo = None
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "rows": 0, "largest_batch": 0}
+        weakref.finalize(self, _detener, self._estado)
+
+    def submit(self, sql, params):
+        """Encola una escritura y devuelve un Future con True (escrita) o False (restricción violada)."""
+        futuro = Future()
+        # Bajo el lock: un escritor que muere se da de baja con el mismo lock antes de vaciar su
+        # cola, así que cada fila cae en la cola de un hilo que la escribirá o la fallará
+        with self._lock:
+            cola = self._estado["cola"]
+            if cola is None:
+                # El hilo se crea al primer uso, y de nuevo si murió (p. ej. no pudo abrir la base)
+                cola = self._estado["cola"] = queue.SimpleQueue()
+                self._hilo = threading.Thread(
+                    target=_escribir, name="sqlite-group-commit", daemon=True,
+                    args=(self._estado, self._lock, cola, self.path, self.pragmas, self.max_batch,
+                          self.max_delay, self._stats))
+                self._hilo.start()
+            cola.put((sql, params, futuro))
+        return futuro
+
+    def execute(self, sql, params, timeout=None):
+        """Como submit, pero espera a que la transacción que incluye la fila haga commit."""
+        return self.submit(sql, params).result(timeout=timeout)
+
+    def stats(self):
+        lotes = self._stats["batches"]
+        cola = self._estado["cola"]
+        return {
+            "queue_depth": cola.qsize() if cola is not None else 0,
+            "batches": lotes,
+            "rows": self._stats["rows"],
+            "largest_batch": self._stats["largest_batch"],
+            "avg_batch": round(self._stats["rows"] / lotes, 2) if lotes else 0.0,
+        }
+
+    def close(self):
+        """Escribe lo pendiente y detiene el hilo escritor."""
+        with self._lock:
+            hilo, self._hilo = self._hilo, None
+            cola, self._estado["cola"] = self._estado["cola"], None
+            if cola is not None:
+                cola.put(_FIN)
+        if hilo is not None:
+            hilo.join()
+
+def _detener(estado):
+    cola = estado["cola"]
+    if cola is not None:
+        cola.put(_FIN)
+
+def _escribir(estado, lock, cola, path, pragmas, max_batch, max_delay, stats):
+    conn = None
+    lote = []
+    try:
+        conn = connect(path, pragmas)
+        terminar = False
+        while not terminar:
+            elemento = cola.get()
+            if elemento is _FIN:
+                break
+            lote = [elemento]
+            limite = time.monotonic() + max_delay
+            while len(lote) < max_batch:
+                restante = limite - time.monotonic()
+                try:
+                    elemento = cola.get(timeout=restante) if restante > 0 else cola.get_nowait()
+                except queue.Empty:
+                    break
+                if elemento is _FIN:
+                    terminar = True
+                    break
+                lote.append(elemento)
+            _confirmar(conn, lote, stats)
+            lote = []
+    except Exception as e:
+        # El hilo termina. Primero se da de baja: desde aquí ningún submit encola en `cola` y el
+        # siguiente arranca otro escritor. Luego falla lo que tenía en mano y lo ya encolado
+        with lock:
+            if estado["cola"] is cola:
+                estado["cola"] = None
+        for _, _, futuro in lote:
+            if not futuro.done():
+                futuro.set_exception(e)
+        _fallar_pendientes(cola, e)
+    finally:
+        if conn is not None:
+            conn.close()
+
+def _fallar_pendientes(cola, error):
+    while True:
+        try:
+            elemento = cola.get_nowait()
+        except queue.Empty:
+            return
+        if elemento is _FIN:
+            return
+        if elemento[2].set_running_or_notify_cancel():
+            elemento[2].set_exception(error)
+
+def _confirmar(conn, lote, stats):
+    # Las peticiones canceladas mientras esperaban no se escriben
+    lote = [elemento for elemento in lote if elemento[2].set_running_or_notify_cancel()]
+    resultados = []
+    try:
+        for sql, params, _ in lote:
+            try:
+                conn.execute(sql, params)
+                resultados.append(True)
+            except sqlite3.IntegrityError:
+                # Solo se deshace esta sentencia; el resto de la transacción sigue en pie
+                resultados.append(False)
+        conn.commit()
+    except Exception as e:
+        if conn.in_transaction:
+            conn.rollback()
+        for _, _, futuro in lote:
+            futuro.set_exception(e)
+        return
+    stats["batches"] += 1
+    stats["rows"] += len(lote)
+    stats["largest_batch"] = max(stats["largest_batch"], len(lote))
+    for (_, _, futuro), escrita in zip(lote, resultados):
+        futuro.set_result(escrita)
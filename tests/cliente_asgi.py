@@ -0,0 +1,39 @@
+"""Cliente síncrono para probar asgi_server.py, con la misma interfaz básica que app.test_client() de Flask."""
+import asyncio
+import json
+from asgi_server import llamar
+
+class RespuestaPrueba:
+    def __init__(self, status_code, headers, data):
+        self.status_code = status_code
+        self.headers = {clave.decode("latin-1").lower(): valor.decode("latin-1") for clave, valor in headers}
+        self.data = data
+
+    @property
+    def json(self):
+        return json.loads(self.data)
+
+    def get_json(self):
+        return self.json
+
+class ClientePrueba:
+    def __init__(self, app):
+        self.app = app
+
+    def _peticion(self, metodo, ruta, cuerpo=b"", headers=()):
+        ruta, _, query = ruta.partition("?")
+        return RespuestaPrueba(*asyncio.run(llamar(self.app, metodo, ruta, cuerpo, query.encode(), headers)))
+
+    def get(self, ruta, headers=None):
+        return self._peticion("GET", ruta, headers=[(clave.lower().encode(), valor.encode("latin-1"))
+                                                    for clave, valor in (headers or {}).items()])
+
+    def post(self, ruta, json=None, data=b"", headers=None):
+        cabeceras = [(clave.lower().encode(), valor.encode("latin-1")) for clave, valor in (headers or {}).items()]
+        if json is not None:
+            return self._peticion("POST", ruta, _dumps(json), [(b"content-type", b"application/json"), *cabeceras])
+        return self._peticion("POST", ruta, data.encode("utf-8") if isinstance(data, str) else data, cabeceras)
+
+def _dumps(datos):
+    # `json` es el nombre del parámetro en post(), como en el test_client de Flask
+    return json.dumps(datos).encode("utf-8")
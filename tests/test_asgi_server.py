@@ -0,0 +1,64 @@
+import pytest
+from asgi_server import create_asgi_app
+from cliente_asgi import ClientePrueba
+# Los escenarios de /register de test_server.py se ejecutan también contra la app ASGI
+# (con el fixture `client` de este módulo)
+from test_server import (  # noqa: F401
+    init_database,
+    test_register_missing_fields,
+    test_register_invalid_email_format,
+    test_register_password_too_common,
+    test_register_password_strength,
+    test_register_email_case_sensitive,
+    test_successful_registration,
+    test_duplicate_email_registration,
+    test_trimmed_input_fields,
+    test_register_sql_injection,
+)
+
+@pytest.fixture
+def app():
+    """Crea una instancia de la aplicación ASGI para pruebas."""
+    app = create_asgi_app({"HASH_EXECUTOR": "thread"})
+    yield app
+    app.close()
+
+@pytest.fixture
+def client(app):
+    return ClientePrueba(app)
+
+def test_serves_form(client):
+    """Sirve el mismo formulario que la app Flask."""
+    response = client.get("/form.html")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert b"/register" in response.data
+
+def test_invalid_json(client):
+    response = client.post("/register", data="{no es json")
+    assert response.status_code == 400
+    assert response.json["message"] == "❌ Invalid request format"
+
+def test_unknown_route_and_method(client):
+    assert client.get("/nada").status_code == 404
+    assert client.get("/register").status_code == 405
+
+def test_check_email(client, init_database):
+    assert client.get("/check-email?email=nuevo@example.com").json["available"] is True
+    client.post("/register", json={"fullname": "Juan Pérez", "email": "nuevo@example.com",
+                                   "password": "Pass1A$X"})
+    assert client.get("/check-email?email=nuevo@example.com").json["available"] is False
+
+def test_returns_503_when_saturated(tmp_path):
+    """Con la cola de hashing llena responde 503 con Retry-After, igual que server.py."""
+    app = create_asgi_app({"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread",
+                           "HASH_WORKERS": 1, "HASH_QUEUE_SIZE": 0})
+    app.hasher._capacidad.acquire()
+    try:
+        response = ClientePrueba(app).post("/register", json={
+            "fullname": "Juan Pérez", "email": "correo@example.com", "password": "Pass1A$X"})
+    finally:
+        app.hasher._capacidad.release()
+        app.close()
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,38 @@
+from blocklist import BlockList, build_index
+from server import create_app
+
+def crear_indice(tmp_path, passwords, **kwargs):
+    lista = tmp_path / "lista.txt"
+    lista.write_text("\n".join(passwords) + "\n", encoding="utf-8")
+    indice = tmp_path / "blocklist.idx"
+    build_index(str(lista), str(indice), **kwargs)
+    return str(indice)
+
+def test_lookup_hits_and_misses(tmp_path):
+    """Encuentra las contraseñas de la lista (sin distinguir mayúsculas) y no otras."""
+    passwords = [f"clave{i}" for i in range(2000)] + ["Summer2024!"]
+    # chunk_size pequeño para forzar la mezcla de varios tramos ordenados
+    blocklist = BlockList(crear_indice(tmp_path, passwords + ["clave1"], chunk_size=300))
+    assert len(blocklist) == 2001
+    assert "clave1999" in blocklist
+    assert "SUMMER2024!" in blocklist
+    assert "NoEstaEnLaLista1!" not in blocklist
+    blocklist.close()
+
+def test_empty_list(tmp_path):
+    blocklist = BlockList(crear_indice(tmp_path, []))
+    assert len(blocklist) == 0
+    assert "Pass1A$X" not in blocklist
+    blocklist.close()
+
+def test_register_rejects_breached_password(tmp_path):
+    """/register rechaza contraseñas de la lista configurada."""
+    indice = crear_indice(tmp_path, ["Pass1A$X"])
+    app = create_app({"DATABASE": str(tmp_path / "users.db"), "BREACHED_PASSWORDS_INDEX": indice})
+    response = app.test_client().post('/register', json={
+        "fullname": "Juan Pérez",
+        "email": "correo@example.com",
+        "password": "Pass1A$X"
+    })
+    assert response.status_code == 400
+    assert "❌ Password is too common" in response.json["message"]
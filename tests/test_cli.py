@@ -0,0 +1,92 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import pytest
+import cli
+from server import create_app
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PESADOS = ("flask", "selenium", "requests", "openpyxl")
+# Tope de arranque por subcomando (ms importando sus módulos, medido en un proceso nuevo).
+# Holgado para no fallar en máquinas lentas: detecta que un import pesado vuelve a colarse,
+# no pequeñas variaciones. Referencia local: serve ~200 ms, bench ~100 ms, el resto ~30 ms.
+TOPE_MS = {"serve": 3000, "serve --workers": 3000, "bench": 2000, "run-sheet": 1000, "validate-report": 1000, "init-db": 1000}
+# Subcomandos que no deben cargar ninguno de los módulos pesados
+LIGEROS = ("run-sheet", "validate-report", "init-db")
+
+def _en_proceso_nuevo(codigo):
+    """Ejecuta `codigo` en un intérprete nuevo desde la raíz y devuelve el JSON que imprime."""
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(salida.splitlines()[-1])
+
+def _medir(subcomando):
+    return _en_proceso_nuevo(f"""
+import json, sys, time
+inicio = time.perf_counter()
+import cli
+cli_ms = (time.perf_counter() - inicio) * 1000
+cli.cargar({subcomando!r})
+total_ms = (time.perf_counter() - inicio) * 1000
+print(json.dumps({{"cli_ms": cli_ms, "total_ms": total_ms,
+                  "pesados": [m for m in {PESADOS!r} if m in sys.modules]}}))
+""")
+
+@pytest.mark.parametrize("subcomando", sorted(cli.MODULOS))
+def test_tiempo_de_arranque_por_subcomando(subcomando, capsys):
+    """Informa los ms de arranque de cada subcomando y falla si supera su tope o carga módulos pesados."""
+    datos = _medir(subcomando)
+    with capsys.disabled():
+        print(f"\n  arranque {subcomando:<16} {datos['total_ms']:8.1f} ms (cli.py {datos['cli_ms']:.1f} ms)"
+              f"  pesados: {', '.join(datos['pesados']) or '-'}")
+    assert datos["total_ms"] < TOPE_MS[subcomando]
+    if subcomando in LIGEROS:
+        assert datos["pesados"] == []
+
+def test_importar_cli_no_carga_nada_pesado():
+    datos = _en_proceso_nuevo(f"""
+import json, sys
+import cli
+print(json.dumps([m for m in sys.modules if m.split(".")[0] in {PESADOS + ("server", "selenium_runner")!r}]))
+""")
+    assert datos == []
+
+def test_validate_report_sin_servidor_ni_navegador(tmp_path):
+    """validate-report escribe el detalle por validador sin importar Flask, selenium ni requests."""
+    entrada = tmp_path / "datos.csv"
+    entrada.write_text("Full Name,Email,Password,Confirm Password,Expected Outcome\n"
+                       "Juan Pérez,juan@example.com,Pass1A$X,Pass1A$X,Registration successful\n"
+                       "Ana,ana@example,abc,abd,Invalid\n", encoding="utf-8")
+    salida = tmp_path / "detalle.csv"
+    pesados = _en_proceso_nuevo(f"""
+import json, sys
+import cli
+assert cli.main(["validate-report", {str(entrada)!r}, "--output", {str(salida)!r}]) == 0
+print(json.dumps([m for m in {PESADOS!r} if m in sys.modules]))
+""")
+    assert pesados == []
+    lineas = salida.read_text(encoding="utf-8-sig").splitlines()
+    assert len(lineas) == 3
+    assert "❌" not in lineas[1] and "❌" in lineas[2]
+
+def test_init_db_una_vez_y_app_sin_init(tmp_path, capsys):
+    """init-db crea el esquema de todos los shards; la app con INIT_DB=False lo usa sin recrearlo."""
+    database = str(tmp_path / "users.db")
+    assert cli.main(["init-db", "--database", database, "--shards", "2"]) == 0
+    assert "2 shard(s)" in capsys.readouterr().out
+    for i in range(2):
+        conn = sqlite3.connect(str(tmp_path / f"users.{i}-of-2.db"))
+        assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == [("users",)]
+        conn.close()
+
+    client = create_app({"DATABASE": database, "DB_SHARDS": 2, "INIT_DB": False,
+                         "HASH_EXECUTOR": "thread"}).test_client()
+    response = client.post("/register", json={"fullname": "Juan Pérez", "email": "juan@example.com",
+                                               "password": "Pass1A$X"})
+    assert response.json["message"] == "✅ Registration successful!"
+
+def test_argumentos_desconocidos():
+    with pytest.raises(SystemExit):
+        cli.main(["init-db", "--no-existe"])
@@ -0,0 +1,62 @@
+from bloom import BloomFilter
+from email_index import EmailIndex
+from storage import ConnectionPool
+
+def crear_tabla(pool, emails):
+    with pool.connection() as conn:
+        conn.execute("""CREATE TABLE users (
+                            id INTEGER PRIMARY KEY,
+                            fullname TEXT NOT NULL,
+                            email TEXT UNIQUE NOT NULL,
+                            password TEXT NOT NULL)""")
+        conn.executemany("INSERT INTO users (fullname, email, password) VALUES ('Juan', ?, 'x')",
+                         [(e,) for e in emails])
+        conn.commit()
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    emails = [f"user{i}@example.com" for i in range(1000)]
+    for email in emails:
+        bloom.add(email)
+    assert all(email in bloom for email in emails)
+    falsos = sum(f"otro{i}@example.com" in bloom for i in range(10000))
+    assert falsos < 300  # ~1 % esperado
+
+def test_email_index_warms_from_table(tmp_path):
+    """El índice conoce los emails existentes y los nuevos tras add()."""
+    pool = ConnectionPool(str(tmp_path / "users.db"))
+    crear_tabla(pool, ["juan@example.com", "ana@example.com"])
+    index = EmailIndex(pool, capacity=10)
+    index.warm()
+    assert index.contains("juan@example.com")
+    assert not index.contains("nuevo@example.com")
+    index.add("nuevo@example.com")
+    assert index.contains("nuevo@example.com")
+    assert index.existing(["ana@example.com", "otro@example.com", "nuevo@example.com"]) == {
+        "ana@example.com", "nuevo@example.com"}
+
+def test_email_index_grows_past_capacity(tmp_path):
+    """Al superar la capacidad el filtro se reconstruye sin perder emails."""
+    pool = ConnectionPool(str(tmp_path / "users.db"))
+    crear_tabla(pool, [f"user{i}@example.com" for i in range(20)])
+    index = EmailIndex(pool, capacity=4)
+    index.warm()
+    for i in range(20, 30):
+        index.add(f"user{i}@example.com")
+    assert index.capacity >= 20
+    assert all(index.contains(f"user{i}@example.com") for i in range(20))
+
+def test_email_index_not_exclusive_sees_other_writers(tmp_path):
+    """Con exclusive=False, un email insertado por otro proceso se detecta aunque el filtro no lo tenga."""
+    pool = ConnectionPool(str(tmp_path / "users.db"))
+    crear_tabla(pool, [])
+    exclusivo = EmailIndex(pool, capacity=10)
+    compartido = EmailIndex(pool, capacity=10, exclusive=False)
+    exclusivo.warm()
+    compartido.warm()
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO users (fullname, email, password) VALUES ('Ana', 'ana@example.com', 'x')")
+        conn.commit()
+    assert not exclusivo.contains("ana@example.com")
+    assert compartido.contains("ana@example.com")
+    assert compartido.existing(["ana@example.com", "otro@example.com"]) == {"ana@example.com"}
@@ -0,0 +1,51 @@
+from werkzeug.security import check_password_hash
+from hashing import HashingExecutor, HashingBusy
+from server import create_app
+
+def test_hash_in_process_pool():
+    """El hash calculado en el pool de procesos es verificable."""
+    hasher = HashingExecutor(workers=1, queue_size=1, kind="process")
+    hashed = hasher.hash("Pass1A$X", timeout=30)
+    # Los workers no se crean con fork desde un proceso con hilos
+    assert hasher._executor._mp_context.get_start_method() in ("forkserver", "spawn")
+    hasher.shutdown()
+    assert check_password_hash(hashed, "Pass1A$X")
+    stats = hasher.stats()
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+
+def test_full_queue_fails_fast():
+    """Con la cola llena, hash() rechaza en vez de esperar."""
+    hasher = HashingExecutor(workers=1, queue_size=0, kind="thread")
+    hasher._capacidad.acquire()  # ocupamos la única plaza
+    try:
+        try:
+            hasher.hash("Pass1A$X")
+            assert False, "Se esperaba HashingBusy"
+        except HashingBusy:
+            pass
+    finally:
+        hasher._capacidad.release()
+    assert hasher.stats()["rejected"] == 1
+    hasher.shutdown()
+
+def test_register_returns_503_when_saturated(tmp_path):
+    """/register responde 503 con Retry-After cuando el pool de hashing está saturado."""
+    app = create_app({"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread",
+                      "HASH_WORKERS": 1, "HASH_QUEUE_SIZE": 0, "HASH_RETRY_AFTER": 2})
+    hasher = app.extensions["hasher"]
+    hasher._capacidad.acquire()
+    try:
+        response = app.test_client().post('/register', json={
+            "fullname": "Juan Pérez",
+            "email": "correo@example.com",
+            "password": "Pass1A$X"
+        })
+    finally:
+        hasher._capacidad.release()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+
+    stats = app.test_client().get('/metrics/hashing').json
+    assert stats["rejected"] == 1
+    assert stats["queue_depth"] == 0
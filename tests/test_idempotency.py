@@ -0,0 +1,194 @@
+import threading
+import time
+import pytest
+from asgi_server import create_asgi_app
+from cliente_asgi import ClientePrueba
+from idempotency import IdempotencyConflict, IdempotencyStore, huella
+from server import create_app
+
+REGISTRO = {"fullname": "Juan Pérez", "email": "juan@example.com", "password": "Pass1A$X"}
+
+def _contar_hashes(hasher, espera=None):
+    """Envuelve hasher.hash para contar las llamadas (y, opcionalmente, bloquearlas hasta un evento)."""
+    llamadas = []
+    original = hasher.hash
+
+    def hash_contado(password, timeout=None):
+        llamadas.append(password)
+        if espera is not None:
+            espera.wait(5)
+        return original(password, timeout=timeout)
+
+    hasher.hash = hash_contado
+    return llamadas
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread"})
+    yield app
+    app.extensions["user_store"].close()
+    app.extensions["idempotency"].close()
+
+def test_reintento_repite_la_respuesta_sin_rehacer_el_trabajo(app):
+    llamadas = _contar_hashes(app.extensions["hasher"])
+    client = app.test_client()
+    primera = client.post("/register", json=REGISTRO, headers={"Idempotency-Key": "clave-1"})
+    segunda = client.post("/register", json=REGISTRO, headers={"Idempotency-Key": "clave-1"})
+    assert primera.json["message"] == "✅ Registration successful!"
+    # Sin la clave sería "Email already registered": el reintento recibe la respuesta original
+    assert segunda.json == primera.json
+    assert segunda.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in primera.headers
+    assert len(llamadas) == 1
+    metricas = client.get("/metrics").get_data(as_text=True)
+    assert 'register_idempotency_total{outcome="replayed"} 1' in metricas
+
+def test_sin_clave_no_cambia_nada(app):
+    client = app.test_client()
+    assert client.post("/register", json=REGISTRO).json["message"] == "✅ Registration successful!"
+    assert client.post("/register", json=REGISTRO).json["message"] == "❌ Email already registered."
+
+def test_clave_con_otro_cuerpo_o_invalida(app):
+    client = app.test_client()
+    client.post("/register", json=REGISTRO, headers={"Idempotency-Key": "clave-1"})
+    otro = {**REGISTRO, "email": "otro@example.com"}
+    response = client.post("/register", json=otro, headers={"Idempotency-Key": "clave-1"})
+    assert response.status_code == 422
+    assert response.json["message"] == "❌ Idempotency-Key was already used with a different request"
+    response = client.post("/register", json=otro, headers={"Idempotency-Key": "x" * 300})
+    assert response.status_code == 400
+    assert response.json["message"] == "❌ Invalid Idempotency-Key header"
+
+def test_peticiones_concurrentes_se_agrupan(app):
+    """Varias peticiones simultáneas con la misma clave: una registra y las demás esperan su respuesta."""
+    liberar = threading.Event()
+    llamadas = _contar_hashes(app.extensions["hasher"], liberar)
+    respuestas = []
+
+    def enviar():
+        respuestas.append(app.test_client().post("/register", json=REGISTRO,
+                                                 headers={"Idempotency-Key": "concurrente"}))
+
+    hilos = [threading.Thread(target=enviar) for _ in range(5)]
+    for hilo in hilos:
+        hilo.start()
+    # Todas llegan mientras la primera sigue hasheando
+    limite = time.monotonic() + 5
+    while not llamadas and time.monotonic() < limite:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    liberar.set()
+    for hilo in hilos:
+        hilo.join()
+
+    assert len(llamadas) == 1
+    assert [r.json["message"] for r in respuestas] == ["✅ Registration successful!"] * 5
+    assert sum(r.headers.get("Idempotent-Replayed") == "true" for r in respuestas) == 4
+
+def test_no_guarda_errores_del_servidor(tmp_path):
+    """Un 503 por saturación no se recuerda: el reintento con la misma clave vuelve a intentarlo."""
+    app = create_app({"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread",
+                      "HASH_WORKERS": 1, "HASH_QUEUE_SIZE": 0})
+    client = app.test_client()
+    hasher = app.extensions["hasher"]
+    hasher._capacidad.acquire()
+    try:
+        assert client.post("/register", json=REGISTRO, headers={"Idempotency-Key": "k"}).status_code == 503
+    finally:
+        hasher._capacidad.release()
+    response = client.post("/register", json=REGISTRO, headers={"Idempotency-Key": "k"})
+    assert response.json["message"] == "✅ Registration successful!"
+    assert "Idempotent-Replayed" not in response.headers
+    app.extensions["user_store"].close()
+
+def test_sqlite_sobrevive_a_un_reinicio(tmp_path):
+    config = {"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread",
+              "IDEMPOTENCY_DATABASE": str(tmp_path / "idempotency.db")}
+    primera = create_app(config)
+    primera.test_client().post("/register", json=REGISTRO, headers={"Idempotency-Key": "k"})
+    primera.extensions["idempotency"].close()
+
+    segunda = create_app(config)
+    llamadas = _contar_hashes(segunda.extensions["hasher"])
+    response = segunda.test_client().post("/register", json=REGISTRO, headers={"Idempotency-Key": "k"})
+    assert response.json["message"] == "✅ Registration successful!"
+    assert response.headers["Idempotent-Replayed"] == "true"
+    assert llamadas == []
+    segunda.extensions["idempotency"].close()
+
+def test_caducidad_y_limite_de_claves(monkeypatch):
+    store = IdempotencyStore(ttl=10, max_keys=2)
+    ahora = [1000.0]
+    monkeypatch.setattr("idempotency.time.time", lambda: ahora[0])
+    respuesta = (200, [("Content-Type", "application/json")], b"{}")
+    for clave in ("a", "b", "c"):
+        store.ejecutar(clave, huella(clave), lambda: respuesta)
+    # "a" salió del LRU; "c" sigue guardada
+    assert store.ejecutar("a", huella("otra"), lambda: respuesta) == (respuesta, False)
+    assert store.ejecutar("c", huella("c"), lambda: respuesta) == (respuesta, True)
+    with pytest.raises(IdempotencyConflict):
+        store.reservar("c", huella("otra"))
+    ahora[0] += 11
+    assert store.ejecutar("c", huella("otra"), lambda: respuesta) == (respuesta, False)
+
+def test_reserva_en_sqlite_entre_procesos(tmp_path):
+    """Dos stores sobre la misma base (como dos workers de prefork): uno hace el trabajo y el otro
+    espera su respuesta; y si ambos llegan a hacerlo, la primera respuesta guardada gana."""
+    path = str(tmp_path / "idempotency.db")
+    exito = (200, [("Content-Type", "application/json")], b'{"status": "success"}')
+    duplicado = (200, [("Content-Type", "application/json")], b'{"status": "error"}')
+    a, b = IdempotencyStore(path=path), IdempotencyStore(path=path)
+    try:
+        futuro_a, propia_a = a.reservar("k", huella("x"))
+        futuro_b, propia_b = b.reservar("k", huella("x"))
+        assert (propia_a, propia_b) == (True, False)
+        with pytest.raises(IdempotencyConflict):
+            b.reservar("k", huella("otra"))
+        a.completar("k", exito)
+        assert futuro_b.result(timeout=5) == exito
+
+        # Reserva caducada (su dueño parecía muerto): los dos trabajan y termina último el perdedor
+        a.reservation_ttl = -1
+        a.reservar("k2", huella("x"))
+        _, propia_b = b.reservar("k2", huella("x"))
+        assert propia_b
+        assert a.completar("k2", exito) == exito
+        assert b.completar("k2", duplicado) == exito
+        assert IdempotencyStore(path=path).ejecutar("k2", huella("x"), lambda: duplicado) == (exito, True)
+
+        # Si el dueño falla, la reserva se libera y quien esperaba puede reintentar
+        a.reservation_ttl = 60
+        a.reservar("k3", huella("x"))
+        futuro_b, _ = b.reservar("k3", huella("x"))
+        a.fallar("k3", RuntimeError("falló"))
+        with pytest.raises(TimeoutError):
+            futuro_b.result(timeout=5)
+        assert b.ejecutar("k3", huella("x"), lambda: exito) == (exito, False)
+    finally:
+        a.close()
+        b.close()
+
+def test_asgi_repite_la_respuesta(tmp_path):
+    app = create_asgi_app({"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread"})
+    client = ClientePrueba(app)
+    # El store puede bloquear en SQLite: nunca se llama desde el hilo del bucle de eventos
+    hilos = []
+    for nombre in ("reservar", "completar"):
+        original = getattr(app.idempotencia, nombre)
+
+        def registrar_hilo(*args, original=original):
+            hilos.append(threading.current_thread())
+            return original(*args)
+
+        setattr(app.idempotencia, nombre, registrar_hilo)
+    try:
+        primera = client.post("/register", json=REGISTRO, headers={"Idempotency-Key": "k"})
+        segunda = client.post("/register", json=REGISTRO, headers={"Idempotency-Key": "k"})
+        conflicto = client.post("/register", json={**REGISTRO, "email": "otro@example.com"},
+                                headers={"Idempotency-Key": "k"})
+    finally:
+        app.close()
+    assert primera.json["message"] == segunda.json["message"] == "✅ Registration successful!"
+    assert segunda.headers["idempotent-replayed"] == "true"
+    assert conflicto.status_code == 422
+    assert len(hilos) == 4 and threading.main_thread() not in hilos
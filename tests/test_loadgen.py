@@ -0,0 +1,37 @@
+from loadgen import GeneradorCargas, cliente_inproceso, ejecutar_carga, formatear_tabla, percentil
+from server import create_app
+
+def test_percentil():
+    valores = list(range(1, 101))
+    assert percentil(valores, 50) == 50
+    assert percentil(valores, 99) == 99
+    assert percentil([], 95) == 0.0
+
+def test_generador_mezcla_tipos():
+    generador = GeneradorCargas(invalid_ratio=0.3, duplicate_ratio=0.3, seed=1)
+    tipos = [generador.siguiente()[0] for _ in range(300)]
+    assert {"valid", "invalid", "duplicate"} == set(tipos)
+    emails = [p["email"] for t, p in (generador.siguiente() for _ in range(50)) if t == "valid"]
+    assert len(emails) == len(set(emails))
+
+def test_carga_en_proceso(tmp_path):
+    """La carga en proceso informa throughput, percentiles y desglose de respuestas."""
+    app = create_app({"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread"})
+    datos = ejecutar_carga(cliente_inproceso(app), clients=3, requests=12,
+                           invalid_ratio=0.5, duplicate_ratio=0.25, seed=7)
+    assert datos["requests"] == 12
+    assert sum(datos["responses"].values()) == 12
+    assert datos["latency_ms"]["p50"] <= datos["latency_ms"]["p99"] <= datos["latency_ms"]["max"]
+    registrados = datos["responses"].get("200 ✅ Registration successful!", 0)
+    assert registrados == datos["sent"]["valid"]
+    assert "Throughput" in formatear_tabla(datos)
+
+def test_carga_asgi(tmp_path):
+    """La misma carga se puede lanzar contra la app ASGI."""
+    from asgi_server import create_asgi_app
+    from loadgen import cliente_asgi
+    app = create_asgi_app({"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread"})
+    datos = ejecutar_carga(cliente_asgi(app), clients=4, requests=8, duplicate_ratio=0.25, seed=3)
+    app.close()
+    assert datos["requests"] == 8
+    assert "200 ✅ Registration successful!" in datos["responses"]
@@ -0,0 +1,64 @@
+import gc
+import threading
+from metrics import Registry
+from server import create_app
+
+def test_histogram_and_counter_render():
+    """El formato de texto incluye buckets acumulados, suma, total y etiquetas escapadas."""
+    registry = Registry()
+    histograma = registry.histogram("latencia_seconds", "Latencia", ("stage",), buckets=(0.1, 1.0))
+    contador = registry.counter("fallas_total", "Fallas", ("reason",))
+    histograma.observe(0.05, "hash")
+    histograma.observe(0.5, "hash")
+    contador.inc('❌ "raro"')
+    texto = registry.render()
+    assert 'latencia_seconds_bucket{stage="hash",le="0.1"} 1' in texto
+    assert 'latencia_seconds_bucket{stage="hash",le="+Inf"} 2' in texto
+    assert 'latencia_seconds_count{stage="hash"} 2' in texto
+    assert 'fallas_total{reason="❌ \\"raro\\""} 1' in texto
+
+def test_metrics_endpoint_reports_register_stages(tmp_path):
+    """/metrics expone etapas, motivos de validación y duplicados de /register."""
+    app = create_app({"DATABASE": str(tmp_path / "users.db")})
+    client = app.test_client()
+    usuario = {"fullname": "Juan Pérez", "email": "correo@example.com", "password": "Pass1A$X"}
+    client.post('/register', json=usuario)
+    client.post('/register', json=usuario)
+    client.post('/register', json={**usuario, "email": "correo@"})
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    texto = response.get_data(as_text=True)
+    assert 'register_stage_duration_seconds_count{stage="hash"} 1' in texto
+    assert 'register_stage_duration_seconds_count{stage="validation"} 3' in texto
+    assert 'register_validation_failures_total{reason="❌ Invalid email format"} 1' in texto
+    assert 'register_duplicate_email_total{source="index"} 1' in texto
+    assert 'register_requests_total{outcome="success"} 1' in texto
+    assert "hashing_queue_depth 0" in texto
+
+def test_metrics_can_be_disabled(tmp_path):
+    app = create_app({"DATABASE": str(tmp_path / "users.db"), "METRICS_ENABLED": False})
+    assert app.test_client().get('/metrics').status_code == 404
+
+def test_fragmentos_de_hilos_terminados_se_suman(tmp_path):
+    """Un hilo por petición (como el servidor con hilos) no deja un fragmento por hilo."""
+    app = create_app({"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread"})
+    metricas = {metrica.name: metrica for metrica in app.extensions["metrics"]._metricas}
+
+    def registrar(i):
+        app.test_client().post('/register', json={"fullname": "Juan Pérez", "email": f"c{i}@",
+                                                  "password": "Pass1A$X"})
+
+    for i in range(200):
+        hilo = threading.Thread(target=registrar, args=(i,))
+        hilo.start()
+        hilo.join()
+    gc.collect()
+
+    for nombre in ("register_stage_duration_seconds", "register_requests_total",
+                   "register_validation_failures_total"):
+        assert len(metricas[nombre]._fragmentos) <= 2
+    assert metricas["register_requests_total"].value("validation_error") == 200
+    assert metricas["register_stage_duration_seconds"].count("validation") == 200
+    texto = app.test_client().get('/metrics').get_data(as_text=True)
+    assert 'register_validation_failures_total{reason="❌ Invalid email format"} 200' in texto
@@ -0,0 +1,89 @@
+import sqlite3
+import time
+from werkzeug.security import check_password_hash, generate_password_hash
+from password_policy import HashPolicy, calibrar_pbkdf2, calibrar_scrypt, parsear
+from server import create_app
+
+def _hash_guardado(database, email):
+    conn = sqlite3.connect(database)
+    fila = conn.execute("SELECT password FROM users WHERE email = ?", (email,)).fetchone()
+    conn.close()
+    return fila[0]
+
+def _esperar_hash(database, email, prefijo, timeout=10):
+    """El rehash se guarda en segundo plano: esperamos a verlo en la base."""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        guardado = _hash_guardado(database, email)
+        if guardado.startswith(prefijo):
+            return guardado
+        time.sleep(0.02)
+    raise AssertionError(f"El hash de {email} no empieza por {prefijo!r}: {guardado[:30]}")
+
+def test_parsear_metodos_de_werkzeug():
+    assert parsear("pbkdf2:sha256:600000") == ("pbkdf2", ("sha256", 600000))
+    assert parsear("pbkdf2:sha256") == ("pbkdf2", ("sha256", 1000000))
+    assert parsear("scrypt:16384:8:2") == ("scrypt", (16384, 8, 2))
+
+def test_calibracion_respeta_los_minimos():
+    """Con un presupuesto imposible se usan los mínimos de la política, no algo más débil."""
+    assert calibrar_pbkdf2(0.000001, minimo=50000) == 50000
+    assert calibrar_scrypt(0.000001, memoria=1024 * 1024, minimo_n=1024) == (1024, 8, 1)
+    # La memoria fija n: 1 MiB con r=8 da n = 1 MiB / (128 · 8)
+    n, r, _ = calibrar_scrypt(1.0, memoria=1024 * 1024, minimo_n=16)
+    assert (n, r) == (1024, 8)
+
+def test_minimos_por_defecto_no_bajan_de_werkzeug():
+    """Por defecto la calibración nunca produce hashes más débiles que los de werkzeug."""
+    from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS
+    from password_policy import MIN_PBKDF2_ITERATIONS, MIN_SCRYPT_N
+    from server import DEFAULT_CONFIG
+    assert MIN_PBKDF2_ITERATIONS >= max(DEFAULT_PBKDF2_ITERATIONS, 600000)
+    assert MIN_SCRYPT_N >= 2 ** 15
+    assert DEFAULT_CONFIG["HASH_MIN_PBKDF2_ITERATIONS"] == MIN_PBKDF2_ITERATIONS
+    assert calibrar_pbkdf2(0.000001) == MIN_PBKDF2_ITERATIONS
+
+def test_calibracion_se_hace_una_vez_por_proceso():
+    politica = HashPolicy.calibrar("pbkdf2", tiempo_ms=5, min_iteraciones=1000)
+    assert politica.method.startswith("pbkdf2:sha256:")
+    assert politica.calibrated_ms is not None
+    assert HashPolicy.calibrar("pbkdf2", tiempo_ms=5, min_iteraciones=1000).method == politica.method
+    assert check_password_hash(generate_password_hash("Pass1A$X", method=politica.method), "Pass1A$X")
+
+def test_necesita_rehash():
+    politica = HashPolicy("pbkdf2:sha256:200000")
+    assert politica.necesita_rehash(generate_password_hash("x", method="pbkdf2:sha256:1000"))
+    assert politica.necesita_rehash("pbkdf2:sha256:150000$sal$hash")
+    assert not politica.necesita_rehash("pbkdf2:sha256:170000$sal$hash")  # dentro de la tolerancia
+    # Más costoso que el objetivo (el valor por defecto anterior): no se debilita
+    assert not politica.necesita_rehash("pbkdf2:sha256:1000000$sal$hash")
+    assert politica.necesita_rehash("pbkdf2:sha512:200000$sal$hash")
+    assert politica.necesita_rehash("scrypt:16384:8:1$sal$hash")
+    assert politica.necesita_rehash("texto plano")
+    scrypt = HashPolicy("scrypt:16384:8:2")
+    assert not scrypt.necesita_rehash("scrypt:16384:8:2$sal$hash")
+    assert not scrypt.necesita_rehash("scrypt:32768:8:2$sal$hash")
+    assert scrypt.necesita_rehash("scrypt:8192:8:4$sal$hash")
+    assert scrypt.necesita_rehash("scrypt:16384:8:1$sal$hash")
+    assert scrypt.necesita_rehash("scrypt:16384:16:2$sal$hash")
+
+def test_login_rehace_hashes_antiguos(tmp_path):
+    """Un login correcto con un hash de parámetros antiguos lo rehace con la política actual."""
+    database = str(tmp_path / "users.db")
+    config = {"DATABASE": database, "HASH_EXECUTOR": "thread"}
+    registro = {"fullname": "Juan Pérez", "email": "juan@example.com", "password": "Pass1A$X"}
+    create_app({**config, "HASH_METHOD": "pbkdf2:sha256:1000"}).test_client().post("/register", json=registro)
+    assert _hash_guardado(database, "juan@example.com").startswith("pbkdf2:sha256:1000$")
+
+    app = create_app({**config, "HASH_METHOD": "scrypt:1024:8:1"})
+    client = app.test_client()
+    response = client.post("/login", json={"email": "juan@example.com", "password": "Otra1A$X"})
+    assert response.json["message"] == "❌ Invalid credentials"
+    assert _hash_guardado(database, "juan@example.com").startswith("pbkdf2:sha256:1000$")
+
+    response = client.post("/login", json={"email": "juan@example.com", "password": "Pass1A$X"})
+    assert response.json["message"] == "✅ Login successful!"
+    nuevo = _esperar_hash(database, "juan@example.com", "scrypt:1024:8:1$")
+    assert check_password_hash(nuevo, "Pass1A$X")
+    assert client.post("/login", json={"email": "juan@example.com", "password": "Pass1A$X"}).status_code == 200
+    assert client.get("/metrics/hashing").json["policy"]["method"] == "scrypt:1024:8:1"
@@ -0,0 +1,86 @@
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="prefork necesita os.fork")
+
+class Servidor:
+    """prefork.py en un proceso aparte; lee su salida en un hilo para no bloquear."""
+
+    def __init__(self, database, workers):
+        self.proceso = subprocess.Popen(
+            [sys.executable, "prefork.py", "--workers", str(workers), "--port", "0",
+             "--database", database, "--graceful-timeout", "5"],
+            cwd=RAIZ, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        self.lineas = queue.Queue()
+        threading.Thread(target=self._leer, daemon=True).start()
+        self.url = self.esperar("Listening on").split()[3]
+        self.workers = [int(self.esperar("started").split()[1]) for _ in range(workers)]
+
+    def _leer(self):
+        for linea in self.proceso.stdout:
+            self.lineas.put(linea.strip())
+
+    def esperar(self, texto, timeout=20):
+        limite = time.monotonic() + timeout
+        while True:
+            linea = self.lineas.get(timeout=max(0.01, limite - time.monotonic()))
+            if texto in linea:
+                return linea
+
+    def post(self, ruta, datos):
+        peticion = urllib.request.Request(self.url + ruta, data=json.dumps(datos).encode(),
+                                          headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(peticion, timeout=10) as respuesta:
+            return json.loads(respuesta.read())
+
+    def get(self, ruta):
+        with urllib.request.urlopen(self.url + ruta, timeout=10) as respuesta:
+            return json.loads(respuesta.read())
+
+@pytest.fixture
+def servidor(tmp_path):
+    servidor = Servidor(str(tmp_path / "users.db"), workers=2)
+    yield servidor
+    if servidor.proceso.poll() is None:
+        servidor.proceso.kill()
+        servidor.proceso.wait()
+
+def _registro(email):
+    return {"fullname": "Juan Pérez", "email": email, "password": "Pass1A$X"}
+
+def test_workers_comparten_socket_y_base(servidor):
+    """Los registros hechos en cualquier worker se ven en todos (el filtro local no basta)."""
+    emails = [f"u{i}@example.com" for i in range(4)]
+    for email in emails:
+        assert servidor.post("/register", _registro(email))["message"] == "✅ Registration successful!"
+    for email in emails:
+        assert servidor.post("/register", _registro(email))["message"] == "❌ Email already registered."
+        assert servidor.get(f"/check-email?email={email}")["available"] is False
+
+def test_reinicia_workers_muertos(servidor):
+    muerto = servidor.workers[0]
+    os.kill(muerto, signal.SIGKILL)
+    assert str(muerto) in servidor.esperar("restarting")
+    nuevo = int(servidor.esperar("started").split()[1])
+    assert nuevo not in servidor.workers
+    assert servidor.post("/register", _registro("tras.reinicio@example.com"))["status"] == "success"
+
+def test_sigterm_apaga_ordenadamente(servidor):
+    """SIGTERM: los workers terminan, lo encolado queda escrito y el maestro sale con 0."""
+    servidor.post("/register", _registro("antes.de.parar@example.com"))
+    servidor.proceso.send_signal(signal.SIGTERM)
+    assert servidor.proceso.wait(timeout=15) == 0
+    servidor.esperar("Server stopped")
+    for pid in servidor.workers:
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
@@ -0,0 +1,85 @@
+import csv
+import random
+import pytest
+import report
+import selenium_runner
+from report import VALIDADORES, generar_reporte
+
+VECTORES = [
+    ("Juan Pérez", "juan@example.com", "Pass1A$X", "Pass1A$X", "Registration successful"),
+    ("Jo", "jo@example.com", "Pass1A$X", "Pass1A$X", "Full Name too short"),
+    ("Ana López", "Ana@Example.com", "abc", "abd", "Invalid"),
+    ("Luis 3", "luis+x@example", "password", "password", "Invalid"),
+    (None, None, None, None, None),
+]
+
+def _hoja(path, filas):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(report.COLUMNAS_ENTRADA)
+        for fila in filas:
+            escritor.writerow(["" if valor is None else valor for valor in fila])
+
+def _leer(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.reader(f))
+
+def _filas(n, seed=3):
+    generador = random.Random(seed)
+    # Muchas repeticiones de pocos vectores, más algunas filas únicas
+    filas = [generador.choice(VECTORES) for _ in range(n)]
+    filas += [(f"Usuario {i}", f"u{i}@example.com", "Pass1A$X", "Pass1A$X", "") for i in range(n // 10)]
+    generador.shuffle(filas)
+    return filas
+
+def _esperado(path):
+    """El reporte fila a fila de antes (fila_detalle), como referencia."""
+    salida = path.parent / "secuencial.csv"
+    with selenium_runner.abrir_lectura(str(path)) as lector, \
+            selenium_runner.abrir_escritura(str(salida), selenium_runner.encabezados_detalle()) as escritor:
+        for fila in lector:
+            escritor.append(selenium_runner.fila_detalle(fila))
+    return _leer(salida)
+
+@pytest.mark.parametrize("workers, memo_size", [(1, 100000), (2, 100000), (2, 3)])
+def test_mismo_reporte_en_el_mismo_orden(tmp_path, monkeypatch, workers, memo_size):
+    """Con memo (grande o casi vacío) y con pool de procesos, el reporte es idéntico al secuencial."""
+    monkeypatch.setattr(report, "MIN_PARALELO", 1)  # fuerza el pool aun con tramos pequeños
+    entrada = tmp_path / "datos.csv"
+    filas = _filas(400)
+    _hoja(entrada, filas)
+    salida = tmp_path / "detalle.csv"
+    stats = generar_reporte(str(entrada), str(salida), workers=workers, chunk_size=37, memo_size=memo_size)
+    assert _leer(salida) == _esperado(entrada)
+    assert stats["rows"] == len(filas)
+    if memo_size > len(filas):
+        assert stats["evaluated"] == len({fila[:4] for fila in filas})
+        assert stats["memo_hits"] == len(filas) - stats["evaluated"]
+
+def test_resumen_en_archivo_aparte(tmp_path):
+    entrada = tmp_path / "datos.csv"
+    _hoja(entrada, [VECTORES[0]] * 3 + [VECTORES[2]])
+    stats = generar_reporte(str(entrada), str(tmp_path / "detalle.csv"), workers=1, resumen=True)
+    assert stats["summary"] == str(tmp_path / "detalle_resumen.csv")
+    resumen = {fila[0]: fila[1:] for fila in _leer(stats["summary"])[1:]}
+    assert list(resumen) == VALIDADORES
+    assert resumen["validate_email_case_insensitive"] == ["3", "1", "4", "75.0"]
+    assert resumen["validate_not_empty"] == ["4", "0", "4", "100.0"]
+
+def test_resumen_como_hoja_xlsx(tmp_path):
+    from openpyxl import Workbook, load_workbook
+    entrada = tmp_path / "datos.xlsx"
+    wb = Workbook()
+    wb.active.append(report.COLUMNAS_ENTRADA)
+    for fila in [VECTORES[0], VECTORES[1], VECTORES[1]]:
+        wb.active.append(list(fila))
+    wb.save(entrada)
+
+    salida = tmp_path / "detalle.xlsx"
+    generar_reporte(str(entrada), str(salida), workers=1, resumen=True)
+    libro = load_workbook(salida)
+    assert libro.sheetnames[1] == "Resumen"
+    detalle = list(libro.worksheets[0].iter_rows(values_only=True))
+    assert len(detalle) == 4
+    resumen = {fila[0]: fila[1:4] for fila in libro["Resumen"].iter_rows(min_row=2, values_only=True)}
+    assert resumen["validate_fullname_length"] == (1, 2, 3)
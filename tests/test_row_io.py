@@ -0,0 +1,25 @@
+import pytest
+from row_io import abrir_lectura, abrir_escritura
+
+ENCABEZADOS = ["Full Name", "Email", "Password", "Confirm Password", "Expected Outcome"]
+FILAS = [
+    ("Juan Pérez", "juan@example.com", "Pass1A$X", "Pass1A$X", "Registration successful"),
+    ("Ana López", None, "Pass1A$X", "Pass1A$X", None),
+]
+
+@pytest.mark.parametrize("extension", [".xlsx", ".csv", ".jsonl", ".parquet"])
+def test_ida_y_vuelta(tmp_path, extension):
+    """Cada formato devuelve la misma cabecera y filas que se escribieron (vacío = None)."""
+    if extension == ".parquet":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / ("datos" + extension))
+    with abrir_escritura(path, ENCABEZADOS) as escritor:
+        for fila in FILAS:
+            escritor.append(fila)
+    with abrir_lectura(path) as lector:
+        assert list(lector.encabezados) == ENCABEZADOS
+        assert [tuple(fila) for fila in lector] == FILAS
+
+def test_formato_no_soportado(tmp_path):
+    with pytest.raises(ValueError):
+        abrir_lectura(str(tmp_path / "datos.xls"))
@@ -0,0 +1,293 @@
+import pytest
+import selenium_runner
+from selenium.common.exceptions import WebDriverException
+
+class NavegadorFalso:
+    """Sustituto mínimo de webdriver.Chrome para probar el reparto de filas."""
+
+    def __init__(self, caidas):
+        self.caidas = caidas
+        self.vivo = True
+
+    @property
+    def title(self):
+        if not self.vivo:
+            raise WebDriverException("session deleted")
+        return "form"
+
+    def quit(self):
+        pass
+
+def test_ejecutar_en_paralelo_mantiene_posiciones_y_reintenta(monkeypatch):
+    """Los resultados vuelven a su fila y una fila cuyo navegador se cae se reintenta."""
+    caidas = {5}
+
+    def procesar_fila(driver, wait, url_form, name, email, password, confirm):
+        if name == "Fila 5" and 5 in caidas:
+            caidas.discard(5)
+            driver.vivo = False
+            raise WebDriverException("chrome not reachable")
+        return f"✅ {name}"
+
+    monkeypatch.setattr(selenium_runner, "procesar_fila", procesar_fila)
+    creados = []
+
+    def crear(headless):
+        creados.append(headless)
+        return NavegadorFalso(caidas)
+
+    filas = [(i, (f"Fila {i}", f"user{i}@example.com", "Pass1A$X", "Pass1A$X")) for i in range(2, 12)]
+    resultados = selenium_runner.ejecutar_en_paralelo(filas, "http://localhost/form.html", 3, crear=crear)
+
+    assert resultados == {i: f"✅ Fila {i}" for i in range(2, 12)}
+    # Un navegador por hilo que llegó a recibir filas (como mucho 3) + 1 reinicio
+    assert 2 <= len(creados) <= 4
+    assert all(creados)
+
+def test_sin_filas_que_procesar_no_abre_navegadores():
+    """Si todas las filas pasan sin procesarse (incompletas o ya en el checkpoint), no se inicia nada."""
+    iniciados = []
+
+    def iniciar():
+        iniciados.append(1)
+        return (lambda datos: datos), (lambda: None)
+
+    resultado = list(selenium_runner.ejecutar_en_orden(((i, None) for i in range(5)), iniciar, workers=3))
+    assert resultado == [(i, None) for i in range(5)]
+    assert iniciados == []
+
+def test_modo_inproceso_escribe_resultados(tmp_path):
+    """El modo inproceso registra cada fila vía create_app y rellena las mismas columnas."""
+    from openpyxl import Workbook, load_workbook
+    entrada = tmp_path / "datos.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Full Name", "Email", "Password", "Confirm Password", "Expected Outcome"])
+    ws.append(["Juan Pérez", "juan@example.com", "Pass1A$X", "Pass1A$X", "Registration successful"])
+    ws.append(["Juan Pérez", "juan@example.com", "Pass1A$X", "Pass1A$X", "Email already registered"])
+    ws.append(["Ana López", "ana@example.com", "Pass1A$X", "Otra1A$X", "Passwords do not match"])
+    ws.append(["Ana López", "Ana@example.com", "Pass1A$X", "Pass1A$X", "Registration successful"])
+    wb.save(entrada)
+
+    selenium_runner.ejecutar_registros(str(entrada), workers=1, modo="inproceso",
+                                       database=str(tmp_path / "users.db"))
+
+    ws = load_workbook(tmp_path / "resultados.xlsx").active
+    filas = list(ws.iter_rows(min_row=2, values_only=True))
+    assert [f[5] for f in filas] == [
+        "✅ Registration successful!",
+        "❌ Email already registered.",
+        "❌ Passwords do not match.",
+        "❌ Email should be lowercase only",
+    ]
+    assert [f[6] for f in filas] == ["✅", "✅", "✅", "❌"]
+    assert (tmp_path / "resultados_detalle_validadores.xlsx").exists()
+
+def test_ejecutar_en_orden_respeta_orden_y_ventana():
+    """Las filas salen en orden y nunca hay más de `ventana` filas en vuelo."""
+    import random
+    import threading
+    import time
+    en_vuelo = []
+    lock = threading.Lock()
+    leidas = [0]
+
+    def filas():
+        for i in range(200):
+            with lock:
+                leidas[0] += 1
+                en_vuelo.append(leidas[0] - salidas[0])
+            yield i, (None if i % 17 == 0 else i)
+
+    def iniciar():
+        def procesar(datos):
+            time.sleep(random.random() / 1000)
+            return datos * 2
+        return procesar, lambda: None
+
+    salidas = [0]
+    resultado = []
+    for clave, valor in selenium_runner.ejecutar_en_orden(filas(), iniciar, workers=4, ventana=8):
+        resultado.append((clave, valor))
+        with lock:
+            salidas[0] += 1
+    assert [c for c, _ in resultado] == list(range(200))
+    assert all(v == (None if c % 17 == 0 else c * 2) for c, v in resultado)
+    assert max(en_vuelo) <= 8 + 1  # la fila recién leída espera su cupo
+
+def test_modo_inproceso_csv_a_jsonl(tmp_path):
+    """La CLI acepta --input/--output en otros formatos sin abrir el diálogo."""
+    import json
+    entrada = tmp_path / "datos.csv"
+    entrada.write_text(
+        "Full Name,Email,Password,Confirm Password,Expected Outcome\n"
+        "Juan Pérez,juan@example.com,Pass1A$X,Pass1A$X,Registration successful\n"
+        "Jo,jo@example.com,Pass1A$X,Pass1A$X,Full Name must be\n",
+        encoding="utf-8")
+    salida = tmp_path / "salida.jsonl"
+    selenium_runner.main(["--input", str(entrada), "--output", str(salida), "--modo", "inproceso",
+                          "--database", str(tmp_path / "users.db")])
+
+    filas = [json.loads(linea) for linea in salida.read_text(encoding="utf-8").splitlines()]
+    assert [f["Resultado del Test"] for f in filas] == [
+        "✅ Registration successful!",
+        "❌ Full Name must be at least 3 characters.",
+    ]
+    assert [f["Coincidencia con Esperado"] for f in filas] == ["✅", "✅"]
+    detalle = (tmp_path / "salida_detalle_validadores.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(detalle[1])["validate_fullname_length"] == "❌"
+
+def test_checkpoint_reanuda_y_solo_procesa_filas_nuevas(tmp_path, monkeypatch):
+    """Al repetir la ejecución se reutilizan los resultados guardados; --force los ignora."""
+    import json
+    enviados = []
+
+    def crear_envio_inproceso(config=None):
+        def enviar(payload):
+            enviados.append(payload["email"])
+            previos = enviados[:-1].count(payload["email"])
+            return "❌ Email already registered." if previos else "✅ Registration successful!"
+        return enviar
+
+    monkeypatch.setattr(selenium_runner, "crear_envio_inproceso", crear_envio_inproceso)
+    entrada = tmp_path / "datos.csv"
+    cabecera = "Full Name,Email,Password,Confirm Password,Expected Outcome\n"
+    filas = ["Juan Pérez,juan@example.com,Pass1A$X,Pass1A$X,Registration successful\n",
+             "Juan Pérez,juan@example.com,Pass1A$X,Pass1A$X,Email already registered\n",
+             "Ana López,ana@example.com,Pass1A$X,Pass1A$X,Registration successful\n"]
+    entrada.write_text(cabecera + "".join(filas), encoding="utf-8")
+    salida = tmp_path / "salida.jsonl"
+    argumentos = ["--input", str(entrada), "--output", str(salida), "--modo", "inproceso"]
+
+    def resultados():
+        return [json.loads(linea)["Resultado del Test"] for linea in salida.read_text(encoding="utf-8").splitlines()]
+
+    selenium_runner.main(argumentos)
+    esperados = ["✅ Registration successful!", "❌ Email already registered.", "✅ Registration successful!"]
+    assert resultados() == esperados
+    assert len(enviados) == 3
+    assert (tmp_path / "datos.checkpoint.sqlite").exists()
+
+    # Sin cambios: ninguna fila se vuelve a enviar y las dos filas idénticas conservan su resultado
+    selenium_runner.main(argumentos)
+    assert len(enviados) == 3
+    assert resultados() == esperados
+
+    # Una fila nueva: solo se envía esa
+    filas.append("Luis Díaz,luis@example.com,Pass1A$X,Pass1A$X,Registration successful\n")
+    entrada.write_text(cabecera + "".join(filas), encoding="utf-8")
+    selenium_runner.main(argumentos)
+    assert enviados[3:] == ["luis@example.com"]
+    assert resultados()[:3] == esperados
+
+    selenium_runner.main(argumentos + ["--force"])
+    assert len(enviados) == 8
+
+def test_checkpoint_no_guarda_errores(tmp_path):
+    from checkpoint import CacheResultados
+    with CacheResultados(str(tmp_path / "c.sqlite"), contexto=("http", "x")) as cache:
+        primera, segunda = cache.clave(("a", "b", "c", "d")), cache.clave(("a", "b", "c", "d"))
+        assert primera != segunda
+        cache.put(primera, "✅ ok")
+    with CacheResultados(str(tmp_path / "c.sqlite"), contexto=("http", "x")) as cache:
+        assert cache.get(cache.clave(("a", "b", "c", "d"))) == "✅ ok"
+    with CacheResultados(str(tmp_path / "c.sqlite"), contexto=("http", "otro")) as cache:
+        assert cache.get(cache.clave(("a", "b", "c", "d"))) is None
+
+def test_checkpoint_cuenta_apariciones_en_sqlite(tmp_path):
+    """Los contadores de filas repetidas van a una tabla TEMP del sidecar."""
+    from checkpoint import CacheResultados
+    with CacheResultados(str(tmp_path / "c.sqlite")) as cache:
+        claves = [cache.clave((str(i % 50), "b", "c", "d")) for i in range(200)]
+        assert len(set(claves)) == 200
+        assert cache._conn.execute("SELECT COUNT(*), MAX(n) FROM apariciones").fetchone() == (50, 4)
+
+def test_checkpoint_no_guarda_errores_del_servidor(tmp_path, monkeypatch):
+    """Un 503 de /register (servidor saturado) se reporta como error y la fila se reintenta después."""
+    import json
+    from hashing import HashingBusy, HashingExecutor
+
+    def ocupado(self, password, timeout=None):
+        raise HashingBusy()
+
+    entrada = tmp_path / "datos.csv"
+    entrada.write_text("Full Name,Email,Password,Confirm Password,Expected Outcome\n"
+                       "Juan Pérez,juan@example.com,Pass1A$X,Pass1A$X,Registration successful\n",
+                       encoding="utf-8")
+    salida = tmp_path / "salida.jsonl"
+    argumentos = ["--input", str(entrada), "--output", str(salida), "--modo", "inproceso",
+                  "--database", str(tmp_path / "users.db")]
+
+    def resultado():
+        return json.loads(salida.read_text(encoding="utf-8").splitlines()[0])["Resultado del Test"]
+
+    with monkeypatch.context() as parche:
+        parche.setattr(HashingExecutor, "hash", ocupado)
+        selenium_runner.main(argumentos)
+    assert resultado() == "Error HTTP 503: ❌ Server is busy, please retry later"
+    selenium_runner.main(argumentos)
+    assert resultado() == "✅ Registration successful!"
+
+class FormularioFalso:
+    """Navegador falso que simula form.html para el modo rápido."""
+
+    def __init__(self, sondeos_hasta_respuesta=2):
+        self.cargas = 0
+        self.cargado = False
+        self.llamadas = 0
+        self.sondeos = sondeos_hasta_respuesta
+        self.pendientes = 0
+        self.mensaje = ""
+
+    def get(self, url):
+        self.cargas += 1
+        self.cargado = True
+
+    def execute_script(self, script, *args):
+        self.llamadas += 1
+        if script == selenium_runner.SCRIPT_MENSAJE:
+            self.pendientes -= 1
+            return self.mensaje if self.pendientes <= 0 else ""
+        if not self.cargado:
+            return None
+        name, email, password, confirm = args
+        if password != confirm:
+            return "❌ Passwords do not match."
+        # Envío válido: la respuesta de /register llega tras unos sondeos
+        self.mensaje = f"✅ {name} "
+        self.pendientes = self.sondeos
+        return ""
+
+def test_modo_rapido_carga_el_formulario_una_vez():
+    """El modo rápido carga form.html una sola vez y usa un script por fila más los sondeos."""
+    driver = FormularioFalso(sondeos_hasta_respuesta=2)
+    url = "http://localhost/form.html"
+    assert selenium_runner.procesar_fila_rapido(driver, None, url, "Ana", "a@x.com", "P1$xyz", "P1$xyz") == "✅ Ana"
+    assert selenium_runner.procesar_fila_rapido(driver, None, url, "Luis", "l@x.com", "P1$xyz", "otra") == \
+        "❌ Passwords do not match."
+    assert selenium_runner.procesar_fila_rapido(driver, None, url, "Eva", None, "P1$xyz", "P1$xyz") == "✅ Eva"
+    assert driver.cargas == 1
+    # fila 1: intento sin página + script + 2 sondeos; fila 2: script; fila 3: script + 2 sondeos
+    assert driver.llamadas == 4 + 1 + 3
+
+def test_tiempo_por_fila_en_resultados(tmp_path):
+    import json
+    entrada = tmp_path / "datos.csv"
+    entrada.write_text("Full Name,Email,Password,Confirm Password,Expected Outcome\n"
+                       "Jo,jo@example.com,Pass1A$X,Pass1A$X,Full Name must be\n", encoding="utf-8")
+    salida = tmp_path / "salida.jsonl"
+    selenium_runner.main(["--input", str(entrada), "--output", str(salida), "--modo", "inproceso",
+                          "--database", str(tmp_path / "users.db")])
+    fila = json.loads(salida.read_text(encoding="utf-8").splitlines()[0])
+    assert fila["Tiempo (ms)"] >= 0
+
+def test_resumen_de_tiempos_con_memoria_fija():
+    """El p50/p95 sale de un histograma de cubetas fijas, no de la lista de todas las filas."""
+    tiempos = selenium_runner.HistogramaTiempos()
+    for i in range(100000):
+        tiempos.agregar((i % 1000) / 10 + 1)  # 1.0 .. 100.9 ms, repartidos uniformemente
+    assert len(tiempos.cubetas) < 300
+    assert tiempos.percentil(0.5) == pytest.approx(51, rel=0.02)
+    assert tiempos.percentil(0.95) == pytest.approx(96, rel=0.02)
+    assert selenium_runner.resumen_tiempos(tiempos).startswith("media 51.0 ms")
+    assert selenium_runner.resumen_tiempos(selenium_runner.HistogramaTiempos()) == "sin filas procesadas"
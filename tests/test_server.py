@@ -1,3 +1,4 @@
+import json
 import pytest
 import sqlite3
 from flask import Flask
@@ -114,7 +115,6 @@ def test_duplicate_email_registration(client, init_database):
     assert response.status_code == 200
     assert "❌ Email already registered." in response.json["message"]
 
-@pytest.mark.skip(reason="Endpoint /login no implementado en server.py")
 def test_login_successful(client, init_database):
     """Debe permitir iniciar sesión correctamente."""
     client.post('/register', json={
@@ -129,7 +129,6 @@ def test_login_successful(client, init_database):
     assert response.status_code == 200
     assert "✅ Login successful!" in response.json["message"]
 
-@pytest.mark.skip(reason="Endpoint /login no implementado en server.py")
 def test_login_invalid_credentials(client, init_database):
     """Rechaza credenciales incorrectas."""
     client.post('/register', json={
@@ -144,7 +143,6 @@ def test_login_invalid_credentials(client, init_database):
     assert response.status_code == 400
     assert "❌ Invalid credentials" in response.json["message"]
 
-@pytest.mark.skip(reason="Endpoint /login no implementado en server.py")
 def test_login_unregistered_email(client, init_database):
     """Rechaza el inicio de sesión con un email no registrado."""
     response = client.post('/login', json={
@@ -154,7 +152,6 @@ def test_login_unregistered_email(client, init_database):
     assert response.status_code == 400
     assert "❌ Email not registered" in response.json["message"]
 
-@pytest.mark.skip(reason="Endpoint /users no implementado en server.py")
 def test_list_users(client, init_database):
     """Lista los usuarios registrados."""
     client.post('/register', json={
@@ -207,4 +204,150 @@ def test_register_sql_injection(client, init_database):
     })
     assert response.status_code == 400
     assert "❌ Invalid email format" in response.json["message"]
-    #....#
\ No newline at end of file
+    #....#
+def test_register_batch_json_array(client, init_database):
+    """Registra un lote JSON e informa el estado de cada registro sin abortar el lote."""
+    response = client.post('/register/batch', json=[
+        {"fullname": "Juan Pérez", "email": "juan@example.com", "password": "Pass1A$X"},
+        {"fullname": "Ana López", "email": "correo@", "password": "Pass1A$X"},
+        {"fullname": "Ana López", "email": "ana@example.com", "password": "Pass456!X"},
+        {"fullname": "Otro Juan", "email": "juan@example.com", "password": "Pass1A$X"},
+    ])
+    assert response.status_code == 200
+    body = response.json
+    assert body["status"] == "partial"
+    assert body["total"] == 4
+    assert body["registered"] == 2
+    mensajes = [r["message"] for r in body["results"]]
+    assert mensajes == [
+        "✅ Registration successful!",
+        "❌ Invalid email format",
+        "✅ Registration successful!",
+        "❌ Email already registered.",
+    ]
+
+    conn = sqlite3.connect("users.db")
+    cursor = conn.cursor()
+    cursor.execute("SELECT email, password FROM users ORDER BY email")
+    usuarios = cursor.fetchall()
+    conn.close()
+    assert [u[0] for u in usuarios] == ["ana@example.com", "juan@example.com"]
+    assert check_password_hash(usuarios[1][1], "Pass1A$X")
+
+def test_register_batch_ndjson_reports_existing_emails(client, init_database):
+    """Acepta NDJSON y marca como duplicados los emails ya registrados."""
+    client.post('/register', json={
+        "fullname": "Juan Pérez",
+        "email": "correo@example.com",
+        "password": "Pass1A$X"
+    })
+    cuerpo = "\n".join([
+        '{"fullname": "Juan Pérez", "email": "correo@example.com", "password": "Pass1A$X"}',
+        'no es json',
+        '{"fullname": "Ana López", "email": "ana@example.com", "password": "Pass456!X"}',
+    ])
+    response = client.post('/register/batch', data=cuerpo, content_type="application/x-ndjson")
+    assert response.status_code == 200
+    resultados = response.json["results"]
+    assert resultados[0]["message"] == "❌ Email already registered."
+    assert resultados[1]["message"] == "❌ Invalid request format"
+    assert resultados[2]["status"] == "success"
+
+def test_register_batch_invalid_body(client, init_database):
+    """Rechaza lotes que no son un arreglo JSON."""
+    response = client.post('/register/batch', json={"fullname": "Juan Pérez"})
+    assert response.status_code == 400
+    assert "❌ Invalid request format" in response.json["message"]
+
+def test_register_batch_too_large_stops_reading(client, init_database, monkeypatch):
+    """Un lote mayor que el tope responde 413 sin leer el cuerpo entero."""
+    import io
+    from types import SimpleNamespace
+    import server
+    monkeypatch.setattr(server, "MAX_BATCH_RECORDS", 3)
+    linea = b'{"fullname": "Juan P\xc3\xa9rez", "email": "x@example.com", "password": "Pass1A$X"}\n'
+    cuerpo = io.BytesIO(linea * 1000)
+    peticion = SimpleNamespace(mimetype="application/x-ndjson", content_length=None, stream=cuerpo)
+    with pytest.raises(server.RequestEntityTooLarge):
+        server.leer_lote(peticion)
+    assert cuerpo.tell() == len(linea) * 4
+
+    response = client.post('/register/batch', data=linea * 4, content_type="application/x-ndjson")
+    assert response.status_code == 413
+    assert response.json["message"] == "❌ Batch is too large (max 3 records)"
+    assert client.post('/register/batch', json=[{"email": "x@example.com"}] * 4).status_code == 413
+
+    monkeypatch.setattr(server, "MAX_BATCH_BYTES", 100)
+    response = client.post('/register/batch', json=[{"email": "x@example.com"}] * 10)
+    assert response.status_code == 413
+    assert response.json["message"].startswith("❌ Batch is too large")
+    assert client.post('/register/batch', data=linea * 2, content_type="application/x-ndjson").status_code == 413
+
+def test_check_email(client, init_database):
+    """/check-email indica si un email está disponible sin enviar contraseña."""
+    response = client.get('/check-email?email=correo@example.com')
+    assert response.status_code == 200
+    assert response.json["available"] is True
+
+    client.post('/register', json={
+        "fullname": "Juan Pérez",
+        "email": "correo@example.com",
+        "password": "Pass1A$X"
+    })
+    response = client.get('/check-email?email=correo@example.com')
+    assert response.json["available"] is False
+    assert "❌ Email already registered." in response.json["message"]
+
+    response = client.get('/check-email?email=correo@')
+    assert response.status_code == 400
+    assert "❌ Invalid email format" in response.json["message"]
+
+def test_form_email_hint_does_not_touch_validation_message(client):
+    """El aviso de /check-email va en su propio elemento: validation_message es el resultado
+    del envío que lee selenium_runner.py y no debe quedar con un texto viejo."""
+    html = client.get('/form.html').get_data(as_text=True)
+    assert 'id="email_hint"' in html
+    blur = html[html.index('addEventListener("blur"'):html.index('addEventListener("submit"')]
+    assert "email_hint" in blur and "validation_message" not in blur
+
+def _registrar_varios(client, n):
+    for i in range(n):
+        client.post('/register', json={"fullname": "Juan Pérez", "email": f"u{i}@example.com",
+                                       "password": "Pass1A$X"})
+
+def test_list_users_keyset_pagination(client, init_database):
+    """Recorre la tabla con el cursor next_cursor, sin repetir ni saltar usuarios."""
+    _registrar_varios(client, 5)
+    vistos = []
+    after = ""
+    while True:
+        data = client.get(f'/users?limit=2&after={after}').json
+        vistos.extend(usuario["email"] for usuario in data["users"])
+        assert all("password" not in usuario for usuario in data["users"])
+        if data["next_cursor"] is None:
+            break
+        after = data["next_cursor"]
+    assert vistos == [f"u{i}@example.com" for i in range(5)]
+
+def test_list_users_prefix_and_ndjson_export(client, init_database):
+    _registrar_varios(client, 12)
+    # Con prefijo el orden es por email (el índice que recorre la consulta)
+    response = client.get('/users?email_prefix=U1')
+    assert [usuario["email"] for usuario in response.json["users"]] == [
+        "u10@example.com", "u11@example.com", "u1@example.com"]
+    response = client.get('/users?email_prefix=u1&limit=2')
+    assert response.json["next_cursor"] == "u11@example.com"
+    response = client.get('/users?email_prefix=u1&limit=2&after=u11@example.com')
+    assert [usuario["email"] for usuario in response.json["users"]] == ["u1@example.com"]
+    assert response.json["next_cursor"] is None
+
+    response = client.get('/users?format=ndjson')
+    assert response.mimetype == "application/x-ndjson"
+    lineas = [json.loads(linea) for linea in response.get_data(as_text=True).splitlines()]
+    assert len(lineas) == 12
+    assert set(lineas[0]) == {"id", "fullname", "email"}
+
+def test_list_users_invalid_parameters(client, init_database):
+    assert client.get('/users?limit=0').status_code == 400
+    assert client.get('/users?limit=abc').status_code == 400
+    assert client.get('/users?after=x').status_code == 400
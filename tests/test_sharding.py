@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import pytest
+from server import create_app
+from sharding import reshard, rutas_shards, shard_para
+
+def _contar(path):
+    conn = sqlite3.connect(path)
+    total = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+    conn.close()
+    return total
+
+def _registrar(client, email):
+    return client.post("/register", json={"fullname": "Juan Pérez", "email": email, "password": "Pass1A$X"})
+
+def test_routing_is_deterministic_and_normalized():
+    """El mismo email (normalizado) va siempre al mismo shard."""
+    assert shard_para("Correo@Example.com ", 8) == shard_para("correo@example.com", 8)
+    assert shard_para("correo@example.com", 1) == 0
+    usados = {shard_para(f"u{i}@example.com", 4) for i in range(200)}
+    assert usados == {0, 1, 2, 3}
+
+def test_single_shard_uses_database_path(tmp_path):
+    """Con DB_SHARDS=1 la base es DATABASE, igual que sin sharding."""
+    database = str(tmp_path / "users.db")
+    assert rutas_shards(database, 1) == [database]
+    client = create_app({"DATABASE": database, "HASH_EXECUTOR": "thread"}).test_client()
+    assert _registrar(client, "correo@example.com").status_code == 200
+    assert _contar(database) == 1
+    assert all(nombre.startswith("users.db") for nombre in os.listdir(tmp_path))
+
+def test_register_spreads_users_and_keeps_emails_unique(tmp_path):
+    database = str(tmp_path / "users.db")
+    client = create_app({"DATABASE": database, "DB_SHARDS": 3, "HASH_EXECUTOR": "thread"}).test_client()
+    emails = [f"u{i}@example.com" for i in range(12)]
+    for email in emails:
+        assert "✅" in _registrar(client, email).json["message"]
+    assert _registrar(client, emails[0]).json["message"] == "❌ Email already registered."
+
+    rutas = rutas_shards(database, 3)
+    assert [_contar(ruta) for ruta in rutas] == [
+        sum(1 for email in emails if shard_para(email, 3) == i) for i in range(3)]
+    assert not os.path.exists(database)
+
+    lote = [{"fullname": "Ana López", "email": email, "password": "Pass456!X"}
+            for email in ("nuevo1@example.com", "nuevo2@example.com", emails[1])]
+    response = client.post("/register/batch", json=lote)
+    assert response.json["registered"] == 2
+    assert sum(_contar(ruta) for ruta in rutas) == 14
+
+def test_reshard_moves_every_user(tmp_path):
+    """El resharding offline reparte todos los usuarios y la app los encuentra en su nuevo shard."""
+    database = str(tmp_path / "users.db")
+    client = create_app({"DATABASE": database, "HASH_EXECUTOR": "thread"}).test_client()
+    emails = [f"u{i}@example.com" for i in range(10)]
+    for email in emails:
+        _registrar(client, email)
+
+    resultado = reshard(database, 1, 4, chunk_size=3)
+    assert resultado["copied"] == 10
+    assert resultado["shards"] == rutas_shards(database, 4)
+    assert sum(_contar(ruta) for ruta in resultado["shards"]) == 10
+
+    client = create_app({"DATABASE": database, "DB_SHARDS": 4, "HASH_EXECUTOR": "thread"}).test_client()
+    for email in emails:
+        assert _registrar(client, email).json["message"] == "❌ Email already registered."
+
+    with pytest.raises(FileExistsError):
+        reshard(database, 1, 4)
+
+def test_list_users_across_shards(tmp_path):
+    """La paginación por (id, shard) devuelve cada usuario una sola vez aunque los ids se repitan."""
+    client = create_app({"DATABASE": str(tmp_path / "users.db"), "DB_SHARDS": 3,
+                         "HASH_EXECUTOR": "thread"}).test_client()
+    emails = {f"u{i}@example.com" for i in range(9)}
+    for email in emails:
+        _registrar(client, email)
+    vistos = []
+    after = ""
+    while True:
+        data = client.get(f"/users?limit=2&after={after}").json
+        vistos.extend(usuario["email"] for usuario in data["users"])
+        if data["next_cursor"] is None:
+            break
+        after = data["next_cursor"]
+    assert sorted(vistos) == sorted(emails)
+    assert len(client.get("/users?format=ndjson").get_data(as_text=True).splitlines()) == 9
+
+def test_list_users_by_prefix_walks_the_email_index(tmp_path):
+    """Con prefijo cada página recorre el índice de email desde el cursor, sin ordenar todo el rango."""
+    app = create_app({"DATABASE": str(tmp_path / "users.db"), "DB_SHARDS": 3, "HASH_EXECUTOR": "thread"})
+    client = app.test_client()
+    emails = [f"u{i}@example.com" for i in range(12)] + ["otro@example.com"]
+    for email in emails:
+        _registrar(client, email)
+    vistos = []
+    after = ""
+    while True:
+        data = client.get(f"/users?email_prefix=u&limit=5&after={after}").json
+        vistos.extend(usuario["email"] for usuario in data["users"])
+        if data["next_cursor"] is None:
+            break
+        after = data["next_cursor"]
+    assert vistos == sorted(emails[:12])
+    export = client.get("/users?format=ndjson&email_prefix=u").get_data(as_text=True).splitlines()
+    assert len(export) == 12
+
+    from sharding import SELECT_USERS_PREFIX_AFTER
+    with app.extensions["user_store"].shards[0].pool.connection() as conn:
+        plan = " ".join(fila[-1] for fila in conn.execute("EXPLAIN QUERY PLAN " + SELECT_USERS_PREFIX_AFTER,
+                                                          ("u1", "u\U0010ffff", 5)))
+    assert "USING INDEX" in plan and "TEMP B-TREE" not in plan
@@ -0,0 +1,79 @@
+import gzip
+import os
+import pytest
+from asgi_server import create_asgi_app
+from cliente_asgi import ClientePrueba
+from server import create_app
+from static_cache import StaticCache, elegir_codificacion
+
+@pytest.fixture
+def client(tmp_path):
+    app = create_app({"DATABASE": str(tmp_path / "users.db"), "STATIC_CACHE_CONTROL": "public, max-age=60"})
+    return app.test_client()
+
+def test_negotiates_encoding():
+    disponibles = {"identity": None, "gzip": None, "br": None}
+    assert elegir_codificacion("gzip, deflate, br", disponibles) == "br"
+    assert elegir_codificacion("gzip, br;q=0.5", disponibles) == "gzip"
+    assert elegir_codificacion("br;q=0, gzip;q=0", disponibles) == "identity"
+    assert elegir_codificacion(None, disponibles) == "identity"
+    assert elegir_codificacion("br", {"identity": None, "gzip": None}) == "identity"
+
+def test_form_is_served_compressed_with_etag(client):
+    """form.html sale de memoria, comprimido si el cliente lo acepta y con un ETag por representación."""
+    plano = client.get('/form.html')
+    comprimido = client.get('/form.html', headers={"Accept-Encoding": "gzip"})
+    assert plano.status_code == comprimido.status_code == 200
+    assert plano.headers["Cache-Control"] == "public, max-age=60"
+    assert plano.headers["Vary"] == "Accept-Encoding"
+    assert "Content-Encoding" not in plano.headers
+    assert comprimido.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(comprimido.data) == plano.data
+    assert plano.headers["ETag"] != comprimido.headers["ETag"]
+
+def test_if_none_match_returns_304(client):
+    etag = client.get('/form.html').headers["ETag"]
+    response = client.get('/form.html', headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert client.get('/form.html', headers={"If-None-Match": '"otro"'}).status_code == 200
+
+def test_static_route_uses_cache(client):
+    response = client.get('/static/form.html', headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert client.get('/static/no-existe.css').status_code == 404
+
+def test_check_changes_reloads_modified_files(tmp_path):
+    """En modo debug se recarga el archivo si cambia en disco."""
+    (tmp_path / "a.txt").write_text("uno")
+    cache = StaticCache(str(tmp_path), check_changes=True)
+    assert cache.respuesta("a.txt")[2] == b"uno"
+    (tmp_path / "a.txt").write_text("dos, más largo")
+    assert cache.respuesta("a.txt")[2] == "dos, más largo".encode()
+    (tmp_path / "b.txt").write_text("nuevo")
+    assert cache.respuesta("b.txt")[2] == b"nuevo"
+    os.remove(tmp_path / "a.txt")
+    assert cache.respuesta("a.txt") is None
+    assert cache.respuesta("../fuera.txt") is None
+
+def test_without_check_changes_serves_startup_copy(tmp_path):
+    (tmp_path / "a.txt").write_text("uno")
+    cache = StaticCache(str(tmp_path))
+    (tmp_path / "a.txt").write_text("dos")
+    assert cache.respuesta("a.txt")[2] == b"uno"
+
+def test_brotli_variant(tmp_path):
+    pytest.importorskip("brotli")
+    (tmp_path / "a.html").write_text("<p>hola</p>" * 200)
+    status, headers, _ = StaticCache(str(tmp_path)).respuesta("a.html", "gzip, br")
+    assert ("Content-Encoding", "br") in headers
+
+def test_asgi_form_uses_cache(tmp_path):
+    app = create_asgi_app({"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread"})
+    client = ClientePrueba(app)
+    response = client.get("/form.html", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    response = client.get("/form.html", headers={"Accept-Encoding": "gzip",
+                                                 "If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+    app.close()
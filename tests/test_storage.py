@@ -0,0 +1,153 @@
+import pytest
+import sqlite3
+import threading
+from server import create_app
+from storage import ConnectionPool, GroupCommitWriter
+
+def test_create_app_uses_configured_database(tmp_path):
+    """create_app usa la ruta configurada y activa el modo WAL."""
+    db_path = tmp_path / "otra.db"
+    app = create_app({"DATABASE": str(db_path)})
+    response = app.test_client().post('/register', json={
+        "fullname": "Juan Pérez",
+        "email": "correo@example.com",
+        "password": "Pass1A$X"
+    })
+    assert response.status_code == 200
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+    conn.close()
+
+def test_pool_reuses_connections(tmp_path):
+    """El pool devuelve la misma conexión en lugar de abrir una nueva."""
+    pool = ConnectionPool(str(tmp_path / "pool.db"), pragmas={"synchronous": "NORMAL"})
+    with pool.connection() as primera:
+        pass
+    with pool.connection() as segunda:
+        assert segunda is primera
+    pool.close_all()
+
+def test_pool_is_bounded(tmp_path):
+    """Con el pool agotado, una petición espera y luego falla por timeout."""
+    pool = ConnectionPool(str(tmp_path / "pool.db"), max_connections=1, timeout=0.05)
+    errores = []
+
+    def pedir():
+        try:
+            with pool.connection():
+                pass
+        except TimeoutError as e:
+            errores.append(e)
+
+    with pool.connection():
+        hilo = threading.Thread(target=pedir)
+        hilo.start()
+        hilo.join()
+    assert len(errores) == 1
+    pool.close_all()
+
+def _tabla(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT UNIQUE NOT NULL)")
+    conn.close()
+
+def test_group_commit_coalesces_concurrent_writes(tmp_path):
+    """Las escrituras concurrentes se agrupan en pocos commits y cada una recibe su resultado."""
+    path = str(tmp_path / "gc.db")
+    _tabla(path)
+    writer = GroupCommitWriter(path, max_batch=64, max_delay=0.05)
+    barrera = threading.Barrier(20)
+    resultados = {}
+
+    def registrar(i):
+        barrera.wait()
+        # Dos hilos intentan cada email: uno gana y el otro recibe False
+        resultados[i] = writer.execute("INSERT INTO users (email) VALUES (?)", (f"u{i // 2}@example.com",))
+
+    hilos = [threading.Thread(target=registrar, args=(i,)) for i in range(20)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    stats = writer.stats()
+    writer.close()
+
+    assert sum(resultados.values()) == 10
+    assert stats["rows"] == 20
+    assert stats["batches"] < 20
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 10
+    conn.close()
+
+def test_group_commit_reports_errors_to_each_caller(tmp_path):
+    """Un error que no es de restricción se propaga a todas las filas del lote."""
+    path = str(tmp_path / "gc.db")
+    _tabla(path)
+    writer = GroupCommitWriter(path, max_delay=0)
+    with pytest.raises(sqlite3.OperationalError):
+        writer.execute("INSERT INTO no_existe (email) VALUES (?)", ("x@example.com",))
+    assert writer.execute("INSERT INTO users (email) VALUES (?)", ("x@example.com",)) is True
+    writer.close()
+
+def test_group_commit_restarts_after_writer_dies(tmp_path, monkeypatch):
+    """Si el hilo escritor no puede abrir la base, las peticiones fallan (no esperan para siempre)
+    y el siguiente submit arranca otro escritor, aunque el hilo que muere siga vivo un rato."""
+    import storage
+    seguir = threading.Event()
+    vaciar = storage._fallar_pendientes
+
+    def vaciar_y_esperar(cola, error):
+        vaciar(cola, error)
+        seguir.wait(5)  # el hilo que muere ya despertó al llamador pero aún no terminó
+
+    monkeypatch.setattr(storage, "_fallar_pendientes", vaciar_y_esperar)
+    writer = GroupCommitWriter(str(tmp_path / "no_existe" / "gc.db"), max_delay=0)
+    with pytest.raises(sqlite3.OperationalError):
+        writer.execute("INSERT INTO users (email) VALUES (?)", ("x@example.com",), timeout=5)
+    hilo_muerto = writer._hilo
+    assert hilo_muerto.is_alive()
+    writer.path = str(tmp_path / "gc.db")
+    _tabla(writer.path)
+    try:
+        assert writer.execute("INSERT INTO users (email) VALUES (?)", ("x@example.com",), timeout=5) is True
+    finally:
+        seguir.set()
+    hilo_muerto.join()
+    writer.close()
+
+def test_register_returns_503_when_writer_does_not_answer(tmp_path, monkeypatch):
+    """Sin commit dentro de DB_WRITER_TIMEOUT, /register responde 503 y la fila no se escribe;
+    si la fila ya está en un commit en curso, espera su resultado en lugar de un 503."""
+    from concurrent.futures import Future
+
+    class EnCommit(Future):
+        """Fila que el escritor ya tomó: cancel() falla y el commit termina después."""
+        def cancel(self):
+            self.set_result(True)
+            return False
+
+    app = create_app({"DATABASE": str(tmp_path / "users.db"), "HASH_EXECUTOR": "thread",
+                      "DB_WRITER_TIMEOUT": 0.1})
+    futuros = []
+
+    def submit_colgado(*args):
+        futuros.append(Future())
+        return futuros[-1]
+
+    monkeypatch.setattr(app.extensions["user_store"], "submit", submit_colgado)
+    registro = {"fullname": "Juan Pérez", "email": "correo@example.com", "password": "Pass1A$X"}
+    response = app.test_client().post("/register", json=registro)
+    assert response.status_code == 503
+    assert futuros[0].cancelled()
+
+    def submit_en_commit(*args):
+        futuros.append(EnCommit())
+        futuros[-1].set_running_or_notify_cancel()
+        return futuros[-1]
+
+    monkeypatch.setattr(app.extensions["user_store"], "submit", submit_en_commit)
+    response = app.test_client().post("/register", json=registro)
+    assert response.status_code == 200
+    assert response.json["message"] == "✅ Registration successful!"
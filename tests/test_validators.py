@@ -15,7 +15,9 @@ from validators import (
     validate_password_match,
     validate_long_password,
     validate_trim,
-    evaluar_validadores
+    evaluar_validadores,
+    MOTOR_DETALLE,
+    MOTOR_REGISTRO,
 )
 
 # --- Pruebas de validaciones individuales ---
@@ -103,4 +105,52 @@ def test_validate_sql_injection():
     # El formato de email debe rechazar intentos de inyección a nivel de formato.
     assert validate_email_format("correo@example.com' OR 1=1 --") is False
     # La función validate_email_proper no filtra inyección; se espera True según su implementación.
-    assert validate_email_proper("correo@example.com' OR 1=1 --") is True
\ No newline at end of file
+    assert validate_email_proper("correo@example.com' OR 1=1 --") is True
+# --- Motor de reglas compilado ---
+
+CASOS = [
+    ("Juan", "correo@example.com", "Pass1A$X", "Pass1A$X"),
+    ("", "", "", ""),
+    (" Juan ", "Correo@Example.com", "password", "otra"),
+    ("Jo3", "john+test@example.com", "Abc123!", ""),
+    ("J" * 51, "correo@com", "a" * 31, "a" * 31),
+    ("Ǆuan", "İstanbul@example.com", "ÄÖÜäöü1!", "ÄÖÜäöü1!"),
+    ("Juan", "correo@example.com' OR 1=1 --", "QWERTY", "QWERTY"),
+    # Fuera de Latin-1 (sin tabla precalculada): cirílico, CJK, griego, emoji y dígitos de ancho completo
+    ("Жанна7", "Жанна@example.com", "Пароль1!Ж", "Пароль1!Ж"),
+    ("王小明", "wang@example.com", "密码密码Aa1!", "密码密码Aa1!"),
+    ("Ωmega", "ωmega+x@example.com", "ΩΩΩωωω1$", "x"),
+    ("Ana １", "ana@example.com", "😀Pass１A$X", "😀Pass１A$X"),
+]
+
+@pytest.mark.parametrize("nombre,correo,clave,confirmacion", CASOS)
+def test_motor_detalle_equivale_a_las_funciones(nombre, correo, clave, confirmacion):
+    """El motor compilado da el mismo resultado que cada función validate_*."""
+    esperado = {
+        "validate_fullname_length": validate_fullname_length(nombre),
+        "validate_email_format": validate_email_format(correo),
+        "validate_password_strength": validate_password_strength(clave),
+        "validate_password_match": validate_password_match(clave, confirmacion),
+        "validate_email_case_insensitive": validate_email_case_insensitive(correo),
+        "validate_long_name": validate_long_name(nombre),
+        "validate_long_password": validate_long_password(clave),
+        "validate_trim": validate_trim(nombre, correo, clave),
+        "validate_email_plus": validate_email_plus(correo),
+        "validate_password_common": validate_password_common(clave),
+        "validate_no_numbers_in_name": validate_no_numbers_in_name(nombre),
+        "validate_password_case_sensitive": validate_password_case_sensitive(clave),
+        "validate_not_empty": validate_not_empty(nombre, correo, clave),
+        "validate_confirm_not_empty": validate_confirm_not_empty(confirmacion),
+        "validate_email_proper": validate_email_proper(correo),
+    }
+    assert MOTOR_DETALLE.evaluar(fullname=nombre, email=correo, password=clave, confirm=confirmacion) == esperado
+
+def test_motor_registro_primera_falla_y_todas():
+    """primera_falla respeta el orden de mensajes de /register; fallas las devuelve todas."""
+    assert MOTOR_REGISTRO.primera_falla(fullname="Juan Pérez", email="correo@example.com",
+                                        password="Pass1A$X") is None
+    falla = MOTOR_REGISTRO.primera_falla(fullname="Jo", email="Correo@", password="pass")
+    assert falla.mensaje == "❌ Full Name must be at least 3 characters"
+    nombres = [r.nombre for r in MOTOR_REGISTRO.fallas(fullname="Jo", email="Correo@", password="pass")]
+    assert nombres == ["validate_fullname_length", "validate_email_format",
+                       "validate_email_case_insensitive", "validate_password_strength"]
@@ -1,4 +1,8 @@
+import re
+
 SPECIAL_CHARS = "!@#$%^&*"
+EMAIL_PATTERN = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+COMMON_PASSWORDS = frozenset({"password", "123456", "qwerty", "abc123"})
 
 def marcar(valor: bool) -> str:
     return "✅" if valor else "❌"
@@ -19,9 +23,7 @@ def validate_no_numbers_in_name(name: str) -> bool:
     return not any(char.isdigit() for char in name)
 
 def validate_email_format(email: str) -> bool:
-    import re
-    pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-    return bool(re.match(pattern, email))
+    return bool(EMAIL_PATTERN.match(email))
 
 def validate_email_proper(email: str) -> bool:
     return "@" in email and "." in email.split("@")[-1]
@@ -40,8 +42,7 @@ def validate_password_strength(password: str) -> bool:
     return all([has_upper, has_lower, has_digit, has_special]) and len(password) >= 8
 
 def validate_password_common(password: str) -> bool:
-    common_passwords = {"password", "123456", "qwerty", "abc123"}
-    return password.lower() not in common_passwords
+    return password.lower() not in COMMON_PASSWORDS
 
 def validate_password_case_sensitive(password: str) -> bool:
     return any(c.isupper() for c in password)
@@ -58,21 +59,187 @@ def validate_trim(name: str, email: str, password: str) -> bool:
         for s in [name, email, password]
     )
 
+# --- Motor de reglas compilado -------------------------------------------------
+# Las reglas se declaran como expresiones sobre un perfil de cada campo
+# (<campo>_largo, <campo>_limpio y <campo>_clases, una máscara de clases de
+# carácter). El conjunto de reglas se compila una vez en una función Python
+# que calcula cada dato del perfil una sola vez, justo antes de la primera
+# regla que lo necesita, en lugar de que cada validador recorra la cadena.
+
+MAYUSCULA = 1
+MINUSCULA = 2
+DIGITO = 4
+ESPECIAL = 8
+MAS = 16
+NO_MINUSCULA = 32  # el carácter cambia con lower(), es decir, la cadena no es minúscula
+FUERTE = MAYUSCULA | MINUSCULA | DIGITO | ESPECIAL
+
+CAMPOS = ("fullname", "email", "password", "confirm")
+
+def _clase_de(c: str) -> int:
+    bits = 0
+    if c.isupper():
+        bits |= MAYUSCULA
+    if c.islower():
+        bits |= MINUSCULA
+    if c.isdigit():
+        bits |= DIGITO
+    if c in SPECIAL_CHARS:
+        bits |= ESPECIAL
+    if c == "+":
+        bits |= MAS
+    if c.lower() != c:
+        bits |= NO_MINUSCULA
+    return bits
+
+# Clases precalculadas de Latin-1 (casi todo lo que llega). El resto se calcula en cada
+# llamada sin guardarlo: la entrada del usuario no debe hacer crecer una caché sin límite
+_CLASES_LATIN1 = tuple(_clase_de(chr(i)) for i in range(256))
+
+def clasificar(texto: str) -> int:
+    """Máscara con las clases de carácter presentes en el texto (una pasada por carácter distinto)."""
+    bits = 0
+    tabla = _CLASES_LATIN1
+    for c in set(texto):
+        codigo = ord(c)
+        bits |= tabla[codigo] if codigo < 256 else _clase_de(c)
+    return bits
+
+# Cómo se calcula cada dato del perfil a partir del valor del campo
+_PERFIL = {
+    "largo": "len({campo})",
+    "limpio": "{campo}.strip()",
+    "clases": "clasificar({campo})",
+}
+_USO_PERFIL = re.compile(r"\b(" + "|".join(CAMPOS) + r")_(" + "|".join(_PERFIL) + r")\b")
+_USO_CAMPO = re.compile(r"\b(" + "|".join(CAMPOS) + r")\b")
+
+class Regla:
+    """Regla declarativa: nombre del validador, mensaje de error y expresión que debe ser verdadera."""
+    __slots__ = ("nombre", "mensaje", "expresion", "campos")
+
+    def __init__(self, nombre, mensaje, expresion):
+        self.nombre = nombre
+        self.mensaje = mensaje
+        self.expresion = expresion
+        self.campos = tuple(dict.fromkeys(_USO_CAMPO.findall(expresion) +
+                                          [c for c, _ in _USO_PERFIL.findall(expresion)]))
+
+    def __repr__(self):
+        return f"Regla({self.nombre!r})"
+
+# Catálogo de reglas, equivalentes a las funciones validate_* de arriba
+REGLAS = {regla.nombre: regla for regla in [
+    Regla("validate_not_empty", "❌ Missing required fields",
+          "fullname_limpio != '' and email_limpio != '' and password_limpio != ''"),
+    Regla("validate_trim", "❌ Fields should not start or end with spaces",
+          "fullname_largo == len(fullname_limpio) and email_largo == len(email_limpio)"
+          " and password_largo == len(password_limpio)"),
+    Regla("validate_fullname_length", "❌ Full Name must be at least 3 characters",
+          "fullname_largo >= 3"),
+    Regla("validate_long_name", "❌ Full Name is too long",
+          "fullname_largo <= 50"),
+    Regla("validate_no_numbers_in_name", "❌ Name should not contain numbers",
+          "not fullname_clases & DIGITO"),
+    Regla("validate_email_format", "❌ Invalid email format",
+          "EMAIL_PATTERN.match(email) is not None"),
+    Regla("validate_email_case_insensitive", "❌ Email should be lowercase only",
+          "not email_clases & NO_MINUSCULA"),
+    Regla("validate_email_plus", "❌ Email should not contain '+'",
+          "not email_clases & MAS"),
+    Regla("validate_email_proper", "❌ Email domain is not valid",
+          "validate_email_proper(email)"),
+    Regla("validate_password_strength", "❌ Password must be 6+ characters and include a special symbol",
+          "password_largo >= 8 and password_clases & FUERTE == FUERTE"),
+    Regla("validate_password_common", "❌ Password is too common",
+          "password.lower() not in COMMON_PASSWORDS"),
+    Regla("validate_long_password", "❌ Password is too long",
+          "password_largo <= 30"),
+    Regla("validate_password_case_sensitive", "❌ Password must include an uppercase letter",
+          "password_clases & MAYUSCULA != 0"),
+    Regla("validate_password_match", "❌ Passwords do not match",
+          "password == confirm"),
+    Regla("validate_confirm_not_empty", "❌ Confirm Password is required",
+          "confirm_limpio != ''"),
+]}
+
+class MotorReglas:
+    """Conjunto ordenado de reglas compilado una vez en funciones de una sola pasada por campo."""
+
+    def __init__(self, nombres):
+        self.reglas = tuple(REGLAS[nombre] for nombre in nombres)
+        self.campos = tuple(c for c in CAMPOS if any(c in regla.campos for regla in self.reglas))
+        self.primera_falla = self._compilar("primera_falla")
+        self.fallas = self._compilar("fallas")
+        self.evaluar = self._compilar("evaluar")
+
+    def _compilar(self, modo):
+        lineas = [f"def {modo}({', '.join(self.campos)}):"]
+        calculados = set()
+
+        def perfil(expresion):
+            # Emite el cálculo de los datos del perfil que la expresión usa por primera vez
+            for campo, dato in _USO_PERFIL.findall(expresion):
+                variable = f"{campo}_{dato}"
+                if variable not in calculados:
+                    calculados.add(variable)
+                    lineas.append(f"    {variable} = {_PERFIL[dato].format(campo=campo)}")
+
+        if modo == "fallas":
+            lineas.append("    fallas = []")
+        for i, regla in enumerate(self.reglas):
+            perfil(regla.expresion)
+            if modo == "primera_falla":
+                lineas.append(f"    if not ({regla.expresion}): return _reglas[{i}]")
+            elif modo == "fallas":
+                lineas.append(f"    if not ({regla.expresion}): fallas.append(_reglas[{i}])")
+            else:
+                lineas.append(f"    r{i} = bool({regla.expresion})")
+        if modo == "primera_falla":
+            lineas.append("    return None")
+        elif modo == "fallas":
+            lineas.append("    return fallas")
+        else:
+            pares = ", ".join(f"{regla.nombre!r}: r{i}" for i, regla in enumerate(self.reglas))
+            lineas.append(f"    return {{{pares}}}")
+
+        espacio = dict(globals(), _reglas=self.reglas)
+        exec(compile("\n".join(lineas), f"<MotorReglas.{modo}>", "exec"), espacio)
+        return espacio[modo]
+
+# Cadena de /register: mismo orden y mensajes que antes en server.py
+MOTOR_REGISTRO = MotorReglas([
+    "validate_not_empty",
+    "validate_trim",
+    "validate_fullname_length",
+    "validate_long_name",
+    "validate_no_numbers_in_name",
+    "validate_email_format",
+    "validate_email_case_insensitive",
+    "validate_password_strength",
+    "validate_password_common",
+    "validate_long_password",
+])
+
+# Detalle por validador del reporte Excel (mismo orden de columnas)
+MOTOR_DETALLE = MotorReglas([
+    "validate_fullname_length",
+    "validate_email_format",
+    "validate_password_strength",
+    "validate_password_match",
+    "validate_email_case_insensitive",
+    "validate_long_name",
+    "validate_long_password",
+    "validate_trim",
+    "validate_email_plus",
+    "validate_password_common",
+    "validate_no_numbers_in_name",
+    "validate_password_case_sensitive",
+    "validate_not_empty",
+    "validate_confirm_not_empty",
+    "validate_email_proper",
+])
+
 def evaluar_validadores(nombre: str, correo: str, clave: str, confirmacion: str) -> dict:
-    return {
-        "validate_fullname_length": marcar(validate_fullname_length(nombre)),
-        "validate_email_format": marcar(validate_email_format(correo)),
-        "validate_password_strength": marcar(validate_password_strength(clave)),
-        "validate_password_match": marcar(validate_password_match(clave, confirmacion)),
-        "validate_email_case_insensitive": marcar(validate_email_case_insensitive(correo)),
-        "validate_long_name": marcar(validate_long_name(nombre)),
-        "validate_long_password": marcar(validate_long_password(clave)),
-        "validate_trim": marcar(validate_trim(nombre, correo, clave)),
-        "validate_email_plus": marcar(validate_email_plus(correo)),
-        "validate_password_common": marcar(validate_password_common(clave)),
-        "validate_no_numbers_in_name": marcar(validate_no_numbers_in_name(nombre)),
-        "validate_password_case_sensitive": marcar(validate_password_case_sensitive(clave)),
-        "validate_not_empty": marcar(validate_not_empty(nombre, correo, clave)),
-        "validate_confirm_not_empty": marcar(validate_confirm_not_empty(confirmacion)),
-        "validate_email_proper": marcar(validate_email_proper(correo))
-    }
+    resultados = MOTOR_DETALLE.evaluar(fullname=nombre, email=correo, password=clave, confirm=confirmacion)
+    return {validador: marcar(valor) for validador, valor in resultados.items()}